@@ -0,0 +1,50 @@
+"""keyset pagination indexes
+
+Revision ID: 4c7a1e2b9d03
+Revises: 9af12e64d94f
+Create Date: 2026-10-19 09:12:41.118204
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "4c7a1e2b9d03"
+down_revision: Union[str, Sequence[str], None] = "9af12e64d94f"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (name, table, columns) serving ORDER BY created_at DESC, id DESC pages
+INDEXES = [
+    ("idx_datasets_created_at_id", "datasets", ["created_at", "id"]),
+    ("idx_runs_created_at_id", "runs", ["created_at", "id"]),
+    ("idx_runs_dataset_created_at_id", "runs", ["dataset_id", "created_at", "id"]),
+    ("idx_results_created_at_id", "results", ["created_at", "id"]),
+    ("idx_results_run_created_at_id", "results", ["run_id", "created_at", "id"]),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CONCURRENTLY keeps the tables writable while the indexes build
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(
+                name,
+                table,
+                columns,
+                unique=False,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(
+                name, table_name=table, postgresql_concurrently=True, if_exists=True
+            )
@@ -0,0 +1,41 @@
+"""backfill results footprint_geom
+
+Revision ID: b81f3c5d2a47
+Revises: 4c7a1e2b9d03
+Create Date: 2026-10-19 11:40:07.532918
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b81f3c5d2a47"
+down_revision: Union[str, Sequence[str], None] = "4c7a1e2b9d03"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Rows with unparsable WKT keep a NULL geometry instead of failing the run
+    op.execute("""
+        CREATE FUNCTION pg_temp.try_footprint(wkt text) RETURNS geometry AS $$
+        BEGIN
+            RETURN ST_GeomFromText(wkt, 4326);
+        EXCEPTION WHEN others THEN
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+        """)
+    op.execute("""
+        UPDATE results
+        SET footprint_geom = pg_temp.try_footprint(footprint_wkt)
+        WHERE footprint_geom IS NULL AND footprint_wkt IS NOT NULL
+        """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # The geometry is derived from footprint_wkt; nothing to undo
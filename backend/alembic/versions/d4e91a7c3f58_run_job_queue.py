@@ -0,0 +1,61 @@
+"""run job queue columns
+
+Revision ID: d4e91a7c3f58
+Revises: b81f3c5d2a47
+Create Date: 2026-10-19 14:05:22.417630
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "d4e91a7c3f58"
+down_revision: Union[str, Sequence[str], None] = "b81f3c5d2a47"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COLUMNS = [
+    sa.Column("worker_id", sa.String(), nullable=True),
+    sa.Column("attempts", sa.Integer(), nullable=False, server_default="0"),
+    sa.Column("started_at", sa.DateTime(), nullable=True),
+    sa.Column("heartbeat_at", sa.DateTime(), nullable=True),
+    sa.Column("finished_at", sa.DateTime(), nullable=True),
+    sa.Column("error", sa.Text(), nullable=True),
+]
+
+# Partial indexes: only queued / running rows, so they stay tiny
+INDEXES = [
+    ("idx_runs_queued", ["created_at", "id"], "status = 'queued'"),
+    ("idx_runs_running_heartbeat", ["heartbeat_at"], "status = 'running'"),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for column in COLUMNS:
+        op.add_column("runs", column)
+    with op.get_context().autocommit_block():
+        for name, columns, where in INDEXES:
+            op.create_index(
+                name,
+                "runs",
+                columns,
+                unique=False,
+                postgresql_where=sa.text(where),
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, _, _ in reversed(INDEXES):
+            op.drop_index(
+                name, table_name="runs", postgresql_concurrently=True, if_exists=True
+            )
+    for column in reversed(COLUMNS):
+        op.drop_column("runs", column.name)
@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime
+from typing import Iterable, Optional
+
+from fastapi import Request, Response, status
+from pydantic import BaseModel
+
+
+def etag_matches(request: Request, tag: str) -> bool:
+    "True when If-None-Match lists tag (weak or strong) or is *"
+    raw = request.headers.get("if-none-match")
+    if not raw:
+        return False
+    candidates = {c.strip().removeprefix("W/").strip('"') for c in raw.split(",")}
+    return tag in candidates or "*" in candidates
+
+
+def representation_etag(items: Iterable[BaseModel]) -> str:
+    "Strong validator of a response body made of these models"
+    digest = hashlib.blake2b(digest_size=16)
+    for item in items:
+        digest.update(item.model_dump_json().encode("utf-8"))
+        digest.update(b"\n")
+    return digest.hexdigest()
+
+
+def not_modified(
+    request: Request,
+    response: Response,
+    items: Iterable[BaseModel],
+    last_modified: Optional[datetime] = None,
+) -> Optional[Response]:
+    """
+    Set ETag (and Last-Modified) on response; returns a 304 response to send
+    instead when the client's If-None-Match already names this representation.
+    """
+    headers = {"ETag": f'"{representation_etag(items)}"', "Cache-Control": "no-cache"}
+    if last_modified is not None:
+        if last_modified.tzinfo is None:
+            # Timestamps are stored as naive UTC
+            last_modified = last_modified.replace(tzinfo=timezone.utc)
+        headers["Last-Modified"] = format_datetime(last_modified, usegmt=True)
+    response.headers.update(headers)
+    if etag_matches(request, headers["ETag"].strip('"')):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return None
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
-from typing import Iterator
+from typing import AsyncIterator, Iterator
+from backend.db.async_uow import AsyncUnitOfWork
 from backend.db.uow import UnitOfWork
 
 
@@ -8,3 +9,9 @@ def get_uow() -> Iterator[UnitOfWork]:
     # Each request gets a fresh UoW + session, commits/rollbacks safely
     with UnitOfWork() as uow:
         yield uow
+
+
+async def get_async_uow() -> AsyncIterator[AsyncUnitOfWork]:
+    # Same as get_uow for async def routes
+    async with AsyncUnitOfWork() as uow:
+        yield uow
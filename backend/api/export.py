@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import csv
+import io
+from typing import Any, AsyncIterator, Dict, Mapping, Optional, Sequence
+
+from shapely import wkt as shapely_wkt
+from shapely.errors import ShapelyError
+from shapely.geometry import mapping
+
+from core.config.settings import settings
+from core.utils.fs import dumps_json
+from backend.db.async_uow import AsyncUnitOfWork
+
+# format -> (media type, file extension)
+EXPORT_FORMATS = {
+    "ndjson": ("application/x-ndjson", "ndjson"),
+    "csv": ("text/csv", "csv"),
+    "geojson": ("application/geo+json", "geojson"),
+}
+
+CSV_FIELDS = (
+    "id",
+    "run_id",
+    "result_type",
+    "uri",
+    "created_at",
+    "footprint_wkt",
+    "metrics_json",
+)
+
+# Rows fetched per cursor round trip (and written per chunk)
+EXPORT_BATCH_SIZE = 1000
+
+Batches = AsyncIterator[Sequence[Mapping[str, Any]]]
+
+
+def export_headers(fmt: str) -> Dict[str, str]:
+    _, ext = EXPORT_FORMATS[fmt]
+    return {"Content-Disposition": f'attachment; filename="results.{ext}"'}
+
+
+async def export_results(
+    fmt: str, filters: Dict[str, Any], batch_size: int = EXPORT_BATCH_SIZE
+) -> AsyncIterator[str]:
+    """
+    Response body of a results export. Opens its own unit of work, so the
+    session lives exactly as long as the stream.
+    """
+    timeout = settings.EXPORT_STATEMENT_TIMEOUT_MS
+    async with AsyncUnitOfWork() as uow:
+        batches = uow.results.stream(batch_size, timeout, **filters)
+        async for chunk in encode_export(fmt, batches):
+            yield chunk
+
+
+async def encode_export(fmt: str, batches: Batches) -> AsyncIterator[str]:
+    "One text chunk per batch of rows (plus a header/footer where needed)"
+    if fmt == "ndjson":
+        async for batch in batches:
+            yield "".join(dumps_json(_record(row)) + "\n" for row in batch)
+    elif fmt == "csv":
+        yield _csv_lines([CSV_FIELDS])
+        async for batch in batches:
+            yield _csv_lines(_csv_row(row) for row in batch)
+    elif fmt == "geojson":
+        yield '{"type":"FeatureCollection","features":['
+        sep = ""
+        async for batch in batches:
+            if batch:
+                yield sep + ",".join(dumps_json(_feature(row)) for row in batch)
+                sep = ","
+        yield "]}"
+    else:
+        raise ValueError(f"Unknown export format: {fmt!r}")
+
+
+def _record(row: Mapping[str, Any]) -> Dict[str, Any]:
+    record = dict(row)
+    record["created_at"] = row["created_at"].isoformat()
+    return record
+
+
+def _csv_row(row: Mapping[str, Any]) -> Sequence[Any]:
+    record = _record(row)
+    metrics = record["metrics_json"]
+    record["metrics_json"] = dumps_json(metrics) if metrics is not None else ""
+    return [record[name] for name in CSV_FIELDS]
+
+
+def _csv_lines(rows: Any) -> str:
+    buf = io.StringIO()
+    csv.writer(buf).writerows(rows)
+    return buf.getvalue()
+
+
+def _feature(row: Mapping[str, Any]) -> Dict[str, Any]:
+    properties = _record(row)
+    del properties["id"]
+    return {
+        "type": "Feature",
+        "id": row["id"],
+        "geometry": _geometry(properties.pop("footprint_wkt")),
+        "properties": properties,
+    }
+
+
+def _geometry(footprint_wkt: Optional[str]) -> Optional[Dict[str, Any]]:
+    if footprint_wkt is None:
+        return None
+    try:
+        return mapping(shapely_wkt.loads(footprint_wkt))
+    except ShapelyError:
+        return None
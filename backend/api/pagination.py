@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+from typing import Awaitable, Callable, List, TypeVar
+
+from fastapi import HTTPException, Response
+from backend.db.pagination import InvalidCursor, Page
+
+T = TypeVar("T")
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def paginate(fetch: Callable[[], Page[T]], response: Response) -> List[T]:
+    """
+    Run a repository page query for a list endpoint: the next-page cursor is
+    returned in the X-Next-Cursor header (absent on the last page), so the
+    response body stays a plain list.
+    """
+    try:
+        page = fetch()
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+    return _set_cursor(page, response)
+
+
+async def paginate_async(
+    fetch: Callable[[], Awaitable[Page[T]]], response: Response
+) -> List[T]:
+    "paginate for async repositories"
+    try:
+        page = await fetch()
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+    return _set_cursor(page, response)
+
+
+def _set_cursor(page: Page[T], response: Response) -> List[T]:
+    if page.next_cursor is not None:
+        response.headers[NEXT_CURSOR_HEADER] = page.next_cursor
+    return page.items
@@ -1,58 +1,86 @@
 from __future__ import annotations
 
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
-from backend.db.uow import UnitOfWork
-from backend.api.schemas.datasets import DatasetCreate, DatasetOut, DatasetUpdate
-from backend.api.deps import get_uow
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from backend.db.async_uow import AsyncUnitOfWork
+from backend.api.pagination import paginate_async
+from backend.api.schemas.datasets import (
+    DatasetCreate,
+    DatasetOut,
+    DatasetSummaryOut,
+    DatasetUpdate,
+)
+from backend.api.deps import get_async_uow
 from backend.db.models import Dataset
 
 router = APIRouter(prefix="/datasets", tags=["datasets"])
 
 
 @router.post("", response_model=DatasetOut, status_code=status.HTTP_201_CREATED)
-def create_dataset(
-    payload: DatasetCreate, uow: UnitOfWork = Depends(get_uow)
+async def create_dataset(
+    payload: DatasetCreate, uow: AsyncUnitOfWork = Depends(get_async_uow)
 ) -> DatasetOut:
     # Prevent duplicates by name (simple MVP rule)
-    existing = uow.datasets.get_by_name(payload.name)
+    existing = await uow.datasets.get_by_name(payload.name)
     if existing:
         raise HTTPException(
             status_code=409, detail="Dataset with this name already exists."
         )
 
     ds = Dataset(name=payload.name, description=payload.description)
-    uow.datasets.add(ds)
+    await uow.datasets.add(ds)
     return DatasetOut.model_validate(ds)
 
 
 @router.get("/{dataset_id}", response_model=DatasetOut)
-def get_dataset(dataset_id: str, uow: UnitOfWork = Depends(get_uow)) -> DatasetOut:
-    ds = uow.datasets.get(dataset_id)
+async def get_dataset(
+    dataset_id: str, uow: AsyncUnitOfWork = Depends(get_async_uow)
+) -> DatasetOut:
+    ds = await uow.datasets.get(dataset_id)
     if not ds:
         raise HTTPException(status_code=404, detail="Dataset not found.")
     return DatasetOut.model_validate(ds)
 
 
+@router.get("/{dataset_id}/summary", response_model=DatasetSummaryOut)
+async def get_dataset_summary(
+    dataset_id: str,
+    max_runs: int = 50,
+    latest_per_run: int = 1,
+    uow: AsyncUnitOfWork = Depends(get_async_uow),
+) -> DatasetSummaryOut:
+    "Counts per run status and result type, newest runs and their latest results"
+    max_runs = max(1, min(max_runs, 500))
+    latest_per_run = max(0, min(latest_per_run, 20))
+    summary = await uow.datasets.summary(dataset_id, max_runs, latest_per_run)
+    if summary is None:
+        raise HTTPException(status_code=404, detail="Dataset not found.")
+    return DatasetSummaryOut.model_validate(summary)
+
+
 @router.get("", response_model=List[DatasetOut])
-def list_datasets(
+async def list_datasets(
+    response: Response,
     limit: int = 100,
     offset: int = 0,
-    uow: UnitOfWork = Depends(get_uow),
+    cursor: Optional[str] = None,
+    uow: AsyncUnitOfWork = Depends(get_async_uow),
 ) -> List[DatasetOut]:
     limit = max(1, min(limit, 500))
     offset = max(0, offset)
-    items = uow.datasets.list(limit=limit, offset=offset)
+    items = await paginate_async(
+        lambda: uow.datasets.page(limit, cursor, offset), response
+    )
     return [DatasetOut.model_validate(x) for x in items]
 
 
 @router.patch("/{dataset_id}", response_model=DatasetOut)
-def update_dataset(
+async def update_dataset(
     dataset_id: str,
     payload: DatasetUpdate,
-    uow: UnitOfWork = Depends(get_uow),
+    uow: AsyncUnitOfWork = Depends(get_async_uow),
 ) -> DatasetOut:
-    ds = uow.datasets.get(dataset_id)
+    ds = await uow.datasets.get(dataset_id)
     if not ds:
         raise HTTPException(status_code=404, detail="Dataset not found.")
 
@@ -64,9 +92,11 @@ def update_dataset(
 
 
 @router.delete("/{dataset_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_dataset(dataset_id: str, uow: UnitOfWork = Depends(get_uow)) -> None:
-    ds = uow.datasets.get(dataset_id)
+async def delete_dataset(
+    dataset_id: str, uow: AsyncUnitOfWork = Depends(get_async_uow)
+) -> None:
+    ds = await uow.datasets.get(dataset_id)
     if not ds:
         raise HTTPException(status_code=404, detail="Dataset not found.")
-    uow.datasets.delete(ds)
+    await uow.datasets.delete(ds)
     return None
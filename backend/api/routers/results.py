@@ -1,36 +1,263 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from datetime import datetime
+from pathlib import Path
+from typing import List, Optional, Union
+from urllib.parse import urlparse
+from urllib.request import url2pathname
+
+from fastapi.responses import StreamingResponse
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    Depends,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    status,
+)
+from core.common.exceptions import TileError
+from core.data_manager.overviews import build_overviews_if_raster
+from core.data_manager.raster_store import ChunkedRasterStore
 from backend.db.models import Result
+from backend.db.async_uow import AsyncUnitOfWork
 from backend.db.uow import UnitOfWork
-from backend.api.deps import get_uow
-from backend.api.schemas.results import ResultCreate, ResultOut
+from backend.api.conditional import etag_matches, not_modified
+from backend.api.deps import get_async_uow, get_uow
+from backend.api.export import EXPORT_FORMATS, export_headers, export_results
+from backend.api.pagination import paginate_async
+from backend.api.schemas.results import ResultCreate, ResultFootprintOut, ResultOut
+from shapely import wkt as shapely_wkt
+from shapely.geometry import box
 
 router = APIRouter(prefix="/results", tags=["results"])
 
+MAX_BATCH_SIZE = 10_000
+
 
 @router.post("", response_model=ResultOut, status_code=status.HTTP_201_CREATED)
-def persist_result(
-    payload: ResultCreate, uow: UnitOfWork = Depends(get_uow)
+async def persist_result(
+    payload: ResultCreate,
+    request: Request,
+    background: BackgroundTasks,
+    uow: AsyncUnitOfWork = Depends(get_async_uow),
 ) -> ResultOut:
-    run = uow.runs.get(payload.run_id)
+    run = await uow.runs.get(payload.run_id)
     if not run:
         raise HTTPException(status_code=404, detail="Run not found.")
 
-    res = Result(
+    res = _new_result(payload)
+    await uow.results.add(res)
+    _schedule_overviews(request, background, payload.uri)
+    return ResultOut.model_validate(res)
+
+
+@router.post(
+    "/batch", response_model=List[ResultOut], status_code=status.HTTP_201_CREATED
+)
+def persist_results_batch(
+    payload: List[ResultCreate],
+    request: Request,
+    background: BackgroundTasks,
+    uow: UnitOfWork = Depends(get_uow),
+) -> List[ResultOut]:
+    """
+    Persist many results in one transaction with a bulk insert.
+    Stays on the sync session: large batches are loaded with psycopg2 COPY.
+    """
+    if len(payload) > MAX_BATCH_SIZE:
+        raise HTTPException(
+            status_code=413, detail=f"At most {MAX_BATCH_SIZE} results per batch."
+        )
+    run_ids = {p.run_id for p in payload}
+    missing = run_ids - uow.runs.existing_ids(run_ids)
+    if missing:
+        raise HTTPException(
+            status_code=404, detail=f"Run not found: {', '.join(sorted(missing))}"
+        )
+
+    results = uow.results.add_many(_new_result(p) for p in payload)
+    for p in payload:
+        _schedule_overviews(request, background, p.uri)
+    return [ResultOut.model_validate(r) for r in results]
+
+
+def _new_result(payload: ResultCreate) -> Result:
+    return Result(
         run_id=payload.run_id,
         result_type=payload.result_type,
         uri=payload.uri,
         metrics_json=payload.metrics,
         footprint_wkt=payload.footprint_wkt,
     )
-    uow.results.add(res)
-    return ResultOut.model_validate(res)
+
+
+def _schedule_overviews(
+    request: Request, background: BackgroundTasks, uri: str
+) -> None:
+    "Raster results get their overview pyramid built after the response"
+    path = _local_raster_path(request, uri)
+    if path is not None:
+        background.add_task(build_overviews_if_raster, path)
+
+
+@router.get("/search", response_model=Union[List[ResultOut], List[ResultFootprintOut]])
+async def search_results(
+    response: Response,
+    bbox: Optional[str] = Query(None, description="minx,miny,maxx,maxy (EPSG:4326)"),
+    intersects: Optional[str] = Query(None, description="WKT geometry (EPSG:4326)"),
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    result_type: Optional[str] = None,
+    run_id: Optional[str] = None,
+    fields: str = Query("full", pattern="^(full|footprint)$"),
+    limit: int = 200,
+    cursor: Optional[str] = None,
+    uow: AsyncUnitOfWork = Depends(get_async_uow),
+) -> Union[List[ResultOut], List[ResultFootprintOut]]:
+    "Results covering an area of interest (and time range), newest first"
+    area = _search_area(bbox, intersects)
+    limit = max(1, min(limit, 1000))
+    footprints_only = fields == "footprint"
+
+    results = await paginate_async(
+        lambda: uow.results.search(
+            intersects_wkt=area,
+            start=start,
+            end=end,
+            result_type=result_type,
+            run_id=run_id,
+            limit=limit,
+            cursor=cursor,
+            footprints_only=footprints_only,
+        ),
+        response,
+    )
+    out = ResultFootprintOut if footprints_only else ResultOut
+    return [out.model_validate(r) for r in results]
+
+
+@router.get("/export", response_class=StreamingResponse)
+async def export_results_stream(
+    format: str = Query("ndjson", pattern="^(ndjson|csv|geojson)$"),
+    bbox: Optional[str] = Query(None, description="minx,miny,maxx,maxy (EPSG:4326)"),
+    intersects: Optional[str] = Query(None, description="WKT geometry (EPSG:4326)"),
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    result_type: Optional[str] = None,
+    run_id: Optional[str] = None,
+) -> StreamingResponse:
+    """
+    Stream every matching result, newest first, as NDJSON, CSV or a GeoJSON
+    FeatureCollection (footprints as geometries). Rows come from a
+    server-side cursor and are written as they arrive, so exports of any
+    size run in constant memory.
+    """
+    filters = {
+        "intersects_wkt": _search_area(bbox, intersects),
+        "start": start,
+        "end": end,
+        "result_type": result_type,
+        "run_id": run_id,
+    }
+    media_type, _ = EXPORT_FORMATS[format]
+    return StreamingResponse(
+        export_results(format, filters),
+        media_type=media_type,
+        headers=export_headers(format),
+    )
+
+
+def _search_area(bbox: Optional[str], intersects: Optional[str]) -> Optional[str]:
+    "WKT of the search area from either a bbox or a WKT geometry"
+    if bbox is not None and intersects is not None:
+        raise HTTPException(status_code=400, detail="Use either bbox or intersects.")
+    if bbox is not None:
+        try:
+            minx, miny, maxx, maxy = (float(v) for v in bbox.split(","))
+        except ValueError as e:
+            raise HTTPException(
+                status_code=400, detail="bbox must be minx,miny,maxx,maxy."
+            ) from e
+        if minx > maxx or miny > maxy:
+            raise HTTPException(status_code=400, detail="bbox min exceeds max.")
+        return box(minx, miny, maxx, maxy).wkt
+    if intersects is not None:
+        try:
+            shapely_wkt.loads(intersects)
+        except Exception as e:
+            raise HTTPException(
+                status_code=400, detail="intersects is not valid WKT."
+            ) from e
+    return intersects
 
 
 @router.get("/{result_id}", response_model=ResultOut)
-def get_result(result_id: str, uow: UnitOfWork = Depends(get_uow)) -> ResultOut:
+async def get_result(
+    result_id: str,
+    request: Request,
+    response: Response,
+    uow: AsyncUnitOfWork = Depends(get_async_uow),
+) -> Union[ResultOut, Response]:
+    # Served from the entity cache when warm: a 304 then needs no query
+    res = await uow.results.get(result_id)
+    if not res:
+        raise HTTPException(status_code=404, detail="Result not found.")
+    out = ResultOut.model_validate(res)
+    return not_modified(request, response, [out], out.created_at) or out
+
+
+@router.get("/{result_id}/tiles/{z}/{x}/{y}.png")
+def get_result_tile(
+    result_id: str,
+    z: int,
+    x: int,
+    y: int,
+    request: Request,
+    colormap: Optional[str] = Query(default=None, pattern="^(classes|viridis)$"),
+    uow: UnitOfWork = Depends(get_uow),
+) -> Response:
+    """
+    XYZ PNG tile of a raster result (EPSG:3857/4326 chunked stores).
+    Sync on purpose: rendering is CPU-bound and belongs in the threadpool.
+    """
     res = uow.results.get(result_id)
     if not res:
         raise HTTPException(status_code=404, detail="Result not found.")
-    return ResultOut.model_validate(res)
+    path = _local_raster_path(request, res.uri)
+    if path is None:
+        raise HTTPException(status_code=404, detail="Result has no tiled raster.")
+
+    tiles = request.app.state.container.tiles
+    try:
+        tag = tiles.etag(path, z, x, y, colormap)
+        headers = {"ETag": f'"{tag}"', "Cache-Control": "public, max-age=3600"}
+        if etag_matches(request, tag):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        png, _ = tiles.get_tile(path, z, x, y, colormap)
+    except TileError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+    return Response(content=png, media_type="image/png", headers=headers)
+
+
+def _local_raster_path(request: Request, uri: str) -> Optional[Path]:
+    """
+    Chunked raster store behind a file:// or data_root-relative result URI.
+    Paths resolving outside data_root (absolute or via "..") are rejected.
+    """
+    container = getattr(request.app.state, "container", None)
+    data_root = getattr(getattr(container, "data_manager", None), "data_root", None)
+    if data_root is None:
+        return None
+    parsed = urlparse(uri)
+    if parsed.scheme == "file":
+        path = Path(url2pathname(parsed.path))
+    elif parsed.scheme == "":
+        path = Path(data_root) / uri
+    else:
+        return None
+    path = path.resolve()
+    if Path(data_root).resolve() not in path.parents:
+        return None
+    return path if ChunkedRasterStore.is_store(path) else None
@@ -1,18 +1,26 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from contextlib import ExitStack
+from typing import Union
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from fastapi.responses import StreamingResponse
 from backend.db.models import Run
-from backend.db.uow import UnitOfWork
+from backend.db.async_uow import AsyncUnitOfWork
+from backend.events.bus import RunEvent, get_event_bus
 from backend.api.schemas.runs import RunCreate, RunOut
-from backend.api.deps import get_uow
+from backend.api.conditional import not_modified
+from backend.api.deps import get_async_uow
+from backend.api.sse import SSE_HEADERS, run_event_stream
 
 router = APIRouter(prefix="/runs", tags=["runs"])
 
 
 @router.post("", response_model=RunOut, status_code=status.HTTP_201_CREATED)
-def register_run(payload: RunCreate, uow: UnitOfWork = Depends(get_uow)) -> RunOut:
+async def register_run(
+    payload: RunCreate, uow: AsyncUnitOfWork = Depends(get_async_uow)
+) -> RunOut:
     # Ensure dataset exists
-    ds = uow.datasets.get(payload.dataset_id)
+    ds = await uow.datasets.get(payload.dataset_id)
     if not ds:
         raise HTTPException(status_code=404, detail="Dataset not found.")
 
@@ -22,13 +30,71 @@ def register_run(payload: RunCreate, uow: UnitOfWork = Depends(get_uow)) -> RunO
         status="created",
         params_json=payload.params,
     )
-    uow.runs.add(run)
+    await uow.runs.add(run)
     return RunOut.model_validate(run)
 
 
 @router.get("/{run_id}", response_model=RunOut)
-def get_run(run_id: str, uow: UnitOfWork = Depends(get_uow)) -> RunOut:
-    run = uow.runs.get(run_id)
+async def get_run(
+    run_id: str,
+    request: Request,
+    response: Response,
+    uow: AsyncUnitOfWork = Depends(get_async_uow),
+) -> Union[RunOut, Response]:
+    run = await uow.runs.get(run_id)
     if not run:
         raise HTTPException(status_code=404, detail="Run not found.")
+    out = RunOut.model_validate(run)
+    # No Last-Modified: the status changes without a timestamp
+    return not_modified(request, response, [out]) or out
+
+
+@router.post(
+    "/{run_id}/execute", response_model=RunOut, status_code=status.HTTP_202_ACCEPTED
+)
+async def execute_run(
+    run_id: str,
+    response: Response,
+    uow: AsyncUnitOfWork = Depends(get_async_uow),
+) -> RunOut:
+    """
+    Queue a created (or failed) run for the worker pool; poll GET /runs/{id}
+    (Location header) until its status is done or failed.
+    """
+    run = await uow.runs.get(run_id)
+    if not run:
+        raise HTTPException(status_code=404, detail="Run not found.")
+    if not await uow.runs.enqueue(run_id):
+        raise HTTPException(status_code=409, detail=f"Run is already {run.status}.")
+    response.headers["Location"] = f"/runs/{run_id}"
     return RunOut.model_validate(run)
+
+
+@router.get("/{run_id}/events")
+async def stream_run_events(run_id: str, request: Request) -> StreamingResponse:
+    """
+    Server-Sent Events of a run: its current status, then status transitions
+    and progress reports (event types "status" and "progress") until it is
+    done or failed.
+    """
+    resources = ExitStack()
+    # Subscribe before reading the status, so no transition falls in between
+    sub = resources.enter_context(get_event_bus().subscribe(run_id))
+    try:
+        # Own short unit of work: no session is held open by the stream
+        async with AsyncUnitOfWork() as uow:
+            current = await uow.runs.status_of(run_id)
+    except BaseException:
+        resources.close()
+        raise
+    if current is None:
+        resources.close()
+        raise HTTPException(status_code=404, detail="Run not found.")
+    run_status, error = current
+    extra = {"error": error} if error else {}
+    first = RunEvent.status(run_id, run_status, **extra)
+    return StreamingResponse(
+        run_event_stream(request, sub, resources, first),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS,
+    )
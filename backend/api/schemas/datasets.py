@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from datetime import datetime
-from typing import Optional
+from typing import Dict, List, Optional
 from pydantic import BaseModel, Field, ConfigDict
 
 
@@ -23,3 +23,32 @@ class DatasetOut(BaseModel):
     name: str
     description: Optional[str]
     created_at: datetime
+
+
+class LatestResultOut(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+    id: str
+    result_type: str
+    uri: str
+    created_at: datetime
+
+
+class RunSummaryOut(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+    id: str
+    plugin_name: str
+    status: str
+    created_at: datetime
+    latest_results: List[LatestResultOut]
+
+
+class DatasetSummaryOut(BaseModel):
+    "Dataset overview for dashboards (one request instead of one per run)"
+
+    model_config = ConfigDict(from_attributes=True)
+    dataset: DatasetOut
+    run_count: int
+    result_count: int
+    runs_by_status: Dict[str, int]
+    results_by_type: Dict[str, int]
+    runs: List[RunSummaryOut]
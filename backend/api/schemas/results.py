@@ -2,7 +2,8 @@ from __future__ import annotations
 
 from datetime import datetime
 from typing import Any, Dict, Optional
-from pydantic import BaseModel, Field, ConfigDict
+from pydantic import BaseModel, Field, ConfigDict, field_validator
+from shapely import wkt as shapely_wkt
 
 
 class ResultCreate(BaseModel):
@@ -13,6 +14,17 @@ class ResultCreate(BaseModel):
     metrics: Optional[Dict[str, Any]] = None
     footprint_wkt: Optional[str] = None
 
+    @field_validator("footprint_wkt")
+    @classmethod
+    def _check_wkt(cls, value: Optional[str]) -> Optional[str]:
+        # Invalid WKT would otherwise only fail when the geometry is inserted
+        if value is not None:
+            try:
+                shapely_wkt.loads(value)
+            except Exception as e:
+                raise ValueError(f"footprint_wkt is not valid WKT: {e}") from e
+        return value
+
 
 class ResultOut(BaseModel):
     model_config = ConfigDict(from_attributes=True)
@@ -23,3 +35,11 @@ class ResultOut(BaseModel):
     metrics_json: Optional[Dict[str, Any]]
     footprint_wkt: Optional[str]
     created_at: datetime
+
+
+class ResultFootprintOut(BaseModel):
+    "Lightweight search hit for map rendering"
+
+    model_config = ConfigDict(from_attributes=True)
+    id: str
+    footprint_wkt: Optional[str]
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from datetime import datetime
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 from pydantic import BaseModel, Field, ConfigDict
 
 
@@ -20,3 +20,7 @@ class RunOut(BaseModel):
     status: str
     params_json: Dict[str, Any]
     created_at: datetime
+    attempts: int = 0
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    error: Optional[str] = None
@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+from contextlib import ExitStack
+from itertools import count
+from typing import AsyncIterator
+
+from fastapi import Request
+
+from backend.db.models import RUN_DONE, RUN_FAILED
+from backend.events.bus import STATUS, RunEvent, Subscription
+
+# Comment line sent when idle, so proxies keep the connection open
+KEEPALIVE_SECONDS = 15.0
+
+SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+TERMINAL_STATUSES = frozenset({RUN_DONE, RUN_FAILED})
+
+
+def format_event(event: RunEvent, event_id: int) -> str:
+    return f"event: {event.type}\nid: {event_id}\ndata: {event.to_json()}\n\n"
+
+
+def is_terminal(event: RunEvent) -> bool:
+    return event.type == STATUS and event.data.get("status") in TERMINAL_STATUSES
+
+
+async def run_event_stream(
+    request: Request,
+    sub: Subscription,
+    resources: ExitStack,
+    first: RunEvent,
+    keepalive: float = KEEPALIVE_SECONDS,
+) -> AsyncIterator[str]:
+    """
+    SSE body: first (the current status), then the run's events until it is
+    done/failed or the client goes away. resources (the subscription) are
+    released when the stream ends.
+    """
+    ids = count(1)
+    try:
+        yield format_event(first, next(ids))
+        if is_terminal(first):
+            return
+        while True:
+            event = await sub.get(timeout=keepalive)
+            if event is None:
+                if await request.is_disconnected():
+                    return
+                yield ": keepalive\n\n"
+                continue
+            yield format_event(event, next(ids))
+            if is_terminal(event):
+                return
+    finally:
+        resources.close()
@@ -1,4 +1,6 @@
 from __future__ import annotations
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
 from fastapi import FastAPI
 from core.services import get_container
 from backend.api.health import router as health_router
@@ -9,12 +11,26 @@ from backend.api.routers.runs import router as runs_router
 from backend.api.routers.results import router as results_router
 from backend.api.routers.query import router as query_router
 from backend.api.inference import router as inference_router
+from backend.api.pagination import NEXT_CURSOR_HEADER
 from fastapi.middleware.cors import CORSMiddleware
 from core.middleware import ASGIMetricsAndErrorMiddleware
+from backend.events.pg import start_run_event_listener
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    # Run events and cache invalidations of other processes arrive via
+    # LISTEN/NOTIFY; the listener connects (and reconnects) in the background
+    listener = start_run_event_listener()
+    try:
+        yield
+    finally:
+        if listener is not None:
+            await listener.stop()
 
 
 def create_app() -> FastAPI:
-    app = FastAPI(title="GeoAI-Platform", version="0.1.0")
+    app = FastAPI(title="GeoAI-Platform", version="0.1.0", lifespan=lifespan)
 
     app.add_middleware(
         CORSMiddleware,
@@ -25,6 +41,7 @@ def create_app() -> FastAPI:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=[NEXT_CURSOR_HEADER],
     )
 
     app.add_middleware(ASGIMetricsAndErrorMiddleware)
@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import os
+import threading
+from typing import Optional
+
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+
+from core.config.settings import load_database_settings
+
+_ENGINE: Optional[AsyncEngine] = None
+_SESSIONMAKER: Optional[async_sessionmaker[AsyncSession]] = None
+_LOCK = threading.Lock()
+
+
+def create_async_db_engine() -> AsyncEngine:
+    settings = load_database_settings()
+    # asyncpg prepared-statement cache per connection (0 disables it,
+    # e.g. behind pgbouncer in transaction mode)
+    connect_args: dict = {"statement_cache_size": settings.statement_cache_size}
+    if settings.statement_timeout_ms:
+        connect_args["server_settings"] = {
+            "statement_timeout": str(settings.statement_timeout_ms)
+        }
+    return create_async_engine(
+        settings.async_url,
+        pool_size=settings.pool_size,
+        max_overflow=settings.max_overflow,
+        pool_recycle=settings.pool_recycle,
+        pool_pre_ping=True,
+        connect_args=connect_args,
+    )
+
+
+def get_async_engine() -> AsyncEngine:
+    "Process-wide async engine, created on first use"
+    global _ENGINE, _SESSIONMAKER
+    if _ENGINE is None:
+        with _LOCK:
+            if _ENGINE is None:
+                _ENGINE = create_async_db_engine()
+                _SESSIONMAKER = async_sessionmaker(
+                    bind=_ENGINE, autoflush=False, expire_on_commit=False
+                )
+    return _ENGINE
+
+
+def _reset_after_fork() -> None:
+    # See backend.db.session: a forked worker opens its own connections
+    global _LOCK
+    _LOCK = threading.Lock()
+    if _ENGINE is not None:
+        _ENGINE.sync_engine.dispose(close=False)
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def new_async_session() -> AsyncSession:
+    "Session bound to the process-wide async engine"
+    get_async_engine()
+    assert _SESSIONMAKER is not None
+    return _SESSIONMAKER()
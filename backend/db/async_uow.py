@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+from typing import Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from backend.db.async_session import new_async_session
+from backend.db.cache import (
+    EntityCache,
+    discard_changes,
+    get_entity_cache,
+    invalidate_committed,
+    notify_changes_async,
+)
+from backend.events.pg import discard_events, publish_committed_events
+from backend.db.repositories.datasets import AsyncDatasetRepository
+from backend.db.repositories.runs import AsyncRunRepository
+from backend.db.repositories.results import AsyncResultRepository
+
+
+class AsyncUnitOfWork:
+    """
+    Async Unit of Work (asyncpg): same contract as UnitOfWork, but requests
+    wait on the database without holding a threadpool thread.
+    """
+
+    def __init__(self, cache: Optional[EntityCache] = None) -> None:
+        self.session: Optional[AsyncSession] = None
+        self.cache = cache if cache is not None else get_entity_cache()
+
+        # Initialized in __aenter__
+        self.datasets: AsyncDatasetRepository
+        self.runs: AsyncRunRepository
+        self.results: AsyncResultRepository
+
+    async def __aenter__(self) -> "AsyncUnitOfWork":
+        self.session = new_async_session()
+        self.datasets = AsyncDatasetRepository(self.session)
+        self.runs = AsyncRunRepository(self.session, self.cache)
+        self.results = AsyncResultRepository(self.session, self.cache)
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        assert self.session is not None
+
+        try:
+            if exc_type is None:
+                await notify_changes_async(self.session)
+                await self.session.commit()
+                invalidate_committed(self.session.sync_session, self.cache)
+                publish_committed_events(self.session.sync_session)
+            else:
+                await self.session.rollback()
+                discard_changes(self.session.sync_session)
+                discard_events(self.session.sync_session)
+        finally:
+            await self.session.close()
@@ -0,0 +1,355 @@
+from __future__ import annotations
+
+import copy
+import hashlib
+import json
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Set, Tuple, Type
+
+from sqlalchemy import Select, event, func, inspect, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, make_transient_to_detached
+from sqlalchemy.orm.attributes import set_committed_value
+
+from core.config.loader import load_config
+from core.config.settings import settings
+from core.data_manager.cache import LRUCache
+from core.utils.fs import atomic_write_bytes
+from backend.db.models import Dataset, Result, Run
+
+# Snapshot of an entity's loaded (non-deferred) column values
+Snapshot = Dict[str, Any]
+
+# Marker key: drop everything (cascading deletes hide which rows went away)
+ALL = ("*",)
+
+_PENDING = "entity_cache.pending"
+
+# Invalidation counters are striped over this many slots (bounded memory)
+_VERSION_SLOTS = 4096
+
+# NOTIFY channel of committed writes, for the caches of other processes
+CACHE_CHANNEL = "entity_cache"
+# NOTIFY payloads are limited to 8000 bytes; larger key sets send ALL
+MAX_NOTIFY_BYTES = 7900
+
+
+def entity_key(model: Type[Any], entity_id: str) -> Tuple[str, str]:
+    return (model.__name__, entity_id)
+
+
+def run_results_key(run_id: str) -> Tuple[str, str]:
+    "Key of the generation token of a run's result pages"
+    return ("Result.run", run_id)
+
+
+class SharedDirCache:
+    """
+    Cache shared by the worker processes of one host: one JSON file per key
+    in a directory (a local stand-in for a networked cache). Same get/set/
+    delete/clear surface as LRUCache; entries expire after ttl seconds.
+    """
+
+    def __init__(self, root: Path, ttl: Optional[float] = None) -> None:
+        self.root = root
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._ttl = ttl
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        try:
+            entry = json.loads(self._path(key).read_bytes(), object_hook=_decode)
+        except (FileNotFoundError, ValueError):
+            return default
+        if entry["expires_at"] is not None and entry["expires_at"] <= time.time():
+            self.delete(key)
+            return default
+        return entry["value"]
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        ttl = self._ttl if ttl is None else ttl
+        expires_at = time.time() + ttl if ttl is not None else None
+        data = json.dumps({"expires_at": expires_at, "value": value}, default=_encode)
+        atomic_write_bytes(self._path(key), data.encode("utf-8"))
+
+    def delete(self, key: Hashable) -> bool:
+        try:
+            self._path(key).unlink()
+            return True
+        except FileNotFoundError:
+            return False
+
+    def clear(self) -> None:
+        for path in self.root.glob("*.json"):
+            path.unlink(missing_ok=True)
+
+    def _path(self, key: Hashable) -> Path:
+        digest = hashlib.sha1(json.dumps(key).encode("utf-8")).hexdigest()
+        return self.root / f"{digest}.json"
+
+
+def _encode(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"__datetime__": value.isoformat()}
+    raise TypeError(f"Not JSON serializable: {type(value).__name__}")
+
+
+def _decode(obj: Dict[str, Any]) -> Any:
+    if len(obj) == 1 and "__datetime__" in obj:
+        return datetime.fromisoformat(obj["__datetime__"])
+    return obj
+
+
+class EntityCache:
+    """
+    Read-through cache of Run/Result rows for the repositories.
+    - values are snapshots of column values, never live ORM objects; a hit
+      is attached to the caller's session with merge(load=False), no SQL
+    - a run's result pages are keyed by a generation token, so one delete
+      invalidates all of them
+    - writes are collected per session at flush and invalidated by the unit
+      of work after a successful commit (see invalidate_committed)
+    - readers take version(key) before querying and pass it to put/put_page;
+      a value read before a concurrent invalidation is then not stored
+    """
+
+    def __init__(self, store: Any) -> None:
+        self._store = store
+        self._lock = threading.Lock()
+        self._epoch = 0
+        self._versions = [0] * _VERSION_SLOTS
+
+    def version(self, key: Tuple[str, ...]) -> Tuple[int, int]:
+        "Invalidation count of key; changes whenever key (or ALL) is invalidated"
+        with self._lock:
+            return self._epoch, self._versions[_slot(key)]
+
+    def get(self, model: Type[Any], entity_id: str) -> Optional[Snapshot]:
+        return self._store.get(entity_key(model, entity_id))
+
+    def attach(self, session: Session, model: Type[Any], entity_id: str) -> Any:
+        """
+        Cached entity as a persistent instance of session, None on a miss.
+        merge(load=False) emits no SQL, so the sync session of an AsyncSession
+        can be passed as well.
+        """
+        if _is_pending(session, entity_key(model, entity_id)):
+            return None
+        present = session.identity_map.get(_identity(model, entity_id))
+        if present is not None:
+            return present
+        values = self.get(model, entity_id)
+        if values is None:
+            return None
+        return session.merge(detached(model, values), load=False)
+
+    def attach_page(
+        self, session: Session, run_id: str, page_key: Tuple[Any, ...]
+    ) -> Optional[Tuple[List[Result], Optional[str]]]:
+        "Cached page of a run's results attached to session, None on a miss"
+        if _is_pending(session, run_results_key(run_id)):
+            return None
+        cached = self.get_page(run_id, page_key)
+        if cached is None:
+            return None
+        items = [
+            session.identity_map.get(_identity(Result, values["id"]))
+            or session.merge(detached(Result, values), load=False)
+            for values in cached[0]
+        ]
+        return items, cached[1]
+
+    def put(self, session: Session, entity: Any, version: Tuple[int, int]) -> None:
+        "Store entity unless key was invalidated since version was taken"
+        key = entity_key(type(entity), entity.id)
+        if _is_pending(session, key):
+            return
+        values = snapshot(entity)
+        with self._lock:
+            if self._current(key, version):
+                self._store.set(key, values)
+
+    def get_page(
+        self, run_id: str, page_key: Tuple[Any, ...]
+    ) -> Optional[Tuple[List[Snapshot], Optional[str]]]:
+        token = self._store.get(run_results_key(run_id))
+        if token is None:
+            return None
+        cached = self._store.get(("Result.page", run_id, token) + page_key)
+        return (cached[0], cached[1]) if cached is not None else None
+
+    def put_page(
+        self,
+        session: Session,
+        run_id: str,
+        page_key: Tuple[Any, ...],
+        items: Iterable[Any],
+        next_cursor: Optional[str],
+        version: Tuple[int, int],
+    ) -> None:
+        "Store a page unless the run's pages were invalidated since version"
+        gen_key = run_results_key(run_id)
+        if _is_pending(session, gen_key):
+            return
+        value = [[snapshot(item) for item in items], next_cursor]
+        with self._lock:
+            if not self._current(gen_key, version):
+                return
+            token = self._store.get(gen_key)
+            if token is None:
+                token = hashlib.sha1(f"{run_id}{time.time_ns()}".encode()).hexdigest()
+                self._store.set(gen_key, token)
+            self._store.set(("Result.page", run_id, token) + page_key, value)
+
+    def invalidate(self, keys: Iterable[Tuple[str, ...]]) -> None:
+        with self._lock:
+            for key in keys:
+                if key == ALL:
+                    self._epoch += 1
+                    self._store.clear()
+                    return
+                self._versions[_slot(key)] += 1
+                self._store.delete(key)
+
+    def _current(self, key: Tuple[str, ...], version: Tuple[int, int]) -> bool:
+        return (self._epoch, self._versions[_slot(key)]) == version
+
+
+def _slot(key: Tuple[str, ...]) -> int:
+    return hash(key) % _VERSION_SLOTS
+
+
+def snapshot(entity: Any) -> Snapshot:
+    state = inspect(entity)
+    return {
+        attr.key: copy.deepcopy(state.dict[attr.key])
+        for attr in state.mapper.column_attrs
+        if not attr.deferred and attr.key in state.dict
+    }
+
+
+def detached(model: Type[Any], values: Snapshot) -> Any:
+    "Detached instance holding a snapshot; merge(obj, load=False) attaches it"
+    entity = inspect(model).class_manager.new_instance()
+    for key, value in values.items():
+        set_committed_value(entity, key, copy.deepcopy(value))
+    make_transient_to_detached(entity)
+    return entity
+
+
+def _identity(model: Type[Any], entity_id: str) -> Any:
+    return inspect(model).identity_key_from_primary_key([entity_id])
+
+
+def mark_changed(session: Session, keys: Iterable[Tuple[str, ...]]) -> None:
+    "Record cache keys written in session (for writes that bypass the flush)"
+    session.info.setdefault(_PENDING, set()).update(keys)
+
+
+def changed_keys(entity: Any) -> List[Tuple[str, ...]]:
+    if isinstance(entity, Result):
+        return [entity_key(Result, entity.id), run_results_key(entity.run_id)]
+    if isinstance(entity, Run):
+        return [entity_key(Run, entity.id), run_results_key(entity.id)]
+    return []
+
+
+def invalidate_committed(session: Session, cache: Optional[EntityCache]) -> None:
+    "Drop cache entries written by session's (just committed) transaction"
+    keys: Set[Tuple[str, ...]] = session.info.pop(_PENDING, set())
+    if cache is not None and keys:
+        cache.invalidate(keys)
+
+
+def discard_changes(session: Session) -> None:
+    session.info.pop(_PENDING, None)
+
+
+def invalidation_statement(session: Session) -> Optional[Select]:
+    """
+    pg_notify of the keys written in session, None when there are none or
+    the database is not PostgreSQL. Executed in the transaction, it reaches
+    the listeners of every process only if the transaction commits.
+    """
+    keys = session.info.get(_PENDING)
+    if not keys or session.get_bind().dialect.name != "postgresql":
+        return None
+    payload = json.dumps(sorted(keys), separators=(",", ":"))
+    if len(payload.encode("utf-8")) > MAX_NOTIFY_BYTES:
+        payload = json.dumps([ALL])
+    return select(func.pg_notify(CACHE_CHANNEL, payload))
+
+
+def notify_changes(session: Session) -> None:
+    "Flush session, then announce its writes to other processes (PostgreSQL)"
+    session.flush()
+    stmt = invalidation_statement(session)
+    if stmt is not None:
+        session.execute(stmt)
+
+
+async def notify_changes_async(session: AsyncSession) -> None:
+    "notify_changes for an AsyncSession"
+    await session.flush()
+    stmt = invalidation_statement(session.sync_session)
+    if stmt is not None:
+        await session.execute(stmt)
+
+
+def decode_invalidation(payload: str) -> List[Tuple[str, ...]]:
+    "Cache keys of a CACHE_CHANNEL notification"
+    return [tuple(key) for key in json.loads(payload)]
+
+
+def _is_pending(session: Session, key: Tuple[str, ...]) -> bool:
+    # Uncommitted state of this transaction must not leak into the cache
+    pending = session.info.get(_PENDING, ())
+    return key in pending or ALL in pending
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_changes(session: Session, flush_context: Any) -> None:
+    keys: List[Tuple[str, ...]] = []
+    for entity in (*session.new, *session.dirty):
+        keys.extend(changed_keys(entity))
+    for entity in session.deleted:
+        if isinstance(entity, (Dataset, Run)):
+            # ON DELETE CASCADE removes child rows the session never sees
+            keys.append(ALL)
+        keys.extend(changed_keys(entity))
+    if keys:
+        mark_changed(session, keys)
+
+
+_UNSET: Any = object()
+_CACHE: Any = _UNSET
+_LOCK = threading.Lock()
+
+
+def build_entity_cache() -> Optional[EntityCache]:
+    "Entity cache configured by ENTITY_CACHE_BACKEND (memory, shared or none)"
+    backend = settings.ENTITY_CACHE_BACKEND
+    ttl = settings.ENTITY_CACHE_TTL_SECONDS or None
+    if backend == "memory":
+        store: Any = LRUCache(
+            max_bytes=settings.ENTITY_CACHE_MAX_BYTES, default_ttl=ttl
+        )
+    elif backend == "shared":
+        store = SharedDirCache(load_config().data_root / ".cache" / "entities", ttl)
+    elif backend == "none":
+        return None
+    else:
+        raise ValueError(f"Unknown ENTITY_CACHE_BACKEND: {backend!r}")
+    return EntityCache(store)
+
+
+def get_entity_cache() -> Optional[EntityCache]:
+    "Process-wide entity cache (None when disabled), built on first use"
+    global _CACHE
+    if _CACHE is _UNSET:
+        with _LOCK:
+            if _CACHE is _UNSET:
+                _CACHE = build_entity_cache()
+    return _CACHE
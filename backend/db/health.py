@@ -1,10 +1,9 @@
-from sqlalchemy import create_engine, text
-from core.config.settings import load_database_settings
+from sqlalchemy import text
+from backend.db.session import get_engine
 
 
 def check_db() -> bool:
-    settings = load_database_settings()
-    engine = create_engine(settings.url, pool_pre_ping=True)
-    with engine.connect() as conn:
+    # Borrows a connection from the shared pool instead of building an engine
+    with get_engine().connect() as conn:
         conn.execute(text("SELECT 1;"))
     return True
@@ -7,13 +7,26 @@ from sqlalchemy import (
     String,
     DateTime,
     ForeignKey,
+    Integer,
     Text,
     Index,
+    text,
 )
 from sqlalchemy.dialects.postgresql import JSONB
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy.orm import Mapped, mapped_column, relationship, validates
 from backend.db.base import Base
 from geoalchemy2 import Geometry
+from geoalchemy2.elements import WKTElement
+
+FOOTPRINT_SRID = 4326
+
+# Run lifecycle: created -> queued (submitted) -> running (claimed by a
+# worker) -> done | failed; failed runs may be queued again
+RUN_CREATED = "created"
+RUN_QUEUED = "queued"
+RUN_RUNNING = "running"
+RUN_DONE = "done"
+RUN_FAILED = "failed"
 
 
 def new_id() -> str:
@@ -36,6 +49,9 @@ class Dataset(Base):
         passive_deletes=True,
     )
 
+    # Keyset pagination: ORDER BY created_at DESC, id DESC
+    __table_args__ = (Index("idx_datasets_created_at_id", "created_at", "id"),)
+
 
 class Run(Base):
     __tablename__ = "runs"
@@ -47,7 +63,7 @@ class Run(Base):
         nullable=False,
     )
     plugin_name: Mapped[str] = mapped_column(String, nullable=False)
-    status: Mapped[str] = mapped_column(String, nullable=False, default="created")
+    status: Mapped[str] = mapped_column(String, nullable=False, default=RUN_CREATED)
     params_json: Mapped[Dict[str, Any]] = mapped_column(
         JSONB, nullable=False, default=dict
     )
@@ -55,6 +71,14 @@ class Run(Base):
         DateTime, nullable=False, default=datetime.utcnow
     )
 
+    # Job queue bookkeeping (see backend.jobs)
+    worker_id: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    started_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    heartbeat_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    finished_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+
     dataset: Mapped["Dataset"] = relationship(back_populates="runs")
 
     results: Mapped[List["Result"]] = relationship(
@@ -66,6 +90,20 @@ class Run(Base):
     __table_args__ = (
         Index("idx_runs_dataset_id", "dataset_id"),
         Index("idx_runs_status", "status"),
+        Index("idx_runs_created_at_id", "created_at", "id"),
+        Index("idx_runs_dataset_created_at_id", "dataset_id", "created_at", "id"),
+        # Workers claim the oldest queued run and reap stale running ones
+        Index(
+            "idx_runs_queued",
+            "created_at",
+            "id",
+            postgresql_where=text("status = 'queued'"),
+        ),
+        Index(
+            "idx_runs_running_heartbeat",
+            "heartbeat_at",
+            postgresql_where=text("status = 'running'"),
+        ),
     )
 
 
@@ -83,8 +121,9 @@ class Result(Base):
     metrics_json: Mapped[Optional[Dict[str, Any]]] = mapped_column(JSONB, nullable=True)
     footprint_wkt: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     footprint_geom: Mapped[Optional[Any]] = mapped_column(
-        Geometry(geometry_type="GEOMETRY", srid=4326),
+        Geometry(geometry_type="GEOMETRY", srid=FOOTPRINT_SRID),
         nullable=True,
+        deferred=True,  # only used in SQL filters; not loaded with the row
     )
     created_at: Mapped[datetime] = mapped_column(
         DateTime, nullable=False, default=datetime.utcnow
@@ -98,10 +137,18 @@ class Result(Base):
         passive_deletes=True,
     )
 
+    @validates("footprint_wkt")
+    def _sync_footprint_geom(self, key: str, wkt: Optional[str]) -> Optional[str]:
+        "Keep the indexed geometry in step with the WKT text"
+        self.footprint_geom = WKTElement(wkt, srid=FOOTPRINT_SRID) if wkt else None
+        return wkt
+
     __table_args__ = (
         Index("idx_results_run_id", "run_id"),
         Index("idx_results_type", "result_type"),
         Index("idx_results_geom", "footprint_geom", postgresql_using="gist"),
+        Index("idx_results_created_at_id", "created_at", "id"),
+        Index("idx_results_run_created_at_id", "run_id", "created_at", "id"),
     )
 
 
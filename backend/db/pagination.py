@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import base64
+import json
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Generic, List, Optional, TypeVar
+
+from sqlalchemy import Select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+T = TypeVar("T")
+
+
+class InvalidCursor(ValueError):
+    "Raised for malformed or tampered cursor tokens"
+
+
+@dataclass(frozen=True)
+class Cursor:
+    "Keyset position: the (created_at, id) of the last row of a page"
+
+    created_at: datetime
+    id: str
+
+    def encode(self) -> str:
+        raw = json.dumps([self.created_at.isoformat(), self.id]).encode("utf-8")
+        return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+    @classmethod
+    def decode(cls, token: str) -> "Cursor":
+        try:
+            raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+            created_at, row_id = json.loads(raw)
+            return cls(datetime.fromisoformat(created_at), str(row_id))
+        except (ValueError, TypeError) as e:
+            raise InvalidCursor(f"Invalid cursor: {token!r}") from e
+
+
+@dataclass(frozen=True)
+class Page(Generic[T]):
+    "One page of rows plus the cursor of the next page (None on the last page)"
+
+    items: List[T]
+    next_cursor: Optional[str]
+
+
+def fetch_page(
+    session: Session,
+    stmt: Select,
+    model: Any,
+    limit: int,
+    cursor: Optional[str] = None,
+    offset: int = 0,
+) -> Page:
+    """
+    Newest-first page of stmt ordered by (created_at, id) DESC.
+    With a cursor the query seeks past it, (created_at, id) < cursor, so it
+    walks the composite index and costs the same at any depth. offset is
+    only applied without a cursor (kept for compatibility).
+    One extra row is fetched to tell whether a next page exists.
+    """
+    stmt = page_statement(stmt, model, limit, cursor, offset)
+    return to_page(list(session.scalars(stmt).all()), limit)
+
+
+async def fetch_page_async(
+    session: AsyncSession,
+    stmt: Select,
+    model: Any,
+    limit: int,
+    cursor: Optional[str] = None,
+    offset: int = 0,
+) -> Page:
+    "Async variant of fetch_page"
+    stmt = page_statement(stmt, model, limit, cursor, offset)
+    return to_page(list((await session.scalars(stmt)).all()), limit)
+
+
+def page_statement(
+    stmt: Select,
+    model: Any,
+    limit: int,
+    cursor: Optional[str] = None,
+    offset: int = 0,
+) -> Select:
+    if cursor is not None:
+        pos = Cursor.decode(cursor)
+        stmt = stmt.where(
+            tuple_(model.created_at, model.id) < tuple_(pos.created_at, pos.id)
+        )
+    elif offset:
+        stmt = stmt.offset(offset)
+    return stmt.order_by(model.created_at.desc(), model.id.desc()).limit(limit + 1)
+
+
+def to_page(rows: List[Any], limit: int) -> Page:
+    "Page of the first limit rows; a surplus row means there is a next page"
+    if len(rows) <= limit:
+        return Page(rows, None)
+    last = rows[limit - 1]
+    return Page(rows[:limit], Cursor(last.created_at, last.id).encode())
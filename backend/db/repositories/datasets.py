@@ -1,9 +1,43 @@
 from __future__ import annotations
 
-from typing import Iterable, Optional
-from sqlalchemy import select
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+from sqlalchemy import Select, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from backend.db.models import Dataset
+from backend.db.bulk import bulk_insert_async
+from backend.db.models import Dataset, Result, Run
+from backend.db.pagination import Page, fetch_page, fetch_page_async
+
+
+@dataclass(frozen=True)
+class RunSummary:
+    id: str
+    plugin_name: str
+    status: str
+    created_at: Any
+    latest_results: List[Any]
+
+
+@dataclass(frozen=True)
+class DatasetSummary:
+    """
+    Overview of a dataset: run and result counts over all its runs, plus
+    the newest runs with their latest results (projected columns only).
+    """
+
+    dataset: Dataset
+    runs_by_status: Dict[str, int]
+    results_by_type: Dict[str, int]
+    runs: List[RunSummary]
+
+    @property
+    def run_count(self) -> int:
+        return sum(self.runs_by_status.values())
+
+    @property
+    def result_count(self) -> int:
+        return sum(self.results_by_type.values())
 
 
 class DatasetRepository:
@@ -16,13 +50,15 @@ class DatasetRepository:
         return self._session.get(Dataset, dataset_id)
 
     def list(self, limit: int = 100, offset: int = 0) -> Iterable[Dataset]:
-        stmt = (
-            select(Dataset)
-            .order_by(Dataset.created_at.desc())
-            .limit(limit)
-            .offset(offset)
+        return self.page(limit=limit, offset=offset).items
+
+    def page(
+        self, limit: int = 100, cursor: Optional[str] = None, offset: int = 0
+    ) -> Page[Dataset]:
+        "Newest-first keyset page (see backend.db.pagination)"
+        return fetch_page(
+            self._session, select(Dataset), Dataset, limit, cursor, offset
         )
-        return self._session.scalars(stmt).all()
 
     # def add(self, dataset: Dataset) -> Dataset:
     #     self._session.add(dataset)
@@ -41,3 +77,133 @@ class DatasetRepository:
     def get_by_name(self, name: str) -> Optional[Dataset]:
         stmt = select(Dataset).where(Dataset.name == name)
         return self._session.scalars(stmt).first()
+
+    def summary(
+        self, dataset_id: str, max_runs: int = 50, latest_per_run: int = 1
+    ) -> Optional[DatasetSummary]:
+        "Dataset overview in four aggregate/projection queries (see summary_queries)"
+        dataset = self.get(dataset_id)
+        if dataset is None:
+            return None
+        rows = [
+            self._session.execute(stmt).all()
+            for stmt in summary_queries(dataset_id, max_runs, latest_per_run)
+        ]
+        return build_summary(dataset, *rows)
+
+
+class AsyncDatasetRepository:
+    "Async variant of DatasetRepository (AsyncSession)"
+
+    def __init__(self, session: AsyncSession) -> None:
+        self._session = session
+
+    async def get(self, dataset_id: str) -> Optional[Dataset]:
+        return await self._session.get(Dataset, dataset_id)
+
+    async def page(
+        self, limit: int = 100, cursor: Optional[str] = None, offset: int = 0
+    ) -> Page[Dataset]:
+        return await fetch_page_async(
+            self._session, select(Dataset), Dataset, limit, cursor, offset
+        )
+
+    async def add(self, dataset: Dataset) -> Dataset:
+        await bulk_insert_async(self._session, [dataset])
+        return dataset
+
+    async def delete(self, dataset: Dataset) -> None:
+        await self._session.delete(dataset)
+
+    async def get_by_name(self, name: str) -> Optional[Dataset]:
+        stmt = select(Dataset).where(Dataset.name == name)
+        return (await self._session.scalars(stmt)).first()
+
+    async def summary(
+        self, dataset_id: str, max_runs: int = 50, latest_per_run: int = 1
+    ) -> Optional[DatasetSummary]:
+        dataset = await self.get(dataset_id)
+        if dataset is None:
+            return None
+        rows = [
+            (await self._session.execute(stmt)).all()
+            for stmt in summary_queries(dataset_id, max_runs, latest_per_run)
+        ]
+        return build_summary(dataset, *rows)
+
+
+def summary_queries(
+    dataset_id: str, max_runs: int, latest_per_run: int
+) -> Tuple[Select, Select, Select, Select]:
+    """
+    - run count per status and result count per result_type (GROUP BY,
+      answered from the dataset_id / run_id indexes)
+    - the max_runs newest runs (id, plugin, status, created_at)
+    - up to latest_per_run newest results of each of those runs, picked in
+      SQL with row_number() over the run's (created_at, id) order
+    No JSON payloads (params, metrics) or geometries are read.
+    """
+    in_dataset = Run.dataset_id == dataset_id
+    by_status = select(Run.status, func.count()).where(in_dataset).group_by(Run.status)
+    by_type = (
+        select(Result.result_type, func.count())
+        .join(Run, Run.id == Result.run_id)
+        .where(in_dataset)
+        .group_by(Result.result_type)
+    )
+    newest = (Run.created_at.desc(), Run.id.desc())
+    runs = (
+        select(Run.id, Run.plugin_name, Run.status, Run.created_at)
+        .where(in_dataset)
+        .order_by(*newest)
+        .limit(max_runs)
+    )
+    rank = (
+        func.row_number()
+        .over(
+            partition_by=Result.run_id,
+            order_by=(Result.created_at.desc(), Result.id.desc()),
+        )
+        .label("rank")
+    )
+    ranked = (
+        select(
+            Result.id, Result.run_id, Result.result_type, Result.uri, Result.created_at
+        )
+        .add_columns(rank)
+        .where(Result.run_id.in_(select(runs.subquery().c.id)))
+        .subquery()
+    )
+    latest = (
+        select(ranked)
+        .where(ranked.c.rank <= latest_per_run)
+        .order_by(ranked.c.run_id, ranked.c.rank)
+    )
+    return by_status, by_type, runs, latest
+
+
+def build_summary(
+    dataset: Dataset,
+    status_rows: Sequence[Any],
+    type_rows: Sequence[Any],
+    run_rows: Sequence[Any],
+    result_rows: Sequence[Any],
+) -> DatasetSummary:
+    latest: Dict[str, List[Any]] = {}
+    for row in result_rows:
+        latest.setdefault(row.run_id, []).append(row)
+    return DatasetSummary(
+        dataset=dataset,
+        runs_by_status={status: n for status, n in status_rows},
+        results_by_type={result_type: n for result_type, n in type_rows},
+        runs=[
+            RunSummary(
+                id=row.id,
+                plugin_name=row.plugin_name,
+                status=row.status,
+                created_at=row.created_at,
+                latest_results=latest.get(row.id, []),
+            )
+            for row in run_rows
+        ],
+    )
@@ -1,26 +1,75 @@
 from __future__ import annotations
 
-from typing import Iterable, Optional
-from sqlalchemy import select
-from sqlalchemy.orm import Session
-from backend.db.models import Result
+from datetime import datetime
+from typing import Any, AsyncIterator, Iterable, List, Optional, Sequence
+from sqlalchemy import RowMapping, Select, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, load_only
+from backend.db.bulk import bulk_insert, bulk_insert_async
+from backend.db.cache import EntityCache, entity_key, run_results_key
+from backend.db.models import FOOTPRINT_SRID, Result
+from backend.db.pagination import Page, fetch_page, fetch_page_async
+
+# Columns of exported results (no geometry: footprint_wkt carries it)
+EXPORT_COLUMNS = (
+    Result.id,
+    Result.run_id,
+    Result.result_type,
+    Result.uri,
+    Result.created_at,
+    Result.footprint_wkt,
+    Result.metrics_json,
+)
 
 
 class ResultRepository:
-    def __init__(self, session: Session) -> None:
+    def __init__(self, session: Session, cache: Optional[EntityCache] = None) -> None:
         self._session = session
+        self._cache = cache
 
     def get(self, result_id: str) -> Optional[Result]:
-        return self._session.get(Result, result_id)
+        "Result by id, read through the entity cache when one is configured"
+        if self._cache is None:
+            return self._session.get(Result, result_id)
+        version = self._cache.version(entity_key(Result, result_id))
+        res = self._cache.attach(self._session, Result, result_id)
+        if res is None:
+            res = self._session.get(Result, result_id)
+            if res is not None:
+                self._cache.put(self._session, res, version)
+        return res
 
     def list(self, limit: int = 100, offset: int = 0) -> Iterable[Result]:
-        stmt = (
-            select(Result)
-            .order_by(Result.created_at.desc())
-            .limit(limit)
-            .offset(offset)
-        )
-        return self._session.scalars(stmt).all()
+        return self.page(limit=limit, offset=offset).items
+
+    def page(
+        self,
+        limit: int = 200,
+        cursor: Optional[str] = None,
+        offset: int = 0,
+        run_id: Optional[str] = None,
+    ) -> Page[Result]:
+        """
+        Newest-first keyset page, optionally of one run's results; pages of
+        a run are read through the entity cache when one is configured.
+        """
+        if run_id is None:
+            return fetch_page(
+                self._session, select(Result), Result, limit, cursor, offset
+            )
+        key = (limit, cursor, offset)
+        if self._cache is not None:
+            version = self._cache.version(run_results_key(run_id))
+            cached = self._cache.attach_page(self._session, run_id, key)
+            if cached is not None:
+                return Page(*cached)
+        stmt = select(Result).where(Result.run_id == run_id)
+        page = fetch_page(self._session, stmt, Result, limit, cursor, offset)
+        if self._cache is not None:
+            self._cache.put_page(
+                self._session, run_id, key, page.items, page.next_cursor, version
+            )
+        return page
 
     # def add(self, result: Result) -> Result:
     #     self._session.add(result)
@@ -32,6 +81,10 @@ class ResultRepository:
         self._session.refresh(result)
         return result
 
+    def add_many(self, results: Iterable[Result]) -> List[Result]:
+        "Insert results in bulk with client-generated ids (no per-row refresh)"
+        return bulk_insert(self._session, list(results))
+
     def delete(self, result: Result) -> None:
         self._session.delete(result)
 
@@ -39,17 +92,157 @@ class ResultRepository:
     def list_by_run(
         self, run_id: str, limit: int = 200, offset: int = 0
     ) -> Iterable[Result]:
-        stmt = (
-            select(Result)
-            .where(Result.run_id == run_id)
-            .order_by(Result.created_at.desc())
-            .limit(limit)
-            .offset(offset)
-        )
-        return self._session.scalars(stmt).all()
+        return self.page(limit=limit, offset=offset, run_id=run_id).items
 
     def get_by_run_and_type(self, run_id: str, result_type: str) -> Optional[Result]:
         stmt = select(Result).where(
             Result.run_id == run_id, Result.result_type == result_type
         )
         return self._session.scalars(stmt).first()
+
+    def search(
+        self, limit: int = 200, cursor: Optional[str] = None, **filters: Any
+    ) -> Page[Result]:
+        """
+        Results whose footprint intersects a WKT geometry (EPSG:4326) and
+        that were created in [start, end), newest first (see search_statement).
+        """
+        stmt = search_statement(**filters)
+        return fetch_page(self._session, stmt, Result, limit, cursor)
+
+
+class AsyncResultRepository:
+    "Async variant of ResultRepository (AsyncSession)"
+
+    def __init__(
+        self, session: AsyncSession, cache: Optional[EntityCache] = None
+    ) -> None:
+        self._session = session
+        self._cache = cache
+
+    async def get(self, result_id: str) -> Optional[Result]:
+        if self._cache is None:
+            return await self._session.get(Result, result_id)
+        version = self._cache.version(entity_key(Result, result_id))
+        res = self._cache.attach(self._session.sync_session, Result, result_id)
+        if res is None:
+            res = await self._session.get(Result, result_id)
+            if res is not None:
+                self._cache.put(self._session.sync_session, res, version)
+        return res
+
+    async def page(
+        self,
+        limit: int = 200,
+        cursor: Optional[str] = None,
+        offset: int = 0,
+        run_id: Optional[str] = None,
+    ) -> Page[Result]:
+        if run_id is None:
+            return await fetch_page_async(
+                self._session, select(Result), Result, limit, cursor, offset
+            )
+        key = (limit, cursor, offset)
+        sync_session = self._session.sync_session
+        if self._cache is not None:
+            version = self._cache.version(run_results_key(run_id))
+            cached = self._cache.attach_page(sync_session, run_id, key)
+            if cached is not None:
+                return Page(*cached)
+        stmt = select(Result).where(Result.run_id == run_id)
+        page = await fetch_page_async(
+            self._session, stmt, Result, limit, cursor, offset
+        )
+        if self._cache is not None:
+            self._cache.put_page(
+                sync_session, run_id, key, page.items, page.next_cursor, version
+            )
+        return page
+
+    async def add(self, result: Result) -> Result:
+        await bulk_insert_async(self._session, [result])
+        return result
+
+    async def add_many(self, results: Iterable[Result]) -> List[Result]:
+        return await bulk_insert_async(self._session, list(results))
+
+    async def delete(self, result: Result) -> None:
+        await self._session.delete(result)
+
+    async def get_by_run_and_type(
+        self, run_id: str, result_type: str
+    ) -> Optional[Result]:
+        stmt = select(Result).where(
+            Result.run_id == run_id, Result.result_type == result_type
+        )
+        return (await self._session.scalars(stmt)).first()
+
+    async def search(
+        self, limit: int = 200, cursor: Optional[str] = None, **filters: Any
+    ) -> Page[Result]:
+        stmt = search_statement(**filters)
+        return await fetch_page_async(self._session, stmt, Result, limit, cursor)
+
+    async def stream(
+        self,
+        batch_size: int = 1000,
+        statement_timeout_ms: Optional[int] = None,
+        **filters: Any,
+    ) -> AsyncIterator[Sequence[RowMapping]]:
+        """
+        Rows of export_statement(**filters), batch_size at a time, from a
+        server-side cursor: memory stays flat however many rows match.
+        statement_timeout_ms replaces the connection's timeout (PostgreSQL)
+        for this transaction, as the cursor stays open while rows are sent.
+        """
+        sync_session = self._session.sync_session
+        if statement_timeout_ms is not None:
+            if sync_session.get_bind().dialect.name == "postgresql":
+                timeout = func.set_config(
+                    "statement_timeout", str(statement_timeout_ms), True
+                )
+                await self._session.execute(select(timeout))
+        stmt = export_statement(**filters).execution_options(yield_per=batch_size)
+        result = await self._session.stream(stmt)
+        async for batch in result.mappings().partitions():
+            yield batch
+
+
+def search_statement(
+    intersects_wkt: Optional[str] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    result_type: Optional[str] = None,
+    run_id: Optional[str] = None,
+    footprints_only: bool = False,
+) -> Select:
+    """
+    ST_Intersects is answered from the GiST index on footprint_geom.
+    footprints_only loads just id and footprint columns.
+    """
+    stmt = select(Result)
+    if intersects_wkt is not None:
+        area = func.ST_GeomFromText(intersects_wkt, FOOTPRINT_SRID)
+        stmt = stmt.where(func.ST_Intersects(Result.footprint_geom, area))
+    if start is not None:
+        stmt = stmt.where(Result.created_at >= start)
+    if end is not None:
+        stmt = stmt.where(Result.created_at < end)
+    if result_type is not None:
+        stmt = stmt.where(Result.result_type == result_type)
+    if run_id is not None:
+        stmt = stmt.where(Result.run_id == run_id)
+    if footprints_only:
+        stmt = stmt.options(
+            load_only(Result.id, Result.created_at, Result.footprint_wkt)
+        )
+    return stmt
+
+
+def export_statement(**filters: Any) -> Select:
+    "Column rows (EXPORT_COLUMNS) of search_statement(**filters), newest first"
+    return (
+        search_statement(**filters)
+        .with_only_columns(*EXPORT_COLUMNS)
+        .order_by(Result.created_at.desc(), Result.id.desc())
+    )
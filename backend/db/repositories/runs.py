@@ -1,21 +1,56 @@
 from __future__ import annotations
 
-from typing import Iterable, Optional
-from sqlalchemy import select, update
+from datetime import datetime, timedelta
+from typing import Collection, Iterable, List, Optional, Set, Tuple
+from sqlalchemy import Update, case, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from backend.db.models import Run
+from backend.db.bulk import bulk_insert, bulk_insert_async
+from backend.db.cache import EntityCache, entity_key, mark_changed, run_results_key
+from backend.db.models import (
+    RUN_CREATED,
+    RUN_FAILED,
+    RUN_QUEUED,
+    RUN_RUNNING,
+    Run,
+)
+from backend.events.bus import RunEvent
+from backend.events.pg import emit_run_event, emit_run_event_async
+from backend.db.pagination import Page, fetch_page, fetch_page_async
 
 
 class RunRepository:
-    def __init__(self, session: Session) -> None:
+    def __init__(self, session: Session, cache: Optional[EntityCache] = None) -> None:
         self._session = session
+        self._cache = cache
 
     def get(self, run_id: str) -> Optional[Run]:
-        return self._session.get(Run, run_id)
+        "Run by id, read through the entity cache when one is configured"
+        if self._cache is None:
+            return self._session.get(Run, run_id)
+        version = self._cache.version(entity_key(Run, run_id))
+        run = self._cache.attach(self._session, Run, run_id)
+        if run is None:
+            run = self._session.get(Run, run_id)
+            if run is not None:
+                self._cache.put(self._session, run, version)
+        return run
 
     def list(self, limit: int = 100, offset: int = 0) -> Iterable[Run]:
-        stmt = select(Run).order_by(Run.created_at.desc()).limit(limit).offset(offset)
-        return self._session.scalars(stmt).all()
+        return self.page(limit=limit, offset=offset).items
+
+    def page(
+        self,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        offset: int = 0,
+        dataset_id: Optional[str] = None,
+    ) -> Page[Run]:
+        "Newest-first keyset page, optionally of one dataset's runs"
+        stmt = select(Run)
+        if dataset_id is not None:
+            stmt = stmt.where(Run.dataset_id == dataset_id)
+        return fetch_page(self._session, stmt, Run, limit, cursor, offset)
 
     # def add(self, run: Run) -> Run:
     #     self._session.add(run)
@@ -27,6 +62,10 @@ class RunRepository:
         self._session.refresh(run)
         return run
 
+    def add_many(self, runs: Iterable[Run]) -> List[Run]:
+        "Insert runs in bulk with client-generated ids (no per-row refresh)"
+        return bulk_insert(self._session, list(runs))
+
     def delete(self, run: Run) -> None:
         self._session.delete(run)
 
@@ -34,15 +73,208 @@ class RunRepository:
     def list_by_dataset(
         self, dataset_id: str, limit: int = 100, offset: int = 0
     ) -> Iterable[Run]:
+        return self.page(limit=limit, offset=offset, dataset_id=dataset_id).items
+
+    def existing_ids(self, run_ids: Collection[str]) -> Set[str]:
+        "Subset of run_ids present in the database (one query)"
+        if not run_ids:
+            return set()
+        stmt = select(Run.id).where(Run.id.in_(set(run_ids)))
+        return set(self._session.scalars(stmt).all())
+
+    def set_status(self, run_id: str, status: str) -> None:
+        self.set_status_many([run_id], status)
+
+    def set_status_many(self, run_ids: Collection[str], status: str) -> None:
+        if not run_ids:
+            return
+        stmt = update(Run).where(Run.id.in_(list(run_ids))).values(status=status)
+        self._session.execute(stmt)
+        # Bulk UPDATE bypasses the flush, so record the writes for the cache
+        mark_changed(self._session, _run_keys(run_ids))
+
+    # Job queue (see backend.jobs.worker)
+    def enqueue(self, run_id: str) -> bool:
+        "Queue a created or failed run; False if it is queued, running or done"
+        result = self._session.execute(enqueue_statement(run_id))
+        mark_changed(self._session, _run_keys([run_id]))
+        if result.rowcount != 1:
+            return False
+        emit_run_event(self._session, RunEvent.status(run_id, RUN_QUEUED))
+        return True
+
+    def claim_next(self, worker_id: str) -> Optional[Run]:
+        """
+        Claim the oldest queued run for worker_id and mark it running.
+        FOR UPDATE SKIP LOCKED lets concurrent workers claim different rows
+        without blocking on each other; the claim holds once committed.
+        """
         stmt = (
             select(Run)
-            .where(Run.dataset_id == dataset_id)
-            .order_by(Run.created_at.desc())
-            .limit(limit)
-            .offset(offset)
+            .where(Run.status == RUN_QUEUED)
+            .order_by(Run.created_at, Run.id)
+            .limit(1)
+            .with_for_update(skip_locked=True)
+        )
+        run = self._session.scalars(stmt).first()
+        if run is None:
+            return None
+        now = datetime.utcnow()
+        run.status = RUN_RUNNING
+        run.worker_id = worker_id
+        run.attempts += 1
+        run.started_at = run.heartbeat_at = now
+        run.finished_at = run.error = None
+        self._session.flush()
+        emit_run_event(
+            self._session,
+            RunEvent.status(
+                run.id, RUN_RUNNING, worker_id=worker_id, attempt=run.attempts
+            ),
         )
-        return self._session.scalars(stmt).all()
+        return run
 
-    def set_status(self, run_id: str, status: str) -> None:
+    def heartbeat(self, run_id: str, worker_id: str) -> bool:
+        "Refresh a claim; False when the run is no longer this worker's"
+        stmt = (
+            update(Run)
+            .where(
+                Run.id == run_id,
+                Run.worker_id == worker_id,
+                Run.status == RUN_RUNNING,
+            )
+            .values(heartbeat_at=datetime.utcnow())
+        )
+        return self._session.execute(stmt).rowcount == 1
+
+    def finish(
+        self, run_id: str, worker_id: str, status: str, error: Optional[str] = None
+    ) -> bool:
+        "Record the outcome of a claimed run (done or failed)"
+        stmt = (
+            update(Run)
+            .where(
+                Run.id == run_id,
+                Run.worker_id == worker_id,
+                Run.status == RUN_RUNNING,
+            )
+            .values(status=status, error=error, finished_at=datetime.utcnow())
+        )
+        mark_changed(self._session, _run_keys([run_id]))
+        if self._session.execute(stmt).rowcount != 1:
+            return False
+        emit_run_event(self._session, RunEvent.status(run_id, status, error=error))
+        return True
+
+    def requeue_stale(self, stale_after: timedelta, max_attempts: int) -> int:
+        """
+        Runs whose worker stopped heartbeating go back to the queue, or fail
+        once they used up max_attempts. Returns the number of runs touched.
+        """
+        cutoff = datetime.utcnow() - stale_after
+        stmt = (
+            update(Run)
+            .where(Run.status == RUN_RUNNING, Run.heartbeat_at < cutoff)
+            .values(
+                status=case(
+                    (Run.attempts >= max_attempts, RUN_FAILED), else_=RUN_QUEUED
+                ),
+                error=case(
+                    (Run.attempts >= max_attempts, "worker lost (heartbeat timeout)"),
+                    else_=None,
+                ),
+                worker_id=None,
+            )
+            .returning(Run.id, Run.status, Run.error)
+        )
+        rows = self._session.execute(stmt).all()
+        mark_changed(self._session, _run_keys(row.id for row in rows))
+        for row in rows:
+            event = RunEvent.status(row.id, row.status, error=row.error)
+            emit_run_event(self._session, event)
+        return len(rows)
+
+
+class AsyncRunRepository:
+    "Async variant of RunRepository (AsyncSession)"
+
+    def __init__(
+        self, session: AsyncSession, cache: Optional[EntityCache] = None
+    ) -> None:
+        self._session = session
+        self._cache = cache
+
+    async def get(self, run_id: str) -> Optional[Run]:
+        if self._cache is None:
+            return await self._session.get(Run, run_id)
+        version = self._cache.version(entity_key(Run, run_id))
+        run = self._cache.attach(self._session.sync_session, Run, run_id)
+        if run is None:
+            run = await self._session.get(Run, run_id)
+            if run is not None:
+                self._cache.put(self._session.sync_session, run, version)
+        return run
+
+    async def page(
+        self,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        offset: int = 0,
+        dataset_id: Optional[str] = None,
+    ) -> Page[Run]:
+        stmt = select(Run)
+        if dataset_id is not None:
+            stmt = stmt.where(Run.dataset_id == dataset_id)
+        return await fetch_page_async(self._session, stmt, Run, limit, cursor, offset)
+
+    async def add(self, run: Run) -> Run:
+        await bulk_insert_async(self._session, [run])
+        return run
+
+    async def add_many(self, runs: Iterable[Run]) -> List[Run]:
+        return await bulk_insert_async(self._session, list(runs))
+
+    async def delete(self, run: Run) -> None:
+        await self._session.delete(run)
+
+    async def existing_ids(self, run_ids: Collection[str]) -> Set[str]:
+        if not run_ids:
+            return set()
+        stmt = select(Run.id).where(Run.id.in_(set(run_ids)))
+        return set((await self._session.scalars(stmt)).all())
+
+    async def set_status(self, run_id: str, status: str) -> None:
         stmt = update(Run).where(Run.id == run_id).values(status=status)
-        self._session.execute(stmt)
+        await self._session.execute(stmt)
+        mark_changed(self._session.sync_session, _run_keys([run_id]))
+
+    async def status_of(self, run_id: str) -> Optional[Tuple[str, Optional[str]]]:
+        "Current (status, error) straight from the database, bypassing the cache"
+        stmt = select(Run.status, Run.error).where(Run.id == run_id)
+        row = (await self._session.execute(stmt)).first()
+        return (row.status, row.error) if row is not None else None
+
+    async def enqueue(self, run_id: str) -> bool:
+        result = await self._session.execute(enqueue_statement(run_id))
+        mark_changed(self._session.sync_session, _run_keys([run_id]))
+        if result.rowcount != 1:
+            return False
+        await emit_run_event_async(self._session, RunEvent.status(run_id, RUN_QUEUED))
+        return True
+
+
+def enqueue_statement(run_id: str) -> Update:
+    return (
+        update(Run)
+        .where(Run.id == run_id, Run.status.in_([RUN_CREATED, RUN_FAILED]))
+        .values(
+            status=RUN_QUEUED, worker_id=None, attempts=0, error=None, finished_at=None
+        )
+    )
+
+
+def _run_keys(run_ids: Iterable[str]) -> List[tuple]:
+    keys: List[tuple] = []
+    for run_id in run_ids:
+        keys += [entity_key(Run, run_id), run_results_key(run_id)]
+    return keys
@@ -5,6 +5,7 @@ CREATE TABLE IF NOT EXISTS datasets (
   description   TEXT,
   created_at    TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
 );
+CREATE INDEX IF NOT EXISTS idx_datasets_created_at_id ON datasets(created_at, id);
 
 -- Runs (each pipeline execution)
 CREATE TABLE IF NOT EXISTS runs (
@@ -13,10 +14,20 @@ CREATE TABLE IF NOT EXISTS runs (
   plugin_name   TEXT NOT NULL,
   status        TEXT NOT NULL,
   params_json   JSONB NOT NULL DEFAULT '{}'::jsonb,
-  created_at    TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+  created_at    TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+  worker_id     TEXT,
+  attempts      INTEGER NOT NULL DEFAULT 0,
+  started_at    TIMESTAMP,
+  heartbeat_at  TIMESTAMP,
+  finished_at   TIMESTAMP,
+  error         TEXT
 );
 CREATE INDEX IF NOT EXISTS idx_runs_dataset_id ON runs(dataset_id);
 CREATE INDEX IF NOT EXISTS idx_runs_status ON runs(status);
+CREATE INDEX IF NOT EXISTS idx_runs_created_at_id ON runs(created_at, id);
+CREATE INDEX IF NOT EXISTS idx_runs_dataset_created_at_id ON runs(dataset_id, created_at, id);
+CREATE INDEX IF NOT EXISTS idx_runs_queued ON runs(created_at, id) WHERE status = 'queued';
+CREATE INDEX IF NOT EXISTS idx_runs_running_heartbeat ON runs(heartbeat_at) WHERE status = 'running';
 
 -- Results (outputs)
 CREATE TABLE IF NOT EXISTS results (
@@ -32,6 +43,8 @@ CREATE TABLE IF NOT EXISTS results (
 CREATE INDEX IF NOT EXISTS idx_results_run_id ON results(run_id);
 CREATE INDEX IF NOT EXISTS idx_results_type ON results(result_type);
 CREATE INDEX IF NOT EXISTS idx_results_geom ON results USING GIST (footprint_geom);
+CREATE INDEX IF NOT EXISTS idx_results_created_at_id ON results(created_at, id);
+CREATE INDEX IF NOT EXISTS idx_results_run_created_at_id ON results(run_id, created_at, id);
 
 -- Feedback (human-in-the-loop corrections)
 CREATE TABLE IF NOT EXISTS feedback (
@@ -1,24 +1,19 @@
 from __future__ import annotations
 
+import os
+import threading
 from contextlib import contextmanager
-from typing import Iterator
+from typing import Iterator, Optional
 
-from sqlalchemy import create_engine
+from sqlalchemy import Engine, create_engine
 from sqlalchemy.orm import sessionmaker, Session
 
 from core.config.settings import load_database_settings
 
+_ENGINE: Optional[Engine] = None
+_LOCK = threading.Lock()
 
-def create_db_engine():
-    settings = load_database_settings()
-    # pool_pre_ping avoids stale connections in long-running services
-    return create_engine(settings.url, pool_pre_ping=True, future=True)
-
-
-_ENGINE = create_db_engine()
-
-SessionLocal = sessionmaker(
-    bind=_ENGINE,
+_SessionFactory = sessionmaker(
     autoflush=False,
     autocommit=False,
     expire_on_commit=False,
@@ -26,6 +21,62 @@ SessionLocal = sessionmaker(
 )
 
 
+def create_db_engine() -> Engine:
+    settings = load_database_settings()
+    kwargs = {}
+    if settings.url.startswith("postgresql"):
+        kwargs = dict(
+            pool_size=settings.pool_size,
+            max_overflow=settings.max_overflow,
+            pool_recycle=settings.pool_recycle,
+        )
+        if settings.statement_timeout_ms:
+            options = f"-c statement_timeout={settings.statement_timeout_ms}"
+            kwargs["connect_args"] = {"options": options}
+    # pool_pre_ping avoids stale connections in long-running services
+    return create_engine(settings.url, pool_pre_ping=True, **kwargs)
+
+
+def get_engine() -> Engine:
+    """
+    Process-wide engine, created on first use so importing the app does not
+    need a database; every session and the health check share its pool.
+    """
+    global _ENGINE
+    if _ENGINE is None:
+        with _LOCK:
+            if _ENGINE is None:
+                _ENGINE = create_db_engine()
+    return _ENGINE
+
+
+def dispose_engine() -> None:
+    "Close the pool and drop the engine; the next get_engine() builds a new one"
+    global _ENGINE
+    with _LOCK:
+        engine, _ENGINE = _ENGINE, None
+    if engine is not None:
+        engine.dispose()
+
+
+def _reset_after_fork() -> None:
+    # Pooled connections inherited from the parent must not be used (or
+    # closed) by a forked worker; it opens its own on first use
+    global _LOCK
+    _LOCK = threading.Lock()
+    if _ENGINE is not None:
+        _ENGINE.dispose(close=False)
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def SessionLocal() -> Session:
+    "New session bound to the process-wide engine"
+    return _SessionFactory(bind=get_engine())
+
+
 @contextmanager
 def db_session() -> Iterator[Session]:
     "Context-managed DB session"
@@ -3,7 +3,15 @@ from __future__ import annotations
 from contextlib import AbstractContextManager
 from typing import Optional
 from sqlalchemy.orm import Session
+from backend.db.cache import (
+    EntityCache,
+    discard_changes,
+    get_entity_cache,
+    invalidate_committed,
+    notify_changes,
+)
 from backend.db.session import SessionLocal
+from backend.events.pg import discard_events, publish_committed_events
 from backend.db.repositories.datasets import DatasetRepository
 from backend.db.repositories.runs import RunRepository
 from backend.db.repositories.results import ResultRepository
@@ -15,10 +23,14 @@ class UnitOfWork(AbstractContextManager["UnitOfWork"]):
     - owns a SQLAlchemy session per request/use-case
     - exposes repositories bound to that session
     - centralizes commit/rollback
+    - drops entity cache entries it wrote, once the commit succeeded (and
+      NOTIFYs them to the caches of other processes on PostgreSQL)
+    - publishes the run events it emitted (see backend.events.pg)
     """
 
-    def __init__(self) -> None:
+    def __init__(self, cache: Optional[EntityCache] = None) -> None:
         self.session: Optional[Session] = None
+        self.cache = cache if cache is not None else get_entity_cache()
 
         # NOTE: Non-optional attributes; they are initialized in __enter__.
         self.datasets: DatasetRepository
@@ -30,8 +42,8 @@ class UnitOfWork(AbstractContextManager["UnitOfWork"]):
 
         # Repositories are guaranteed to exist after entering the context
         self.datasets = DatasetRepository(self.session)
-        self.runs = RunRepository(self.session)
-        self.results = ResultRepository(self.session)
+        self.runs = RunRepository(self.session, self.cache)
+        self.results = ResultRepository(self.session, self.cache)
         return self
 
     def __exit__(self, exc_type, exc, tb) -> None:
@@ -39,8 +51,13 @@ class UnitOfWork(AbstractContextManager["UnitOfWork"]):
 
         try:
             if exc_type is None:
+                notify_changes(self.session)
                 self.session.commit()
+                invalidate_committed(self.session, self.cache)
+                publish_committed_events(self.session)
             else:
                 self.session.rollback()
+                discard_changes(self.session)
+                discard_events(self.session)
         finally:
             self.session.close()
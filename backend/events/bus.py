@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+# Event types
+STATUS = "status"
+PROGRESS = "progress"
+
+
+@dataclass(frozen=True)
+class RunEvent:
+    "A run status transition or a progress report of one of its stages"
+
+    run_id: str
+    type: str
+    data: Dict[str, Any]
+    ts: float = field(default_factory=time.time)
+
+    def to_json(self) -> str:
+        return json.dumps(
+            {
+                "run_id": self.run_id,
+                "type": self.type,
+                "ts": self.ts,
+                "data": self.data,
+            },
+            separators=(",", ":"),
+            default=str,
+        )
+
+    @classmethod
+    def from_json(cls, raw: str) -> "RunEvent":
+        obj = json.loads(raw)
+        return cls(obj["run_id"], obj["type"], obj["data"], obj["ts"])
+
+    @classmethod
+    def status(cls, run_id: str, status: str, **extra: Any) -> "RunEvent":
+        return cls(run_id, STATUS, {"status": status, **extra})
+
+
+class Subscription:
+    "Bounded queue of one subscriber; when full, the oldest event is dropped"
+
+    def __init__(self, run_id: str, loop: asyncio.AbstractEventLoop, size: int):
+        self.run_id = run_id
+        self.dropped = 0
+        self._loop = loop
+        self._queue: asyncio.Queue[RunEvent] = asyncio.Queue(maxsize=size)
+
+    async def get(self, timeout: Optional[float] = None) -> Optional[RunEvent]:
+        "Next event, or None after timeout seconds"
+        try:
+            return await asyncio.wait_for(self._queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def _put(self, event: RunEvent) -> None:
+        # Runs on the subscriber's loop
+        if self._queue.full():
+            self._queue.get_nowait()
+            self.dropped += 1
+        self._queue.put_nowait(event)
+
+
+class EventBus:
+    """
+    In-process pub/sub of run events, keyed by run id.
+    publish may be called from any thread; events are handed to each
+    subscriber's event loop. Across processes events arrive through
+    PostgreSQL NOTIFY (see backend.events.pg).
+    """
+
+    def __init__(self, queue_size: int = 256) -> None:
+        self._queue_size = queue_size
+        self._lock = threading.Lock()
+        self._subs: Dict[str, List[Subscription]] = {}
+
+    @contextmanager
+    def subscribe(self, run_id: str) -> Iterator[Subscription]:
+        "Subscribe from a coroutine for the duration of the with block"
+        sub = Subscription(run_id, asyncio.get_running_loop(), self._queue_size)
+        with self._lock:
+            self._subs.setdefault(run_id, []).append(sub)
+        try:
+            yield sub
+        finally:
+            with self._lock:
+                subs = self._subs.get(run_id, [])
+                if sub in subs:
+                    subs.remove(sub)
+                if not subs:
+                    self._subs.pop(run_id, None)
+
+    def publish(self, event: RunEvent) -> int:
+        "Deliver event to the run's subscribers; returns how many there were"
+        with self._lock:
+            targets: Tuple[Subscription, ...] = tuple(self._subs.get(event.run_id, ()))
+        for sub in targets:
+            try:
+                sub._loop.call_soon_threadsafe(sub._put, event)
+            except RuntimeError:
+                pass  # the subscriber's loop is closed
+        return len(targets)
+
+    def run_ids(self) -> List[str]:
+        "Runs with at least one subscriber"
+        with self._lock:
+            return list(self._subs)
+
+    def subscriber_count(self, run_id: str) -> int:
+        with self._lock:
+            return len(self._subs.get(run_id, ()))
+
+
+_BUS: Optional[EventBus] = None
+_LOCK = threading.Lock()
+
+
+def get_event_bus() -> EventBus:
+    "Process-wide event bus"
+    global _BUS
+    if _BUS is None:
+        with _LOCK:
+            if _BUS is None:
+                _BUS = EventBus()
+    return _BUS
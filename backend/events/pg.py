@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any, List, Optional
+
+from sqlalchemy import Select, func, select
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from core.config.settings import load_database_settings
+from core.logging.logger import get_module_logger
+from backend.db.cache import (
+    ALL,
+    CACHE_CHANNEL,
+    decode_invalidation,
+    get_entity_cache,
+)
+from backend.events.bus import EventBus, RunEvent, get_event_bus
+
+logger = get_module_logger(__name__)
+
+CHANNEL = "run_events"
+# NOTIFY payloads are limited to 8000 bytes
+MAX_PAYLOAD_BYTES = 7900
+
+_PENDING = "run_events.pending"
+
+
+def notify_statement(event: RunEvent) -> Optional[Select]:
+    payload = event.to_json()
+    if len(payload.encode("utf-8")) > MAX_PAYLOAD_BYTES:
+        logger.warning("Run event for %s too large to NOTIFY; dropped", event.run_id)
+        return None
+    return select(func.pg_notify(CHANNEL, payload))
+
+
+def emit_run_event(session: Session, event: RunEvent) -> None:
+    """
+    Publish event when session's transaction commits.
+    PostgreSQL: NOTIFY in the transaction, which delivers it on commit to
+    the listeners of every replica (including this one). Other databases:
+    queued in the session and published in-process by the unit of work.
+    """
+    if session.get_bind().dialect.name != "postgresql":
+        session.info.setdefault(_PENDING, []).append(event)
+        return
+    stmt = notify_statement(event)
+    if stmt is not None:
+        session.execute(stmt)
+
+
+async def emit_run_event_async(session: AsyncSession, event: RunEvent) -> None:
+    "emit_run_event for an AsyncSession"
+    if session.sync_session.get_bind().dialect.name != "postgresql":
+        session.sync_session.info.setdefault(_PENDING, []).append(event)
+        return
+    stmt = notify_statement(event)
+    if stmt is not None:
+        await session.execute(stmt)
+
+
+def publish_committed_events(session: Session, bus: Optional[EventBus] = None) -> None:
+    "In-process delivery of the events a just committed session queued"
+    events: List[RunEvent] = session.info.pop(_PENDING, [])
+    bus = bus or get_event_bus()
+    for event in events:
+        bus.publish(event)
+
+
+def discard_events(session: Session) -> None:
+    session.info.pop(_PENDING, None)
+
+
+class RunEventListener:
+    """
+    LISTENs over a dedicated asyncpg connection, reconnecting with backoff:
+    - CHANNEL: run events, republished on the in-process bus
+    - CACHE_CHANNEL: writes committed by other processes (API workers,
+      job workers), dropped from this process's entity cache
+    Notifications sent while disconnected are lost, so every (re)connect
+    clears the cache and republishes the status of the subscribed runs.
+    """
+
+    def __init__(
+        self, dsn: str, bus: Optional[EventBus] = None, max_backoff: float = 30.0
+    ) -> None:
+        self._dsn = dsn
+        self._bus = bus or get_event_bus()
+        self._max_backoff = max_backoff
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def _on_notify(self, conn: Any, pid: int, channel: str, payload: str) -> None:
+        try:
+            event = RunEvent.from_json(payload)
+        except (ValueError, KeyError) as exc:
+            logger.warning("Ignoring malformed run event: %s", exc)
+            return
+        self._bus.publish(event)
+
+    def _on_invalidate(self, conn: Any, pid: int, channel: str, payload: str) -> None:
+        cache = get_entity_cache()
+        if cache is None:
+            return
+        try:
+            keys = decode_invalidation(payload)
+        except ValueError as exc:
+            logger.warning("Ignoring malformed cache invalidation: %s", exc)
+            return
+        cache.invalidate(keys)
+
+    async def _resync(self, conn: Any) -> None:
+        "Catch up on what was missed while not listening"
+        cache = get_entity_cache()
+        if cache is not None:
+            cache.invalidate([ALL])
+        run_ids = self._bus.run_ids()
+        if not run_ids:
+            return
+        rows = await conn.fetch(
+            "SELECT id, status, error FROM runs WHERE id = ANY($1)", run_ids
+        )
+        for row in rows:
+            extra = {"error": row["error"]} if row["error"] else {}
+            # A terminal status ends the SSE streams of that run
+            self._bus.publish(RunEvent.status(row["id"], row["status"], **extra))
+
+    async def _run(self) -> None:
+        import asyncpg
+
+        backoff = 1.0
+        while True:
+            try:
+                conn = await asyncpg.connect(self._dsn)
+            except (OSError, asyncpg.PostgresError) as exc:
+                logger.warning("Run event listener cannot connect: %s", exc)
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, self._max_backoff)
+                continue
+            backoff = 1.0
+            closed = asyncio.get_running_loop().create_future()
+            conn.add_termination_listener(
+                lambda _: closed.done() or closed.set_result(None)
+            )
+            try:
+                await conn.add_listener(CHANNEL, self._on_notify)
+                await conn.add_listener(CACHE_CHANNEL, self._on_invalidate)
+                await self._resync(conn)
+                await closed
+                logger.warning("Run event listener connection lost; reconnecting")
+            except (OSError, asyncpg.PostgresError, asyncpg.InterfaceError) as exc:
+                logger.warning("Run event listener failed: %s; reconnecting", exc)
+                await asyncio.sleep(backoff)
+            finally:
+                if not conn.is_closed():
+                    await conn.close()
+
+
+def start_run_event_listener() -> Optional[RunEventListener]:
+    "Listener for this process when the database is PostgreSQL (else None)"
+    url = make_url(load_database_settings().url)
+    if not url.drivername.startswith("postgresql"):
+        return None
+    dsn = url.set(drivername="postgresql").render_as_string(hide_password=False)
+    listener = RunEventListener(dsn)
+    listener.start()
+    return listener
@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-import json
 from dataclasses import dataclass
 from pathlib import Path
 from typing import List, Optional
@@ -10,6 +9,7 @@ from backend.db.uow import UnitOfWork
 # Minimal protocol-like usage assumed: write_text(path, text) -> uri
 from core.data_manager.base import BaseDataManager
 from core.logging.logger import get_module_logger
+from core.utils.fs import dumps_json
 
 logger = get_module_logger(__name__)
 
@@ -70,9 +70,7 @@ def ingest_local_files(inp: LocalIngestionInput, dm: BaseDataManager) -> str:
 
         # Store manifest under a stable path in the data manager
         manifest_relpath = f"datasets/{ds.id}/manifest.json"
-        manifest_uri = dm.write_text(
-            manifest_relpath, json.dumps(manifest, ensure_ascii=False, indent=2)
-        )
+        manifest_uri = dm.write_text(manifest_relpath, dumps_json(manifest))
 
         res = Result(
             run_id=run.id,
@@ -1,12 +1,12 @@
 from __future__ import annotations
 
-import json
 from dataclasses import dataclass
-from typing import Any, Dict, Optional
-from backend.db.models import Run, Result
+from typing import Any, Dict, List, Optional, Sequence
+from backend.db.models import Run, Result, new_id
 from backend.db.uow import UnitOfWork
 from core.data_manager.base import BaseDataManager
 from core.logging.logger import get_module_logger
+from core.utils.fs import dumps_json
 
 from backend.ingestion.validators import (
     ensure_dict,
@@ -51,7 +51,7 @@ def ingest_sentinel_metadata(
         uow.runs.add(run)
 
         relpath = f"datasets/{inp.dataset_id}/sentinel/metadata_{run.id}.json"
-        uri = dm.write_text(relpath, json.dumps(md, ensure_ascii=False, indent=2))
+        uri = dm.write_text(relpath, dumps_json(md))
 
         res = Result(
             run_id=run.id,
@@ -76,3 +76,51 @@ def ingest_sentinel_metadata(
             },
         )
         return run.id
+
+
+def ingest_sentinel_metadata_batch(
+    inputs: Sequence[SentinelMetadataIngestionInput], dm: BaseDataManager
+) -> List[str]:
+    """
+    Batch variant of ingest_sentinel_metadata (e.g. for thousands of STAC
+    items): one transaction, with runs and results bulk-inserted.
+    Returns run_ids in input order.
+    """
+    runs: List[Run] = []
+    results: List[Result] = []
+    for inp in inputs:
+        md = ensure_dict(inp.metadata)
+        item_id = inp.item_id or md.get("id")
+        run = Run(
+            id=new_id(),
+            dataset_id=inp.dataset_id,
+            plugin_name="ingestion.sentinel_metadata",
+            status="running",
+            params_json={
+                "source_name": inp.source_name,
+                "item_id": item_id,
+                "datetime": extract_stac_datetime_iso(md),
+            },
+        )
+        relpath = f"datasets/{inp.dataset_id}/sentinel/metadata_{run.id}.json"
+        results.append(
+            Result(
+                run_id=run.id,
+                result_type="sentinel_metadata",
+                uri=dm.write_text(relpath, dumps_json(md)),
+                metrics_json={"source_name": inp.source_name, "item_id": item_id},
+                footprint_wkt=extract_stac_footprint_wkt(md),
+            )
+        )
+        runs.append(run)
+
+    with UnitOfWork() as uow:
+        uow.runs.add_many(runs)
+        uow.results.add_many(results)
+        uow.runs.set_status_many([run.id for run in runs], "done")
+
+    logger.info(
+        "Sentinel metadata batch ingestion completed",
+        extra={"items": len(runs)},
+    )
+    return [run.id for run in runs]
@@ -0,0 +1,336 @@
+"""
+Run job queue worker.
+
+Runs submitted with POST /runs/{id}/execute are queued in the runs table.
+Any number of worker processes (on any node) claim them with SELECT ...
+FOR UPDATE SKIP LOCKED, execute the named plugin with the run's params and
+record the outputs as Result rows.
+
+    python -m backend.jobs.worker            # serve until SIGTERM/SIGINT
+    python -m backend.jobs.worker --once     # execute at most one run
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import signal
+import socket
+import threading
+import time
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Any, Callable, Dict, List, Optional
+from uuid import uuid4
+
+import numpy as np
+from fastapi.encoders import jsonable_encoder
+from shapely import wkt as shapely_wkt
+from core.config.settings import settings
+from core.logging.logger import Logger, get_module_logger
+from core.plugins.executor import PluginExecutor
+from backend.db.models import RUN_DONE, RUN_FAILED, Result
+from backend.db.uow import UnitOfWork
+from backend.events.bus import PROGRESS, RunEvent
+from backend.events.pg import emit_run_event
+
+logger = get_module_logger(__name__)
+
+
+@dataclass(frozen=True)
+class WorkerSettings:
+    heartbeat_seconds: float = 10.0
+    poll_seconds: float = 1.0
+    stale_seconds: float = 60.0
+    max_attempts: int = 3
+    run_timeout_seconds: Optional[float] = None
+    # Minimum spacing of progress events per stage (the last one always goes)
+    progress_interval_seconds: float = 0.5
+
+
+def load_worker_settings() -> WorkerSettings:
+    return WorkerSettings(
+        heartbeat_seconds=settings.WORKER_HEARTBEAT_SECONDS,
+        poll_seconds=settings.WORKER_POLL_SECONDS,
+        stale_seconds=settings.RUN_STALE_SECONDS,
+        max_attempts=settings.RUN_MAX_ATTEMPTS,
+        run_timeout_seconds=settings.RUN_TIMEOUT_SECONDS or None,
+    )
+
+
+@dataclass(frozen=True)
+class ClaimedRun:
+    id: str
+    plugin_name: str
+    params: Dict[str, Any]
+
+
+class LostClaim(Exception):
+    "The run was requeued or finished by someone else while executing"
+
+
+class RunWorker:
+    """
+    Claims queued runs one at a time and executes them.
+    - the claim (status running + worker_id) is committed right away, so the
+      row lock is only held for the claim itself
+    - a heartbeat thread refreshes heartbeat_at while the plugin runs; runs
+      whose worker died are requeued by any worker after stale_seconds
+    - outputs and the final status are committed together
+    """
+
+    def __init__(
+        self,
+        executor: PluginExecutor,
+        uow_factory: Callable[[], UnitOfWork] = UnitOfWork,
+        config: Optional[WorkerSettings] = None,
+        worker_id: Optional[str] = None,
+        log: Logger = logger,
+    ) -> None:
+        self._executor = executor
+        self._uow = uow_factory
+        self._config = config or load_worker_settings()
+        self.worker_id = worker_id or (
+            f"{socket.gethostname()}:{os.getpid()}:{uuid4().hex[:8]}"
+        )
+        self._log = log
+
+    def run_once(self) -> Optional[str]:
+        "Claim and execute the oldest queued run; returns its id (None if idle)"
+        claimed = self.claim()
+        if claimed is None:
+            return None
+        self.execute(claimed)
+        return claimed.id
+
+    def serve(self, stop: threading.Event) -> None:
+        "Execute runs until stop is set, polling while the queue is empty"
+        last_reap = 0.0
+        while not stop.is_set():
+            try:
+                if time.monotonic() - last_reap >= self._config.stale_seconds / 2:
+                    last_reap = time.monotonic()
+                    self.requeue_stale()
+                busy = self.run_once() is not None
+            except Exception as exc:
+                # e.g. the database is unavailable; keep the worker alive
+                self._log.error("Worker iteration failed: %s", exc)
+                busy = False
+            if not busy:
+                stop.wait(self._config.poll_seconds)
+
+    def claim(self) -> Optional[ClaimedRun]:
+        with self._uow() as uow:
+            run = uow.runs.claim_next(self.worker_id)
+            if run is None:
+                return None
+            return ClaimedRun(run.id, run.plugin_name, dict(run.params_json or {}))
+
+    def requeue_stale(self) -> int:
+        with self._uow() as uow:
+            count = uow.runs.requeue_stale(
+                timedelta(seconds=self._config.stale_seconds),
+                self._config.max_attempts,
+            )
+        if count:
+            self._log.warning("Requeued %s run(s) with a stale heartbeat", count)
+        return count
+
+    def execute(self, run: ClaimedRun) -> None:
+        self._log.info("Executing run %s (%s)", run.id, run.plugin_name)
+        with _Heartbeat(self, run.id, self._config.heartbeat_seconds):
+            try:
+                results = output_results(run.id, self._run_plugin(run))
+            except Exception as exc:
+                # Plugin errors, unknown plugin (KeyError), timeouts, ...
+                self._finish(run.id, RUN_FAILED, error=f"{type(exc).__name__}: {exc}")
+                return
+        self._finish(run.id, RUN_DONE, results=results)
+
+    def heartbeat(self, run_id: str) -> bool:
+        with self._uow() as uow:
+            return uow.runs.heartbeat(run_id, self.worker_id)
+
+    def publish(self, event: RunEvent) -> None:
+        with self._uow() as uow:
+            emit_run_event(uow.session, event)
+
+    def _run_plugin(self, run: ClaimedRun) -> Dict[str, Any]:
+        timeout = self._config.run_timeout_seconds
+        progress = _Progress(self, run.id, self._config.progress_interval_seconds)
+        if timeout is None:
+            return self._executor.run(run.plugin_name, run.params, progress)
+        return self._executor.run_with_timeout(
+            run.plugin_name, run.params, timeout, progress
+        )
+
+    def _finish(
+        self,
+        run_id: str,
+        status: str,
+        error: Optional[str] = None,
+        results: Optional[List[Result]] = None,
+    ) -> None:
+        try:
+            with self._uow() as uow:
+                if not uow.runs.finish(run_id, self.worker_id, status, error):
+                    raise LostClaim(run_id)
+                if results:
+                    uow.results.add_many(results)
+        except LostClaim:
+            # Rolled back: another worker owns the run now
+            self._log.warning("Run %s was reclaimed; discarding its outcome", run_id)
+            return
+        except Exception as exc:
+            if status == RUN_FAILED:
+                # Nothing left to record; the stale-run reaper takes over
+                raise
+            # e.g. a result row the database rejects: fail the run with the cause
+            self._log.error("Recording run %s failed: %s", run_id, exc)
+            self._finish(run_id, RUN_FAILED, error=f"{type(exc).__name__}: {exc}")
+            return
+        self._log.info("Run %s %s", run_id, status)
+
+
+class _Heartbeat:
+    "Background heartbeat for one claimed run"
+
+    def __init__(self, worker: RunWorker, run_id: str, interval: float) -> None:
+        self._worker = worker
+        self._run_id = run_id
+        self._interval = interval
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._loop, name=f"heartbeat-{run_id}", daemon=True
+        )
+
+    def __enter__(self) -> "_Heartbeat":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _loop(self) -> None:
+        while not self._stop.wait(self._interval):
+            try:
+                if not self._worker.heartbeat(self._run_id):
+                    return  # claim lost; _finish will discard the outcome
+            except Exception as exc:
+                logger.warning("Heartbeat for run %s failed: %s", self._run_id, exc)
+
+
+class _Progress:
+    "Plugin progress listener: throttled progress events with throughput"
+
+    def __init__(self, worker: RunWorker, run_id: str, min_interval: float) -> None:
+        self._worker = worker
+        self._run_id = run_id
+        self._min_interval = min_interval
+        self._started: Dict[str, float] = {}
+        self._last: Dict[str, float] = {}
+
+    def __call__(self, stage: str, done: int, total: Optional[int], unit: str) -> None:
+        now = time.monotonic()
+        started = self._started.setdefault(stage, now)
+        final = total is not None and done >= total
+        last = self._last.get(stage)
+        if not final and last is not None and now - last < self._min_interval:
+            return
+        self._last[stage] = now
+        elapsed = now - started
+        data = {
+            "stage": stage,
+            "done": done,
+            "total": total,
+            "unit": unit,
+            "rate": round(done / elapsed, 3) if elapsed > 0 else None,
+        }
+        try:
+            self._worker.publish(RunEvent(self._run_id, PROGRESS, data))
+        except Exception as exc:
+            logger.warning("Progress event for run %s failed: %s", self._run_id, exc)
+
+
+def output_results(run_id: str, output: Any) -> List[Result]:
+    """
+    Result rows for a plugin output. Plugins may return
+    {"results": [{"result_type", "uri", "metrics"?, "footprint_wkt"?}, ...]};
+    any other output is stored as one "output" result with the JSON payload.
+    Raises ValueError for a footprint_wkt that is not valid WKT.
+    """
+    output = _jsonable(output)
+    items = output.get("results") if isinstance(output, dict) else None
+    if isinstance(items, list) and all(
+        isinstance(i, dict) and "uri" in i for i in items
+    ):
+        return [
+            Result(
+                run_id=run_id,
+                result_type=str(item.get("result_type", "output")),
+                uri=str(item["uri"]),
+                metrics_json=item.get("metrics"),
+                footprint_wkt=_footprint_wkt(item.get("footprint_wkt")),
+            )
+            for item in items
+        ]
+    metrics = output if isinstance(output, dict) else {"output": output}
+    return [
+        Result(
+            run_id=run_id,
+            result_type="output",
+            uri=f"run://{run_id}/output",
+            metrics_json=metrics,
+        )
+    ]
+
+
+def _footprint_wkt(value: Any) -> Optional[str]:
+    "Checked footprint WKT; invalid WKT would otherwise only fail on insert"
+    if value is None:
+        return None
+    try:
+        shapely_wkt.loads(str(value))
+    except Exception as e:
+        raise ValueError(f"footprint_wkt is not valid WKT: {e}") from e
+    return str(value)
+
+
+def _jsonable(value: Any) -> Any:
+    return jsonable_encoder(
+        value,
+        custom_encoder={
+            np.ndarray: lambda a: a.tolist(),
+            np.generic: lambda a: a.item(),
+        },
+    )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--once", action="store_true", help="execute at most one run")
+    parser.add_argument("--worker-id", default=None)
+    args = parser.parse_args()
+
+    from core.services import get_container
+
+    container = get_container()
+    executor = PluginExecutor(
+        registry=container.plugin_registry, logger=container.logger
+    )
+    worker = RunWorker(executor, worker_id=args.worker_id, log=container.logger)
+    if args.once:
+        worker.run_once()
+        return 0
+
+    stop = threading.Event()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        signal.signal(sig, lambda *_: stop.set())
+    container.logger.info("Worker %s started", worker.worker_id)
+    worker.serve(stop)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
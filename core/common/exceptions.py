@@ -19,3 +19,7 @@ class ExecutionError(GeoAIError):
 
 class InferenceTimeoutError(ExecutionError):
     "Raised when model prediction exceeds the allowed timeout"
+
+
+class TileError(GeoAIError):
+    "Raised for invalid tile addresses or rasters that cannot be tiled"
@@ -1,6 +1,7 @@
 from __future__ import annotations
 from dataclasses import dataclass
 from pathlib import Path
+from typing import Optional
 from core.config.settings import settings
 
 
@@ -9,6 +10,12 @@ class AppConfig:
     env: str
     data_root: Path
     log_level: str
+    cache_max_bytes: int = 256 * 1024 * 1024
+    cache_ttl_seconds: Optional[float] = None
+    input_cache_max_bytes: int = 0
+    tile_cache_max_bytes: int = 512 * 1024 * 1024
+    data_backend: str = "local"
+    data_fsync: str = "none"
 
 
 def load_config() -> AppConfig:
@@ -20,7 +27,15 @@ def load_config() -> AppConfig:
     data_root.mkdir(parents=True, exist_ok=True)
 
     return AppConfig(
-        env=settings.APP_ENV, data_root=data_root, log_level=settings.LOG_LEVEL
+        env=settings.APP_ENV,
+        data_root=data_root,
+        log_level=settings.LOG_LEVEL,
+        cache_max_bytes=settings.CACHE_MAX_BYTES,
+        cache_ttl_seconds=settings.CACHE_TTL_SECONDS or None,
+        input_cache_max_bytes=settings.INPUT_CACHE_MAX_BYTES,
+        tile_cache_max_bytes=settings.TILE_CACHE_MAX_BYTES,
+        data_backend=settings.DATA_BACKEND,
+        data_fsync=settings.DATA_FSYNC,
     )
 
 
@@ -32,6 +32,67 @@ class BaseConfig:
         self.POSTGRES_DB = os.getenv("POSTGRES_DB", "geoai")
         self.DATA_ROOT_RAW = os.getenv("DATA_ROOT", str(Path.cwd() / "data"))
 
+        # Connection pool (per engine and process)
+        self.DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+        self.DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+        # Seconds before a pooled connection is replaced (-1 = never)
+        self.DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+        # Server-side statement timeout in milliseconds (0 = none)
+        self.DB_STATEMENT_TIMEOUT_MS = int(
+            os.getenv("DB_STATEMENT_TIMEOUT_MS", "30000")
+        )
+        # asyncpg prepared statement cache (set 0 behind pgbouncer)
+        self.DB_STATEMENT_CACHE_SIZE = int(os.getenv("DB_STATEMENT_CACHE_SIZE", "100"))
+        # Statement timeout of streaming exports, whose cursor stays open for
+        # the whole download (milliseconds, 0 = none)
+        self.EXPORT_STATEMENT_TIMEOUT_MS = int(
+            os.getenv("EXPORT_STATEMENT_TIMEOUT_MS", "3600000")
+        )
+
+        # Run job queue workers (python -m backend.jobs.worker)
+        self.WORKER_HEARTBEAT_SECONDS = float(
+            os.getenv("WORKER_HEARTBEAT_SECONDS", "10")
+        )
+        self.WORKER_POLL_SECONDS = float(os.getenv("WORKER_POLL_SECONDS", "1"))
+        # A running run without heartbeat for this long is requeued
+        self.RUN_STALE_SECONDS = float(os.getenv("RUN_STALE_SECONDS", "60"))
+        self.RUN_MAX_ATTEMPTS = int(os.getenv("RUN_MAX_ATTEMPTS", "3"))
+        # Per-run plugin timeout in seconds (0 = none)
+        self.RUN_TIMEOUT_SECONDS = float(os.getenv("RUN_TIMEOUT_SECONDS", "0"))
+
+        # Storage backend for the data manager: "local" (DATA_ROOT) or "s3"
+        self.DATA_BACKEND = os.getenv("DATA_BACKEND", "local").lower()
+        self.S3_ENDPOINT_URL = os.getenv("S3_ENDPOINT_URL")
+        self.S3_BUCKET = os.getenv("S3_BUCKET")
+        self.S3_REGION = os.getenv("S3_REGION", "us-east-1")
+        self.S3_ACCESS_KEY_ID = os.getenv("S3_ACCESS_KEY_ID")
+        self.S3_SECRET_ACCESS_KEY = os.getenv("S3_SECRET_ACCESS_KEY")
+
+        # Durability of data manager writes: "none", "file" or "full"
+        self.DATA_FSYNC = os.getenv("DATA_FSYNC", "none").lower()
+
+        # In-process cache budget (bytes) and default entry TTL (seconds, 0 = none)
+        self.CACHE_MAX_BYTES = int(os.getenv("CACHE_MAX_BYTES", str(256 * 1024**2)))
+        self.CACHE_TTL_SECONDS = float(os.getenv("CACHE_TTL_SECONDS", "0"))
+        # Run/result read-through cache: "memory" (per process), "shared"
+        # (files under DATA_ROOT/.cache/entities, shared by local workers) or "none"
+        self.ENTITY_CACHE_BACKEND = os.getenv("ENTITY_CACHE_BACKEND", "memory").lower()
+        self.ENTITY_CACHE_MAX_BYTES = int(
+            os.getenv("ENTITY_CACHE_MAX_BYTES", str(64 * 1024**2))
+        )
+        # Upper bound on staleness for writes made by other processes
+        self.ENTITY_CACHE_TTL_SECONDS = float(
+            os.getenv("ENTITY_CACHE_TTL_SECONDS", "300")
+        )
+        # Disk budget for decoded inputs under DATA_ROOT/.cache (0 disables it)
+        self.INPUT_CACHE_MAX_BYTES = int(
+            os.getenv("INPUT_CACHE_MAX_BYTES", str(2 * 1024**3))
+        )
+        # Disk budget for rendered map tiles under DATA_ROOT/.cache/tiles
+        self.TILE_CACHE_MAX_BYTES = int(
+            os.getenv("TILE_CACHE_MAX_BYTES", str(512 * 1024**2))
+        )
+
     @property
     def DATABASE_URL(self) -> str:
         override = os.getenv("DATABASE_URL")
@@ -88,7 +149,27 @@ settings = get_settings()
 @dataclass(frozen=True)
 class DatabaseSettings:
     url: str
+    pool_size: int = 10
+    max_overflow: int = 20
+    statement_cache_size: int = 100
+    pool_recycle: int = 1800
+    statement_timeout_ms: int = 30000
+
+    @property
+    def async_url(self) -> str:
+        "Same database through the asyncpg driver"
+        scheme, sep, rest = self.url.partition("://")
+        if not sep or not scheme.startswith("postgresql"):
+            return self.url
+        return f"postgresql+asyncpg://{rest}"
 
 
 def load_database_settings() -> DatabaseSettings:
-    return DatabaseSettings(url=settings.DATABASE_URL)
+    return DatabaseSettings(
+        url=settings.DATABASE_URL,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        statement_cache_size=settings.DB_STATEMENT_CACHE_SIZE,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        statement_timeout_ms=settings.DB_STATEMENT_TIMEOUT_MS,
+    )
@@ -2,7 +2,11 @@ from __future__ import annotations
 
 from abc import ABC, abstractmethod
 from pathlib import Path
-from typing import Any
+from typing import Any, Optional, Sequence
+
+import numpy as np
+from core.data_manager.raster_store import ChunkedRasterStore
+from core.data_manager.windows import Window, read_subset
 
 
 class BaseDataManager(ABC):
@@ -34,3 +38,53 @@ class BaseDataManager(ABC):
     @abstractmethod
     def write_text(self, relpath: str, text: str) -> str:
         "Write text content under a relative path and return a URI/reference"
+
+    def key_for_uri(self, uri: str) -> Optional[str]:
+        "Map a storage URI owned by this manager (e.g. s3://...) to a relative path"
+        return None
+
+    def local_path(self, relative_path: str) -> Optional[Path]:
+        "Filesystem path of a stored object, or None when storage is remote"
+        return self.resolve(relative_path)
+
+    def read_array(
+        self,
+        relative_path: str,
+        bands: Optional[Sequence[int]] = None,
+        window: Optional[Window] = None,
+        resolution: Optional[float] = None,
+    ) -> np.ndarray:
+        """
+        Read a (C, H, W) .npy array or chunked raster store, optionally only
+        some bands and a window. Without a subset a .npy array is returned
+        memory-mapped (read-only).
+        For stores with overviews, resolution (in CRS units per pixel) selects
+        the coarsest level that meets it; window stays in full-resolution pixels.
+        """
+        return read_local_array(
+            self.resolve(relative_path),
+            bands=bands,
+            window=window,
+            resolution=resolution,
+        )
+
+
+def read_local_array(
+    path: Path,
+    bands: Optional[Sequence[int]] = None,
+    window: Optional[Window] = None,
+    resolution: Optional[float] = None,
+) -> np.ndarray:
+    "BaseDataManager.read_array for a filesystem path"
+    if ChunkedRasterStore.is_store(path):
+        store = ChunkedRasterStore.open(path)
+        factor = 1
+        if resolution is not None:
+            factor, store = store.level_for_resolution(resolution)
+        if window is not None and factor > 1:
+            window = window.scaled(factor)
+        return store.read_window(window, bands=bands)
+    array = np.load(path, mmap_mode="r")
+    if bands is None and window is None:
+        return array
+    return read_subset(array, bands=bands, window=window)
@@ -1,6 +1,13 @@
 from __future__ import annotations
 
-from typing import Any, Dict
+import sys
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Hashable, Optional
+
+import numpy as np
 
 
 class SimpleCache:
@@ -17,3 +24,221 @@ class SimpleCache:
 
     def clear(self) -> None:
         self._store.clear()
+
+
+def estimate_size(value: Any) -> int:
+    "Best-effort size of a cached value in bytes (numpy arrays use nbytes)"
+    if isinstance(value, np.ndarray):
+        return int(value.nbytes)
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return len(value)
+    if isinstance(value, str):
+        return len(value.encode("utf-8", errors="ignore"))
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(estimate_size(v) for v in value)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(
+            estimate_size(k) + estimate_size(v) for k, v in value.items()
+        )
+    arrays = getattr(value, "__dict__", None)
+    if isinstance(arrays, dict):
+        # Dataclass-like containers (e.g. ModelInput): count their array payloads
+        return sys.getsizeof(value) + sum(
+            int(v.nbytes) for v in arrays.values() if isinstance(v, np.ndarray)
+        )
+    return sys.getsizeof(value)
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    "Point-in-time counters of an LRUCache"
+
+    hits: int
+    misses: int
+    evictions: int
+    expirations: int
+    entries: int
+    size_bytes: int
+    max_bytes: int
+
+    @property
+    def hit_ratio(self) -> float:
+        total = self.hits + self.misses
+        return float(self.hits) / float(total) if total else 0.0
+
+
+@dataclass
+class _Entry:
+    value: Any
+    size: int
+    expires_at: Optional[float]
+
+
+class _InFlight:
+    "A pending get_or_compute load that concurrent callers wait on"
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.value: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class LRUCache:
+    """
+    Thread-safe, byte-bounded LRU cache with optional per-entry TTL.
+    - get/set/clear keep the SimpleCache surface
+    - least recently used entries are evicted once max_bytes/max_entries is hit
+    - get_or_compute runs the loader once per key even under concurrency
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = 256 * 1024 * 1024,
+        max_entries: Optional[int] = None,
+        default_ttl: Optional[float] = None,
+        sizeof: Callable[[Any], int] = estimate_size,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if max_bytes <= 0:
+            raise ValueError("max_bytes must be positive")
+        self._max_bytes = max_bytes
+        self._max_entries = max_entries
+        self._default_ttl = default_ttl
+        self._sizeof = sizeof
+        self._clock = clock
+
+        self._lock = threading.RLock()
+        self._store: "OrderedDict[Hashable, _Entry]" = OrderedDict()
+        self._inflight: Dict[Hashable, _InFlight] = {}
+        self._size = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+
+    @property
+    def max_bytes(self) -> int:
+        return self._max_bytes
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._store)
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            return self._lookup(key) is not None
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._lookup(key)
+            if entry is None:
+                self._misses += 1
+                return default
+            self._hits += 1
+            return entry.value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        size = self._sizeof(value)
+        ttl = self._default_ttl if ttl is None else ttl
+        expires_at = self._clock() + ttl if ttl is not None else None
+        with self._lock:
+            self._remove(key)
+            if size > self._max_bytes:
+                # Never admit a value that would flush the whole cache
+                return
+            self._store[key] = _Entry(value=value, size=size, expires_at=expires_at)
+            self._size += size
+            self._evict()
+
+    def delete(self, key: Hashable) -> bool:
+        with self._lock:
+            return self._remove(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._store.clear()
+            self._size = 0
+
+    def get_or_compute(
+        self,
+        key: Hashable,
+        loader: Callable[[], Any],
+        ttl: Optional[float] = None,
+        admit: Optional[Callable[[Any], bool]] = None,
+    ) -> Any:
+        """
+        Return the cached value or load it; concurrent misses share one load.
+        admit can veto caching a loaded value (it is still returned).
+        """
+        with self._lock:
+            entry = self._lookup(key)
+            if entry is not None:
+                self._hits += 1
+                return entry.value
+            self._misses += 1
+            flight = self._inflight.get(key)
+            owner = flight is None
+            if owner:
+                flight = self._inflight[key] = _InFlight()
+        assert flight is not None
+
+        if not owner:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+
+        try:
+            value = loader()
+        except BaseException as exc:
+            flight.error = exc
+            raise
+        else:
+            flight.value = value
+            if admit is None or admit(value):
+                self.set(key, value, ttl=ttl)
+            return value
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+            flight.done.set()
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                expirations=self._expirations,
+                entries=len(self._store),
+                size_bytes=self._size,
+                max_bytes=self._max_bytes,
+            )
+
+    # Internal helpers (caller holds the lock)
+    def _lookup(self, key: Hashable) -> Optional[_Entry]:
+        entry = self._store.get(key)
+        if entry is None:
+            return None
+        if entry.expires_at is not None and entry.expires_at <= self._clock():
+            self._remove(key)
+            self._expirations += 1
+            return None
+        self._store.move_to_end(key)
+        return entry
+
+    def _remove(self, key: Hashable) -> bool:
+        entry = self._store.pop(key, None)
+        if entry is None:
+            return False
+        self._size -= entry.size
+        return True
+
+    def _evict(self) -> None:
+        while self._store and (
+            self._size > self._max_bytes
+            or (self._max_entries is not None and len(self._store) > self._max_entries)
+        ):
+            _, entry = self._store.popitem(last=False)
+            self._size -= entry.size
+            self._evictions += 1
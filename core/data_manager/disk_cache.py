@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import os
+import re
+import shutil
+import threading
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple
+from uuid import uuid4
+
+_KEY_RE = re.compile(r"^[A-Za-z0-9_.-]+$")
+_TMP_PREFIX = ".tmp-"
+
+
+class DiskCache:
+    """
+    Size-capped, directory-backed LRU cache.
+    - each entry is a directory of files committed atomically (temp dir + rename)
+    - recency is the entry directory mtime, refreshed on every lookup
+    - once max_bytes is exceeded the least recently used entries are removed
+    """
+
+    def __init__(self, root: Path, max_bytes: int) -> None:
+        if max_bytes <= 0:
+            raise ValueError("max_bytes must be positive")
+        self.root = root
+        self.max_bytes = max_bytes
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._sizes: Dict[str, int] = {}
+        self._size = 0
+        self._rescan()
+
+    def lookup(self, key: str) -> Optional[Path]:
+        "Return the entry directory for key (and mark it recently used)"
+        path = self._entry_dir(key)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return path
+
+    def store(self, key: str, writer: Callable[[Path], None]) -> Path:
+        "Create an entry by letting writer fill a temp dir, then commit it"
+        final = self._entry_dir(key)
+        tmp = self.root / f"{_TMP_PREFIX}{uuid4().hex}"
+        tmp.mkdir()
+        try:
+            writer(tmp)
+            size = _dir_size(tmp)
+            try:
+                os.replace(tmp, final)
+            except OSError:
+                # A concurrent writer committed the same key first; keep theirs
+                if not final.exists():
+                    raise
+                shutil.rmtree(tmp, ignore_errors=True)
+                return final
+        except BaseException:
+            shutil.rmtree(tmp, ignore_errors=True)
+            raise
+
+        with self._lock:
+            self._size += size - self._sizes.get(key, 0)
+            self._sizes[key] = size
+            if self._size > self.max_bytes:
+                self._enforce_limit(keep=key)
+        return final
+
+    def discard(self, key: str) -> None:
+        path = self._entry_dir(key)
+        shutil.rmtree(path, ignore_errors=True)
+        with self._lock:
+            self._size -= self._sizes.pop(key, 0)
+
+    def discard_prefix(self, prefix: str, keep: Optional[str] = None) -> int:
+        "Remove every entry whose key starts with prefix; returns removed count"
+        removed = 0
+        for entry in list(self.root.iterdir()):
+            name = entry.name
+            if name.startswith(prefix) and name != keep and entry.is_dir():
+                self.discard(name)
+                removed += 1
+        return removed
+
+    def clear(self) -> None:
+        with self._lock:
+            for entry in self.root.iterdir():
+                shutil.rmtree(entry, ignore_errors=True)
+            self._sizes.clear()
+            self._size = 0
+
+    @property
+    def size_bytes(self) -> int:
+        with self._lock:
+            return self._size
+
+    def _entry_dir(self, key: str) -> Path:
+        if not _KEY_RE.match(key) or key.startswith(_TMP_PREFIX):
+            raise ValueError(f"Invalid cache key: {key!r}")
+        return self.root / key
+
+    def _rescan(self) -> None:
+        "Rebuild the size index from disk (also picks up other processes' entries)"
+        sizes: Dict[str, int] = {}
+        for entry in self.root.iterdir():
+            if entry.is_dir() and not entry.name.startswith(_TMP_PREFIX):
+                sizes[entry.name] = _dir_size(entry)
+        self._sizes = sizes
+        self._size = sum(sizes.values())
+
+    def _enforce_limit(self, keep: str) -> None:
+        self._rescan()
+        if self._size <= self.max_bytes:
+            return
+        by_age: list[Tuple[float, str]] = []
+        for key in self._sizes:
+            try:
+                by_age.append(((self.root / key).stat().st_mtime, key))
+            except FileNotFoundError:
+                continue
+        for _, key in sorted(by_age):
+            if self._size <= self.max_bytes:
+                break
+            if key == keep:
+                continue
+            shutil.rmtree(self.root / key, ignore_errors=True)
+            self._size -= self._sizes.pop(key, 0)
+
+
+def _dir_size(path: Path) -> int:
+    total = 0
+    for dirpath, _, filenames in os.walk(path):
+        for name in filenames:
+            try:
+                total += os.path.getsize(os.path.join(dirpath, name))
+            except OSError:
+                continue
+    return total
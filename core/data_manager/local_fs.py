@@ -2,17 +2,37 @@ from __future__ import annotations
 
 import json
 from pathlib import Path
-from typing import Any
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple, Union
 
+import numpy as np
 from core.data_manager.base import BaseDataManager
+from core.data_manager.raster_store import (
+    ROLE_CONTINUOUS,
+    ChunkedRasterStore,
+    prediction_role,
+)
+from core.models.contracts import ModelInput, ModelOutput, SpatialMetadata
+from core.utils.fs import (
+    FSYNC_POLICIES,
+    atomic_write_bytes,
+    atomic_write_many,
+    encode_json,
+)
 
 
 class LocalFileSystemDataManager(BaseDataManager):
-    "Local filesystem-based data manager (MVP)"
+    """
+    Local filesystem-based data manager (MVP)
+    Writes are atomic (temp file + os.replace); fsync selects durability:
+    "none", "file" or "full" (file + directory), see core.utils.fs.
+    """
 
-    def __init__(self, data_root: Path) -> None:
+    def __init__(self, data_root: Path, fsync: str = "none") -> None:
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"Unknown fsync policy: {fsync}")
         self.data_root = data_root
         self.data_root.mkdir(parents=True, exist_ok=True)
+        self.fsync = fsync
 
     def resolve(self, relative_path: str) -> Path:
         return (self.data_root / relative_path).resolve()
@@ -23,27 +43,121 @@ class LocalFileSystemDataManager(BaseDataManager):
     def load(self, relative_path: str) -> Any:
         path = self.resolve(relative_path)
         if path.suffix.lower() == ".json":
-            with path.open("r", encoding="utf-8") as f:
-                return json.load(f)
+            with path.open("rb") as f:
+                return json.loads(f.read())
         # fallback: raw bytes
         return path.read_bytes()
 
     def save(self, relative_path: str, data: Any) -> None:
-        path = self.resolve(relative_path)
-        path.parent.mkdir(parents=True, exist_ok=True)
-
-        if isinstance(data, (dict, list)):
-            with path.open("w", encoding="utf-8") as f:
-                json.dump(data, f, indent=2)
-        elif isinstance(data, (bytes, bytearray)):
-            path.write_bytes(data)
-        else:
-            # simple text fallback
-            path.write_text(str(data), encoding="utf-8")
+        atomic_write_bytes(self.resolve(relative_path), _encode(data), self.fsync)
 
     def write_text(self, relpath: str, text: str) -> str:
         """Write UTF-8 text under relpath and return a URI-like reference."""
         path = self.resolve(relpath)
-        path.parent.mkdir(parents=True, exist_ok=True)
-        path.write_text(text, encoding="utf-8")
+        atomic_write_bytes(path, text.encode("utf-8"), self.fsync)
         return f"file://{path.as_posix()}"
+
+    def write_many(self, items: Mapping[str, Any]) -> List[str]:
+        """
+        Save many small objects as one batch: all files are staged first,
+        then renamed into place, with one fsync per touched directory.
+        Returns the URI of each item in input order.
+        """
+        paths = [(self.resolve(rel), _encode(data)) for rel, data in items.items()]
+        atomic_write_many(paths, fsync=self.fsync)
+        return [f"file://{path.as_posix()}" for path, _ in paths]
+
+    def create_raster(
+        self,
+        relpath: str,
+        shape: Sequence[int],
+        dtype: Any,
+        chunk_shape: Tuple[int, int] = (256, 256),
+        compression: Optional[str] = None,
+        bands: Optional[list] = None,
+        spatial: Optional[SpatialMetadata] = None,
+        role: Optional[str] = None,
+    ) -> ChunkedRasterStore:
+        "Create an empty chunked raster store (e.g. as a tiled inference target)"
+        return ChunkedRasterStore.create(
+            self.resolve(relpath),
+            shape=shape,
+            dtype=dtype,
+            chunk_shape=chunk_shape,
+            compression=compression,
+            bands=bands,
+            spatial=_spatial_dict(spatial),
+            overwrite=True,
+            role=role,
+        )
+
+    def open_raster(self, relpath: str) -> ChunkedRasterStore:
+        return ChunkedRasterStore.open(self.resolve(relpath))
+
+    def save_raster(
+        self,
+        relpath: str,
+        obj: Union[np.ndarray, ModelInput, ModelOutput],
+        chunk_shape: Tuple[int, int] = (256, 256),
+        compression: Optional[str] = None,
+        role: Optional[str] = None,
+    ) -> str:
+        """
+        Write an array, ModelInput or ModelOutput as a chunked raster store.
+        A ModelOutput confidence array is stored alongside as aux/confidence.
+        role is recorded for plain arrays; inputs are continuous and outputs
+        categorical for label predictions (see prediction_role).
+        """
+        bands = None
+        spatial = None
+        confidence = None
+        if isinstance(obj, ModelInput):
+            data, bands, spatial = obj.data, obj.bands, obj.spatial
+            role = ROLE_CONTINUOUS
+        elif isinstance(obj, ModelOutput):
+            data, spatial, confidence = obj.prediction, obj.spatial, obj.confidence
+            role = prediction_role(data)
+        else:
+            data = obj
+        if data.ndim == 2:
+            data = data[np.newaxis]
+
+        store = self.create_raster(
+            relpath,
+            data.shape,
+            data.dtype,
+            chunk_shape=chunk_shape,
+            compression=compression,
+            bands=bands,
+            spatial=spatial,
+            role=role,
+        )
+        store.write_window(data)
+        if confidence is not None:
+            self.save_raster(
+                f"{relpath}/aux/confidence",
+                confidence,
+                chunk_shape=chunk_shape,
+                compression=compression,
+                role=ROLE_CONTINUOUS,
+            )
+        return f"file://{store.root.as_posix()}"
+
+
+def _encode(data: Any) -> bytes:
+    "dict/list -> compact JSON, bytes as-is, anything else as UTF-8 text"
+    if isinstance(data, (dict, list)):
+        return encode_json(data)
+    if isinstance(data, (bytes, bytearray)):
+        return bytes(data)
+    return str(data).encode("utf-8")
+
+
+def _spatial_dict(spatial: Optional[SpatialMetadata]) -> Optional[Dict[str, Any]]:
+    if spatial is None:
+        return None
+    return {
+        "crs": spatial.crs,
+        "bbox": list(spatial.bbox),
+        "resolution": spatial.resolution,
+    }
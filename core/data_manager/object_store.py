@@ -0,0 +1,411 @@
+from __future__ import annotations
+
+import hashlib
+import hmac
+import io
+import json
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+from urllib.parse import quote, urlparse
+
+import numpy as np
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from core.common.exceptions import DataAccessError
+from core.data_manager.base import BaseDataManager
+from core.data_manager.disk_cache import DiskCache
+from core.data_manager.windows import Window
+from core.utils.fs import encode_json
+
+_UNSIGNED_PAYLOAD = "UNSIGNED-PAYLOAD"
+_BODY_FILE = "body"
+_ETAG_FILE = "etag"
+
+
+class ObjectStoreDataManager(BaseDataManager):
+    """
+    S3-compatible object store data manager.
+    - one pooled HTTP session (keep-alive) shared by all calls
+    - large saves go through concurrent multipart upload
+    - read_range/read_array_planes use HTTP Range for partial reads
+    - load() is read-through cached on local disk and revalidated by ETag
+    Requests are SigV4-signed when credentials are configured.
+    """
+
+    def __init__(
+        self,
+        endpoint_url: str,
+        bucket: str,
+        cache_dir: Path,
+        access_key: Optional[str] = None,
+        secret_key: Optional[str] = None,
+        region: str = "us-east-1",
+        pool_size: int = 16,
+        multipart_threshold: int = 16 * 1024 * 1024,
+        part_size: int = 8 * 1024 * 1024,
+        max_concurrency: int = 4,
+        cache_max_bytes: int = 1024**3,
+        revalidate: bool = True,
+        timeout: float = 30.0,
+    ) -> None:
+        self.endpoint_url = endpoint_url.rstrip("/")
+        self.bucket = bucket
+        self.region = region
+        self.multipart_threshold = multipart_threshold
+        self.part_size = part_size
+        self.max_concurrency = max(1, max_concurrency)
+        self.revalidate = revalidate
+        self.timeout = timeout
+        self._access_key = access_key
+        self._secret_key = secret_key
+        self._host = urlparse(self.endpoint_url).netloc
+        self._cache = DiskCache(cache_dir, max_bytes=cache_max_bytes)
+
+        self._http = requests.Session()
+        retry = Retry(
+            total=3,
+            backoff_factor=0.2,
+            status_forcelist=(500, 502, 503, 504),
+            allowed_methods=frozenset({"GET", "HEAD", "PUT", "DELETE"}),
+        )
+        adapter = HTTPAdapter(
+            pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry
+        )
+        self._http.mount("http://", adapter)
+        self._http.mount("https://", adapter)
+
+    @classmethod
+    def from_settings(cls, cache_dir: Path) -> "ObjectStoreDataManager":
+        "Build from the S3_* settings of the active configuration profile"
+        from core.config.settings import settings
+
+        if not settings.S3_ENDPOINT_URL or not settings.S3_BUCKET:
+            raise ValueError("S3_ENDPOINT_URL and S3_BUCKET must be set")
+        return cls(
+            endpoint_url=settings.S3_ENDPOINT_URL,
+            bucket=settings.S3_BUCKET,
+            cache_dir=cache_dir,
+            access_key=settings.S3_ACCESS_KEY_ID,
+            secret_key=settings.S3_SECRET_ACCESS_KEY,
+            region=settings.S3_REGION,
+        )
+
+    def close(self) -> None:
+        self._http.close()
+
+    # BaseDataManager interface
+    def resolve(self, relative_path: str) -> Path:
+        "Local read-through cache file holding the object (downloaded on demand)"
+        key = self._key(relative_path)
+        return self._fetch_cached(key) / _BODY_FILE
+
+    def local_path(self, relative_path: str) -> Optional[Path]:
+        "Objects have no filesystem path; use exists/read_array/load instead"
+        return None
+
+    def exists(self, relative_path: str) -> bool:
+        resp = self._request("HEAD", self._key(relative_path), expect=(200, 404))
+        return resp.status_code == 200
+
+    def load(self, relative_path: str) -> Any:
+        key = self._key(relative_path)
+        body = (self._fetch_cached(key) / _BODY_FILE).read_bytes()
+        if key.lower().endswith(".json"):
+            try:
+                return json.loads(body)
+            except ValueError as e:
+                raise DataAccessError(f"Invalid JSON object: {key}") from e
+        return body
+
+    def save(self, relative_path: str, data: Any) -> None:
+        key = self._key(relative_path)
+        if isinstance(data, (dict, list)):
+            body = encode_json(data)
+        elif isinstance(data, (bytes, bytearray)):
+            body = bytes(data)
+        else:
+            body = str(data).encode("utf-8")
+
+        if len(body) > self.multipart_threshold:
+            self._multipart_upload(key, body)
+        else:
+            self._request("PUT", key, data=body)
+        self._cache.discard(self._cache_key(key))
+
+    def write_text(self, relpath: str, text: str) -> str:
+        self.save(relpath, text.encode("utf-8"))
+        return f"s3://{self.bucket}/{self._key(relpath)}"
+
+    def key_for_uri(self, uri: str) -> Optional[str]:
+        parsed = urlparse(uri)
+        if parsed.scheme != "s3" or parsed.netloc != self.bucket:
+            return None
+        return parsed.path.lstrip("/")
+
+    # Partial reads
+    def read_range(self, relative_path: str, start: int, length: int) -> bytes:
+        "Read length bytes at offset start with a single HTTP Range request"
+        if length <= 0:
+            return b""
+        headers = {"Range": f"bytes={start}-{start + length - 1}"}
+        resp = self._request(
+            "GET", self._key(relative_path), headers=headers, expect=(200, 206)
+        )
+        if resp.status_code == 200:
+            # Server ignored the range; slice locally
+            return resp.content[start : start + length]
+        return resp.content
+
+    def read_npy_header(self, relative_path: str) -> Tuple[Tuple[int, ...], Any, int]:
+        "Return (shape, dtype, data_offset) of a C-ordered .npy object"
+        head = self.read_range(relative_path, 0, 256)
+        if len(head) < 10:
+            raise DataAccessError(f"Not an .npy object: {relative_path}")
+        header_len = int.from_bytes(head[8:10], "little")
+        data_offset = 10 + header_len
+        if head[6] != 1:
+            header_len = int.from_bytes(head[8:12], "little")
+            data_offset = 12 + header_len
+        if len(head) < data_offset:
+            head = self.read_range(relative_path, 0, data_offset)
+
+        fp = io.BytesIO(head)
+        try:
+            version = np.lib.format.read_magic(fp)
+            if version == (1, 0):
+                shape, fortran, dtype = np.lib.format.read_array_header_1_0(fp)
+            else:
+                shape, fortran, dtype = np.lib.format.read_array_header_2_0(fp)
+        except ValueError as e:
+            raise DataAccessError(f"Invalid .npy header: {relative_path}") from e
+        if fortran:
+            raise DataAccessError(
+                f"Fortran-ordered arrays unsupported: {relative_path}"
+            )
+        return tuple(shape), dtype, data_offset
+
+    def read_array_planes(
+        self, relative_path: str, start: int, stop: int
+    ) -> np.ndarray:
+        "Read arr[start:stop] (leading axis) of a remote .npy without fetching it all"
+        shape, dtype, offset = self.read_npy_header(relative_path)
+        start, stop, _ = slice(start, stop).indices(shape[0])
+        stop = max(start, stop)
+        plane = int(np.prod(shape[1:], dtype=np.int64)) * dtype.itemsize
+        raw = self.read_range(
+            relative_path, offset + start * plane, (stop - start) * plane
+        )
+        return np.frombuffer(raw, dtype=dtype).reshape((stop - start,) + shape[1:])
+
+    def read_array(
+        self,
+        relative_path: str,
+        bands: Optional[Sequence[int]] = None,
+        window: Optional[Window] = None,
+        resolution: Optional[float] = None,
+    ) -> np.ndarray:
+        """
+        Ranged read of selected band planes/rows of a remote (C, H, W) .npy.
+        Remote .npy arrays carry no overviews, so resolution is ignored.
+        """
+        shape, dtype, offset = self.read_npy_header(relative_path)
+        if len(shape) != 3:
+            raise DataAccessError(f"Expected a (C,H,W) array at {relative_path}")
+        channels, height, width = shape
+        band_idx = list(range(channels)) if bands is None else list(bands)
+        win = (window or Window(0, 0, height, width)).clip(height, width)
+        row_bytes = width * dtype.itemsize
+        plane = height * row_bytes
+
+        out = np.empty((len(band_idx), win.height, win.width), dtype=dtype)
+        for i, b in enumerate(band_idx):
+            if not 0 <= b < channels:
+                raise DataAccessError(f"Band index {b} out of range at {relative_path}")
+            # One range per band covering only the window rows
+            raw = self.read_range(
+                relative_path,
+                offset + b * plane + win.row_off * row_bytes,
+                win.height * row_bytes,
+            )
+            rows = np.frombuffer(raw, dtype=dtype).reshape(win.height, width)
+            out[i] = rows[:, win.col_off : win.col_off + win.width]
+        return out
+
+    # Internals
+    def _key(self, relative_path: str) -> str:
+        key = relative_path.replace("\\", "/").lstrip("/")
+        if not key or any(part == ".." for part in key.split("/")):
+            raise DataAccessError(f"Invalid object key: {relative_path}")
+        return key
+
+    @staticmethod
+    def _cache_key(key: str) -> str:
+        return hashlib.sha1(key.encode("utf-8")).hexdigest()
+
+    def _fetch_cached(self, key: str) -> Path:
+        ckey = self._cache_key(key)
+        entry = self._cache.lookup(ckey)
+        headers: Dict[str, str] = {}
+        if entry is not None:
+            if not self.revalidate:
+                return entry
+            etag = (entry / _ETAG_FILE).read_text(encoding="utf-8")
+            if etag:
+                headers["If-None-Match"] = etag
+
+        resp = self._request("GET", key, headers=headers, expect=(200, 304, 404))
+        if resp.status_code == 404:
+            raise DataAccessError(f"Object not found: s3://{self.bucket}/{key}")
+        if resp.status_code == 304 and entry is not None:
+            return entry
+
+        body = resp.content
+        etag = resp.headers.get("ETag", "")
+
+        def write(tmp: Path) -> None:
+            (tmp / _BODY_FILE).write_bytes(body)
+            (tmp / _ETAG_FILE).write_text(etag, encoding="utf-8")
+
+        self._cache.discard(ckey)
+        return self._cache.store(ckey, write)
+
+    def _multipart_upload(self, key: str, body: bytes) -> None:
+        resp = self._request("POST", key, query={"uploads": ""})
+        upload_id = _xml_text(resp.content, "UploadId")
+        if not upload_id:
+            raise DataAccessError(f"Multipart upload was not initiated for {key}")
+
+        offsets = range(0, len(body), self.part_size)
+
+        def upload_part(number_offset: Tuple[int, int]) -> Tuple[int, str]:
+            number, offset = number_offset
+            part = body[offset : offset + self.part_size]
+            r = self._request(
+                "PUT",
+                key,
+                query={"partNumber": str(number), "uploadId": upload_id},
+                data=part,
+            )
+            return number, r.headers.get("ETag", "")
+
+        try:
+            with ThreadPoolExecutor(max_workers=self.max_concurrency) as pool:
+                parts = sorted(pool.map(upload_part, enumerate(offsets, start=1)))
+            complete = "".join(
+                f"<Part><PartNumber>{n}</PartNumber><ETag>{etag}</ETag></Part>"
+                for n, etag in parts
+            )
+            self._request(
+                "POST",
+                key,
+                query={"uploadId": upload_id},
+                data=(
+                    "<CompleteMultipartUpload>"
+                    f"{complete}</CompleteMultipartUpload>".encode("utf-8")
+                ),
+            )
+        except Exception:
+            self._request(
+                "DELETE", key, query={"uploadId": upload_id}, expect=(200, 204, 404)
+            )
+            raise
+
+    def _request(
+        self,
+        method: str,
+        key: str,
+        query: Optional[Mapping[str, str]] = None,
+        headers: Optional[Dict[str, str]] = None,
+        data: Optional[bytes] = None,
+        expect: Tuple[int, ...] = (200,),
+    ) -> requests.Response:
+        path = "/" + quote(f"{self.bucket}/{key}", safe="/-_.~")
+        canonical_query = _canonical_query(query or {})
+        url = f"{self.endpoint_url}{path}"
+        if canonical_query:
+            url = f"{url}?{canonical_query}"
+        req_headers = dict(headers or {})
+        if self._access_key and self._secret_key:
+            req_headers.update(self._sign(method, path, canonical_query))
+
+        try:
+            resp = self._http.request(
+                method, url, headers=req_headers, data=data, timeout=self.timeout
+            )
+        except requests.RequestException as e:
+            raise DataAccessError(f"Object store request failed: {e}") from e
+        if resp.status_code not in expect:
+            raise DataAccessError(
+                f"Object store {method} {key} failed: HTTP {resp.status_code}"
+            )
+        return resp
+
+    def _sign(self, method: str, path: str, canonical_query: str) -> Dict[str, str]:
+        "AWS Signature V4 headers (payload left unsigned, as S3 permits)"
+        assert self._access_key and self._secret_key
+        now = datetime.now(timezone.utc)
+        amz_date = now.strftime("%Y%m%dT%H%M%SZ")
+        day = now.strftime("%Y%m%d")
+        signed = {
+            "host": self._host,
+            "x-amz-content-sha256": _UNSIGNED_PAYLOAD,
+            "x-amz-date": amz_date,
+        }
+        signed_names = ";".join(sorted(signed))
+        canonical_headers = "".join(f"{k}:{signed[k]}\n" for k in sorted(signed))
+        canonical_request = "\n".join(
+            [
+                method,
+                path,
+                canonical_query,
+                canonical_headers,
+                signed_names,
+                _UNSIGNED_PAYLOAD,
+            ]
+        )
+        scope = f"{day}/{self.region}/s3/aws4_request"
+        string_to_sign = "\n".join(
+            [
+                "AWS4-HMAC-SHA256",
+                amz_date,
+                scope,
+                hashlib.sha256(canonical_request.encode("utf-8")).hexdigest(),
+            ]
+        )
+        key = f"AWS4{self._secret_key}".encode("utf-8")
+        for part in (day, self.region, "s3", "aws4_request"):
+            key = hmac.new(key, part.encode("utf-8"), hashlib.sha256).digest()
+        signature = hmac.new(
+            key, string_to_sign.encode("utf-8"), hashlib.sha256
+        ).hexdigest()
+        return {
+            "x-amz-content-sha256": _UNSIGNED_PAYLOAD,
+            "x-amz-date": amz_date,
+            "Authorization": (
+                f"AWS4-HMAC-SHA256 Credential={self._access_key}/{scope}, "
+                f"SignedHeaders={signed_names}, Signature={signature}"
+            ),
+        }
+
+
+def _canonical_query(query: Mapping[str, str]) -> str:
+    items: List[Tuple[str, str]] = sorted(
+        (quote(k, safe="-_.~"), quote(v, safe="-_.~")) for k, v in query.items()
+    )
+    return "&".join(f"{k}={v}" for k, v in items)
+
+
+def _xml_text(content: bytes, tag: str) -> Optional[str]:
+    try:
+        root = ET.fromstring(content)
+    except ET.ParseError:
+        return None
+    for el in root.iter():
+        if el.tag == tag or el.tag.endswith("}" + tag):
+            return el.text
+    return None
@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import math
+from pathlib import Path
+from typing import List, Optional, Sequence
+
+import numpy as np
+from core.data_manager.raster_store import (
+    ROLE_CATEGORICAL,
+    ChunkedRasterStore,
+    overview_root,
+)
+from core.data_manager.windows import Window
+
+RESAMPLING = ("mean", "mode")
+
+
+def default_resampling(store: ChunkedRasterStore) -> str:
+    """
+    Mode for categorical stores (class masks), mean for everything else;
+    decided by the role in the header, as integer rasters are often
+    measurements (e.g. uint16 reflectance).
+    """
+    return "mode" if store.header.role == ROLE_CATEGORICAL else "mean"
+
+
+def default_factors(store: ChunkedRasterStore) -> List[int]:
+    "2x, 4x, 8x... until a whole level fits into a single chunk"
+    _, height, width = store.shape
+    chunk = max(store.header.chunk_shape)
+    factors: List[int] = []
+    factor = 2
+    while max(height, width) / (factor // 2) > chunk:
+        factors.append(factor)
+        factor *= 2
+    return factors
+
+
+def build_overviews(
+    store: ChunkedRasterStore,
+    factors: Optional[Sequence[int]] = None,
+    resampling: Optional[str] = None,
+) -> List[int]:
+    """
+    Build decimated overview levels of a chunked raster store.
+    Each level is computed from the previous one, one output chunk at a time,
+    so memory stays at roughly one chunk per band regardless of scene size.
+    Levels live in <root>/overviews/<factor> and are listed in the header.
+    """
+    factors = sorted(set(factors)) if factors is not None else default_factors(store)
+    resampling = resampling or default_resampling(store)
+    if resampling not in RESAMPLING:
+        raise ValueError(f"Unsupported resampling: {resampling}")
+    prev, prev_factor = store, 1
+    for factor in factors:
+        if factor <= prev_factor or factor % prev_factor:
+            raise ValueError(
+                f"Overview factors must be increasing multiples: {factors}"
+            )
+        level = _create_level(store, factor)
+        _downsample_into(prev, level, factor // prev_factor, resampling)
+        prev, prev_factor = level, factor
+
+    store.set_overviews(factors)
+    return list(factors)
+
+
+def build_overviews_if_raster(path: Path) -> bool:
+    "Build default overviews when path is a chunked store (else do nothing)"
+    if not ChunkedRasterStore.is_store(path):
+        return False
+    build_overviews(ChunkedRasterStore.open(path))
+    return True
+
+
+def _create_level(store: ChunkedRasterStore, factor: int) -> ChunkedRasterStore:
+    channels, height, width = store.shape
+    spatial = store.header.spatial
+    if spatial is not None:
+        spatial = dict(spatial, resolution=float(spatial["resolution"]) * factor)
+    return ChunkedRasterStore.create(
+        overview_root(store.root, factor),
+        shape=(channels, math.ceil(height / factor), math.ceil(width / factor)),
+        dtype=store.dtype,
+        chunk_shape=store.header.chunk_shape,
+        compression=store.header.compression,
+        fill_value=store.header.fill_value,
+        bands=store.header.bands,
+        spatial=spatial,
+        overwrite=True,
+        role=store.header.role,
+    )
+
+
+def _downsample_into(
+    src: ChunkedRasterStore, dst: ChunkedRasterStore, step: int, resampling: str
+) -> None:
+    grid_rows, grid_cols = dst.header.grid
+    channels = dst.shape[0]
+    for ci in range(grid_rows):
+        for cj in range(grid_cols):
+            out = dst.chunk_window(ci, cj)
+            block = src.read_window(
+                Window(
+                    out.row_off * step,
+                    out.col_off * step,
+                    out.height * step,
+                    out.width * step,
+                )
+            )
+            reduced = downsample(block, step, resampling)
+            for b in range(channels):
+                dst.write_chunk(b, ci, cj, reduced[b])
+
+
+def downsample(block: np.ndarray, step: int, resampling: str) -> np.ndarray:
+    """
+    Reduce every step x step cell of a (C, H, W) block to one pixel.
+    Edge cells that are only partially covered use just their valid pixels.
+    """
+    channels, height, width = block.shape
+    out_h, out_w = math.ceil(height / step), math.ceil(width / step)
+    pad = ((0, 0), (0, out_h * step - height), (0, out_w * step - width))
+    valid = np.pad(np.ones((height, width), dtype=bool), pad[1:])
+    cells = np.pad(block, pad, mode="edge").reshape(channels, out_h, step, out_w, step)
+    cells = cells.transpose(0, 1, 3, 2, 4).reshape(channels, out_h, out_w, step * step)
+    mask = valid.reshape(out_h, step, out_w, step).transpose(0, 2, 1, 3)
+    mask = mask.reshape(out_h, out_w, step * step)
+
+    if resampling == "mean":
+        total = np.where(mask, cells, 0).sum(axis=-1, dtype=np.float64)
+        mean = total / mask.sum(axis=-1)
+        if block.dtype.kind in "biu":
+            mean = np.rint(mean)
+        return mean.astype(block.dtype)
+
+    # Mode: count equal values per cell with k vectorized comparisons (k=step^2)
+    counts = np.stack(
+        [
+            np.where(mask, cells == cells[..., k : k + 1], False).sum(axis=-1)
+            for k in range(step * step)
+        ],
+        axis=-1,
+    )
+    counts = np.where(mask, counts, -1)
+    best = counts.argmax(axis=-1)
+    return np.take_along_axis(cells, best[..., None], axis=-1)[..., 0]
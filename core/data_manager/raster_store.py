@@ -0,0 +1,319 @@
+from __future__ import annotations
+
+import json
+import math
+import os
+import shutil
+import zlib
+from dataclasses import asdict, dataclass, field, replace
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+from uuid import uuid4
+
+import numpy as np
+from core.common.exceptions import DataAccessError
+from core.data_manager.windows import Window
+
+HEADER_FILE = "header.json"
+FORMAT_VERSION = 1
+_COMPRESSORS = {None, "zlib"}
+
+# What the pixel values are: labels (class ids, masks) or measurements
+ROLE_CATEGORICAL = "categorical"
+ROLE_CONTINUOUS = "continuous"
+RASTER_ROLES = (ROLE_CATEGORICAL, ROLE_CONTINUOUS)
+
+
+def prediction_role(prediction: np.ndarray) -> str:
+    "Integer/bool model predictions are class labels, float ones scores"
+    return ROLE_CATEGORICAL if prediction.dtype.kind in "biu" else ROLE_CONTINUOUS
+
+
+def overview_root(root: Path, factor: int) -> Path:
+    "Location of the 1/factor overview level of the store at root"
+    return root / "overviews" / str(factor)
+
+
+@dataclass(frozen=True)
+class RasterHeader:
+    """
+    Index header of a chunked raster store.
+    - shape: (C, H, W) of the full-resolution array
+    - chunk_shape: (rows, cols) of every chunk (edge chunks are clipped)
+    - compression: None or "zlib", applied per chunk
+    - overviews: decimation factors with a stored overview level
+    - role: ROLE_CATEGORICAL or ROLE_CONTINUOUS (None if unknown); decides
+      how overviews are resampled
+    """
+
+    shape: Tuple[int, int, int]
+    dtype: str
+    chunk_shape: Tuple[int, int] = (256, 256)
+    compression: Optional[str] = None
+    fill_value: float = 0
+    bands: Optional[List[str]] = None
+    spatial: Optional[Dict[str, Any]] = None
+    overviews: List[int] = field(default_factory=list)
+    version: int = FORMAT_VERSION
+    role: Optional[str] = None
+
+    @property
+    def grid(self) -> Tuple[int, int]:
+        "Number of chunk rows and chunk columns"
+        _, height, width = self.shape
+        rows, cols = self.chunk_shape
+        return math.ceil(height / rows), math.ceil(width / cols)
+
+    def to_json(self) -> str:
+        return json.dumps(asdict(self), separators=(",", ":"))
+
+    @classmethod
+    def from_json(cls, text: str) -> "RasterHeader":
+        raw = json.loads(text)
+        raw["shape"] = tuple(raw["shape"])
+        raw["chunk_shape"] = tuple(raw["chunk_shape"])
+        return cls(**raw)
+
+
+class ChunkedRasterStore:
+    """
+    Band-major, chunked on-disk raster with random access to tiles.
+    Layout: <root>/header.json + <root>/chunks/b<band>/<row>_<col>.bin
+    Chunks are written atomically, so tiles can be produced incrementally
+    (e.g. by tiled inference) while readers only ever see whole chunks.
+    Missing chunks read back as fill_value.
+    """
+
+    def __init__(self, root: Path, header: RasterHeader) -> None:
+        self.root = root
+        self.header = header
+
+    @staticmethod
+    def is_store(path: Path) -> bool:
+        return (path / HEADER_FILE).is_file()
+
+    @classmethod
+    def create(
+        cls,
+        root: Path,
+        shape: Sequence[int],
+        dtype: Any,
+        chunk_shape: Tuple[int, int] = (256, 256),
+        compression: Optional[str] = None,
+        fill_value: float = 0,
+        bands: Optional[List[str]] = None,
+        spatial: Optional[Dict[str, Any]] = None,
+        overwrite: bool = False,
+        role: Optional[str] = None,
+    ) -> "ChunkedRasterStore":
+        if len(shape) != 3:
+            raise ValueError(f"Raster shape must be (C,H,W); got {tuple(shape)}")
+        if compression not in _COMPRESSORS:
+            raise ValueError(f"Unsupported compression: {compression}")
+        if role is not None and role not in RASTER_ROLES:
+            raise ValueError(f"Unsupported raster role: {role}")
+        if chunk_shape[0] <= 0 or chunk_shape[1] <= 0:
+            raise ValueError("chunk_shape must be positive")
+        if root.exists():
+            if not overwrite:
+                raise DataAccessError(f"Raster store already exists: {root}")
+            shutil.rmtree(root)
+        header = RasterHeader(
+            shape=(int(shape[0]), int(shape[1]), int(shape[2])),
+            dtype=np.dtype(dtype).str,
+            chunk_shape=(int(chunk_shape[0]), int(chunk_shape[1])),
+            compression=compression,
+            fill_value=fill_value,
+            bands=list(bands) if bands is not None else None,
+            spatial=spatial,
+            role=role,
+        )
+        store = cls(root, header)
+        (root / "chunks").mkdir(parents=True)
+        store._write_header()
+        return store
+
+    @classmethod
+    def open(cls, root: Path) -> "ChunkedRasterStore":
+        try:
+            text = (root / HEADER_FILE).read_text(encoding="utf-8")
+        except FileNotFoundError as e:
+            raise DataAccessError(f"Not a raster store: {root}") from e
+        header = RasterHeader.from_json(text)
+        if header.version > FORMAT_VERSION:
+            raise DataAccessError(f"Unsupported raster store version: {root}")
+        return cls(root, header)
+
+    @property
+    def shape(self) -> Tuple[int, int, int]:
+        return self.header.shape
+
+    @property
+    def dtype(self) -> np.dtype:
+        return np.dtype(self.header.dtype)
+
+    # Chunk level access
+    def chunk_window(self, chunk_row: int, chunk_col: int) -> Window:
+        _, height, width = self.shape
+        rows, cols = self.header.chunk_shape
+        row_off, col_off = chunk_row * rows, chunk_col * cols
+        return Window(
+            row_off, col_off, min(rows, height - row_off), min(cols, width - col_off)
+        )
+
+    def iter_chunk_windows(self) -> Iterator[Window]:
+        "Windows of the chunk grid in row-major order"
+        grid_rows, grid_cols = self.header.grid
+        for i in range(grid_rows):
+            for j in range(grid_cols):
+                yield self.chunk_window(i, j)
+
+    def read_chunk(self, band: int, chunk_row: int, chunk_col: int) -> np.ndarray:
+        win = self.chunk_window(chunk_row, chunk_col)
+        path = self._chunk_path(band, chunk_row, chunk_col)
+        try:
+            raw = path.read_bytes()
+        except FileNotFoundError:
+            return np.full(
+                (win.height, win.width), self.header.fill_value, dtype=self.dtype
+            )
+        if self.header.compression == "zlib":
+            raw = zlib.decompress(raw)
+        return np.frombuffer(raw, dtype=self.dtype).reshape(win.height, win.width)
+
+    def write_chunk(
+        self, band: int, chunk_row: int, chunk_col: int, data: np.ndarray
+    ) -> None:
+        win = self.chunk_window(chunk_row, chunk_col)
+        if data.shape != (win.height, win.width):
+            raise ValueError(
+                f"Chunk ({chunk_row},{chunk_col}) expects shape "
+                f"{(win.height, win.width)}; got {data.shape}"
+            )
+        raw = np.ascontiguousarray(data, dtype=self.dtype).tobytes()
+        if self.header.compression == "zlib":
+            raw = zlib.compress(raw, 1)
+        path = self._chunk_path(band, chunk_row, chunk_col)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f".{path.name}.{uuid4().hex}")
+        tmp.write_bytes(raw)
+        os.replace(tmp, path)
+
+    # Window level access
+    def read_window(
+        self,
+        window: Optional[Window] = None,
+        bands: Optional[Sequence[int]] = None,
+    ) -> np.ndarray:
+        "Assemble a (len(bands), h, w) array from the chunks overlapping window"
+        channels, height, width = self.shape
+        win = (window or Window(0, 0, height, width)).clip(height, width)
+        band_idx = list(range(channels)) if bands is None else list(bands)
+        for b in band_idx:
+            if not 0 <= b < channels:
+                raise DataAccessError(f"Band index {b} out of range at {self.root}")
+
+        out = np.empty((len(band_idx), win.height, win.width), dtype=self.dtype)
+        for (ci, cj), src, dst in self._overlaps(win):
+            for k, b in enumerate(band_idx):
+                out[(k,) + dst] = self.read_chunk(b, ci, cj)[src]
+        return out
+
+    def write_window(
+        self,
+        data: np.ndarray,
+        row_off: int = 0,
+        col_off: int = 0,
+        bands: Optional[Sequence[int]] = None,
+    ) -> None:
+        """
+        Write a (C, h, w) block at (row_off, col_off).
+        Chunk-aligned blocks are written directly; partially covered chunks
+        are read, patched and rewritten.
+        """
+        if data.ndim == 2:
+            data = data[np.newaxis]
+        channels, height, width = self.shape
+        band_idx = list(range(channels)) if bands is None else list(bands)
+        if data.shape[0] != len(band_idx):
+            raise ValueError(f"Expected {len(band_idx)} bands; got {data.shape[0]}")
+        win = Window(row_off, col_off, data.shape[1], data.shape[2])
+        if win.clip(height, width) != win:
+            raise ValueError(f"Window {win} exceeds raster shape {self.shape}")
+
+        for (ci, cj), src, dst in self._overlaps(win):
+            chunk_win = self.chunk_window(ci, cj)
+            full = (src[0].stop - src[0].start, src[1].stop - src[1].start) == (
+                chunk_win.height,
+                chunk_win.width,
+            )
+            for k, b in enumerate(band_idx):
+                block = data[(k,) + dst]
+                if not full:
+                    patched = self.read_chunk(b, ci, cj).copy()
+                    patched[src] = block
+                    block = patched
+                self.write_chunk(b, ci, cj, block)
+
+    def set_overviews(self, factors: Sequence[int]) -> None:
+        self.header = replace(self.header, overviews=sorted(set(factors)))
+        self._write_header()
+
+    def overview(self, factor: int) -> "ChunkedRasterStore":
+        if factor == 1:
+            return self
+        if factor not in self.header.overviews:
+            raise DataAccessError(f"No {factor}x overview at {self.root}")
+        return ChunkedRasterStore.open(overview_root(self.root, factor))
+
+    def level_for_resolution(
+        self, resolution: float
+    ) -> Tuple[int, "ChunkedRasterStore"]:
+        """
+        Coarsest level (factor, store) whose pixel size still meets the
+        requested resolution; full resolution if nothing coarser qualifies.
+        """
+        spatial = self.header.spatial
+        if spatial is None or not self.header.overviews:
+            return 1, self
+        base = float(spatial["resolution"])
+        eligible = [f for f in self.header.overviews if base * f <= resolution]
+        factor = max(eligible, default=1)
+        return factor, self.overview(factor)
+
+    def _overlaps(
+        self, win: Window
+    ) -> Iterator[Tuple[Tuple[int, int], Tuple[slice, slice], Tuple[slice, slice]]]:
+        "(chunk index, slice inside chunk, slice inside window) for each overlap"
+        rows, cols = self.header.chunk_shape
+        if win.height == 0 or win.width == 0:
+            return
+        for ci in range(
+            win.row_off // rows, (win.row_off + win.height - 1) // rows + 1
+        ):
+            r0 = max(win.row_off, ci * rows)
+            r1 = min(win.row_off + win.height, (ci + 1) * rows)
+            for cj in range(
+                win.col_off // cols, (win.col_off + win.width - 1) // cols + 1
+            ):
+                c0 = max(win.col_off, cj * cols)
+                c1 = min(win.col_off + win.width, (cj + 1) * cols)
+                yield (
+                    (ci, cj),
+                    (
+                        slice(r0 - ci * rows, r1 - ci * rows),
+                        slice(c0 - cj * cols, c1 - cj * cols),
+                    ),
+                    (
+                        slice(r0 - win.row_off, r1 - win.row_off),
+                        slice(c0 - win.col_off, c1 - win.col_off),
+                    ),
+                )
+
+    def _chunk_path(self, band: int, chunk_row: int, chunk_col: int) -> Path:
+        return self.root / "chunks" / f"b{band}" / f"{chunk_row}_{chunk_col}.bin"
+
+    def _write_header(self) -> None:
+        tmp = self.root / f".{HEADER_FILE}.{uuid4().hex}"
+        tmp.write_text(self.header.to_json(), encoding="utf-8")
+        os.replace(tmp, self.root / HEADER_FILE)
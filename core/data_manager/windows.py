@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+
+
+@dataclass(frozen=True)
+class Window:
+    "Pixel window (row/col offsets + size) on the last two axes of a raster"
+
+    row_off: int
+    col_off: int
+    height: int
+    width: int
+
+    def __post_init__(self) -> None:
+        if self.row_off < 0 or self.col_off < 0:
+            raise ValueError("Window offsets must be non-negative")
+        if self.height < 0 or self.width < 0:
+            raise ValueError("Window size must be non-negative")
+
+    def clip(self, height: int, width: int) -> "Window":
+        "Restrict the window to a raster of the given size"
+        row_off = min(self.row_off, height)
+        col_off = min(self.col_off, width)
+        return Window(
+            row_off=row_off,
+            col_off=col_off,
+            height=min(self.height, height - row_off),
+            width=min(self.width, width - col_off),
+        )
+
+    def scaled(self, factor: int) -> "Window":
+        "The window on a raster decimated by factor (covering partial pixels)"
+        row_off, col_off = self.row_off // factor, self.col_off // factor
+        return Window(
+            row_off=row_off,
+            col_off=col_off,
+            height=-(-(self.row_off + self.height) // factor) - row_off,
+            width=-(-(self.col_off + self.width) // factor) - col_off,
+        )
+
+    def slices(self) -> Tuple[slice, slice]:
+        return (
+            slice(self.row_off, self.row_off + self.height),
+            slice(self.col_off, self.col_off + self.width),
+        )
+
+
+def read_subset(
+    array: np.ndarray,
+    bands: Optional[Sequence[int]] = None,
+    window: Optional[Window] = None,
+) -> np.ndarray:
+    """
+    Copy a band/window subset of a (C, H, W) array into a new contiguous array.
+    Only the selected band planes and rows are touched, so memory-mapped
+    sources read just the pages that are needed.
+    """
+    if array.ndim != 3:
+        raise ValueError(f"Expected a (C,H,W) array; got shape={array.shape}")
+    channels, height, width = array.shape
+    band_idx = list(range(channels)) if bands is None else list(bands)
+    for b in band_idx:
+        if not 0 <= b < channels:
+            raise IndexError(f"Band index {b} out of range for {channels} bands")
+    win = (window or Window(0, 0, height, width)).clip(height, width)
+    rows, cols = win.slices()
+
+    out = np.empty((len(band_idx), win.height, win.width), dtype=array.dtype)
+    for i, b in enumerate(band_idx):
+        out[i] = array[b, rows, cols]
+    return out
@@ -1,79 +1,211 @@
 from __future__ import annotations
+from abc import abstractmethod
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Tuple
 import numpy as np
+from core.evaluation.confusion import ConfusionMatrix, to_labels
 from core.evaluation.metrics import BaseMetric, MetricResult
 from core.models.contracts import ModelOutput
 
+AVERAGES = ("binary", "macro", "micro")
+
+
+class ConfusionMetric(BaseMetric):
+    """
+    Metric derived from a confusion matrix.
+    - num_classes=2 (default): binary masks, thresholded at threshold
+    - num_classes>2: (classes, H, W) scores are argmax-ed, labels used as-is
+    - average: "binary" (class 1), "macro" (mean over present classes)
+      or "micro" (pooled counts)
+    Metrics with the same config_key share one confusion matrix in compute_many.
+    """
+
+    def __init__(
+        self,
+        num_classes: int = 2,
+        threshold: float = 0.5,
+        average: Optional[str] = None,
+        ignore_index: Optional[int] = None,
+    ) -> None:
+        if num_classes < 2:
+            raise ValueError("num_classes must be >= 2")
+        average = average or ("binary" if num_classes == 2 else "macro")
+        if average not in AVERAGES or (average == "binary" and num_classes != 2):
+            raise ValueError(f"Invalid average {average!r} for {num_classes} classes")
+        self.num_classes = num_classes
+        self.threshold = threshold
+        self.average = average
+        self.ignore_index = ignore_index
 
-def _binarize(x: np.ndarray, threshold: float = 0.5) -> np.ndarray:
-    return (x >= threshold).astype(np.uint8)
-
+    @property
+    def config_key(self) -> Hashable:
+        return (self.num_classes, self.threshold, self.ignore_index)
+
+    def confusion(self, y_pred: ModelOutput, y_true: np.ndarray) -> ConfusionMatrix:
+        return self.count(y_pred.prediction, y_true)
+
+    def count(self, prediction: np.ndarray, y_true: np.ndarray) -> ConfusionMatrix:
+        "Confusion counts of raw prediction/ground-truth arrays (or tiles of them)"
+        ignore, valid = self.ignore_index, None
+        if ignore is not None and self.num_classes == 2:
+            # Mask on the raw values: thresholding turns e.g. 255 into class 1
+            ignore, valid = None, y_true != self.ignore_index
+        return ConfusionMatrix.from_labels(
+            to_labels(y_true, self.num_classes, self.threshold),
+            to_labels(prediction, self.num_classes, self.threshold),
+            self.num_classes,
+            ignore_index=ignore,
+            valid=valid,
+        )
 
-class AccuracyMetric(BaseMetric):
+    def compute(self, y_pred: ModelOutput, y_true: np.ndarray) -> MetricResult:
+        return self.from_confusion(self.confusion(y_pred, y_true))
+
+    @abstractmethod
+    def from_confusion(self, cm: ConfusionMatrix) -> MetricResult:
+        "Derive the metric from accumulated confusion counts"
+        raise NotImplementedError
+
+    def _ratio_result(
+        self,
+        cm: ConfusionMatrix,
+        num: np.ndarray,
+        den: np.ndarray,
+        labels: Tuple[str, str],
+        shown: Optional[np.ndarray] = None,
+    ) -> MetricResult:
+        """
+        Per-class num/den reduced by the configured average.
+        labels name the two counts in details (shown replaces num there).
+        """
+        values = _per_class(cm, num, den)
+        shown = num if shown is None else shown
+        if self.average == "binary":
+            value = 1.0 if np.isnan(values[1]) else float(values[1])
+            details: Dict[str, Any] = {
+                labels[0]: int(shown[1]),
+                labels[1]: int(den[1]),
+            }
+        elif self.average == "micro":
+            total_num, total_den = int(num.sum()), int(den.sum())
+            value = float(total_num) / float(total_den) if total_den else 1.0
+            details = {labels[0]: int(shown.sum()), labels[1]: total_den}
+        else:
+            present = values[~np.isnan(values)]
+            value = float(present.mean()) if present.size else 1.0
+            details = {"per_class": [None if np.isnan(v) else float(v) for v in values]}
+        return MetricResult(name=self.name, value=value, details=details)
+
+
+def _per_class(cm: ConfusionMatrix, num: np.ndarray, den: np.ndarray) -> np.ndarray:
+    """
+    num/den per class; a zero denominator gives NaN for classes that occur
+    nowhere (neither true nor predicted) and 0.0 otherwise.
+    """
+    absent = (cm.tp + cm.fp + cm.fn) == 0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        values = num / den.astype(np.float64)
+    values[den == 0] = 0.0
+    values[absent] = np.nan
+    return values
+
+
+class AccuracyMetric(ConfusionMetric):
     @property
     def name(self) -> str:
         return "accuracy"
 
-    def compute(self, y_pred: ModelOutput, y_true: np.ndarray) -> MetricResult:
-        y_hat = _binarize(y_pred.prediction)
-        y_true_bin = _binarize(y_true)
-        correct = np.sum(y_hat == y_true_bin)
-        total = y_true_bin.size
-        acc = float(correct) / float(total)
+    def from_confusion(self, cm: ConfusionMatrix) -> MetricResult:
+        correct, total = int(cm.tp.sum()), cm.total
+        acc = float(correct) / float(total) if total else 1.0
 
         return MetricResult(
             name=self.name,
             value=acc,
-            details={"correct": int(correct), "total": int(total)},
+            details={"correct": correct, "total": total},
         )
 
 
-class IoUMetric(BaseMetric):
+class IoUMetric(ConfusionMetric):
     @property
     def name(self) -> str:
         return "iou"
 
-    def compute(self, y_pred: ModelOutput, y_true: np.ndarray) -> MetricResult:
-        y_hat = _binarize(y_pred.prediction)
-        y_true_bin = _binarize(y_true)
-        intersection = np.logical_and(y_hat, y_true_bin).sum()
-        union = np.logical_or(y_hat, y_true_bin).sum()
+    def from_confusion(self, cm: ConfusionMatrix) -> MetricResult:
+        union = cm.tp + cm.fp + cm.fn
+        return self._ratio_result(cm, cm.tp, union, ("intersection", "union"))
 
-        if union == 0:
-            iou = 1.0  # both empty
-        else:
-            iou = float(intersection) / float(union)
 
-        return MetricResult(
-            name=self.name,
-            value=iou,
-            details={
-                "intersection": int(intersection),
-                "union": int(union),
-            },
+class DiceMetric(ConfusionMetric):
+    @property
+    def name(self) -> str:
+        return "dice"
+
+    def from_confusion(self, cm: ConfusionMatrix) -> MetricResult:
+        total = 2 * cm.tp + cm.fp + cm.fn
+        return self._ratio_result(
+            cm, 2 * cm.tp, total, ("intersection", "sum_pred_true"), shown=cm.tp
         )
 
 
-class DiceMetric(BaseMetric):
+class PrecisionMetric(ConfusionMetric):
     @property
     def name(self) -> str:
-        return "dice"
+        return "precision"
 
-    def compute(self, y_pred: ModelOutput, y_true: np.ndarray) -> MetricResult:
-        y_hat = _binarize(y_pred.prediction)
-        y_true_bin = _binarize(y_true)
-        intersection = np.logical_and(y_hat, y_true_bin).sum()
-        total = y_hat.sum() + y_true_bin.sum()
+    def from_confusion(self, cm: ConfusionMatrix) -> MetricResult:
+        return self._ratio_result(
+            cm, cm.tp, cm.tp + cm.fp, ("true_positive", "predicted_positive")
+        )
 
-        if total == 0:
-            dice = 1.0
-        else:
-            dice = 2.0 * float(intersection) / float(total)
 
-        return MetricResult(
-            name=self.name,
-            value=dice,
-            details={
-                "intersection": int(intersection),
-                "sum_pred_true": int(total),
-            },
+class RecallMetric(ConfusionMetric):
+    @property
+    def name(self) -> str:
+        return "recall"
+
+    def from_confusion(self, cm: ConfusionMatrix) -> MetricResult:
+        return self._ratio_result(
+            cm, cm.tp, cm.tp + cm.fn, ("true_positive", "actual_positive")
         )
+
+
+class F1Metric(DiceMetric):
+    "F1 score; equals Dice for pixel-wise segmentation"
+
+    @property
+    def name(self) -> str:
+        return "f1"
+
+
+def check_unique_names(metrics: Iterable[BaseMetric]) -> List[BaseMetric]:
+    """
+    Metrics as a list; results are keyed by name, so two metrics with one
+    name (e.g. IoU with and without ignore_index) would overwrite each other.
+    """
+    metrics = list(metrics)
+    names = [metric.name for metric in metrics]
+    duplicates = sorted({name for name in names if names.count(name) > 1})
+    if duplicates:
+        raise ValueError(f"Duplicate metric names: {', '.join(duplicates)}")
+    return metrics
+
+
+def compute_many(
+    metrics: Iterable[BaseMetric], y_pred: ModelOutput, y_true: np.ndarray
+) -> Dict[str, MetricResult]:
+    """
+    Evaluate a metric set; confusion-based metrics with the same config
+    share a single confusion matrix (one bincount pass).
+    """
+    metrics = check_unique_names(metrics)
+    confusions: Dict[Hashable, ConfusionMatrix] = {}
+    results: Dict[str, MetricResult] = {}
+    for metric in metrics:
+        if isinstance(metric, ConfusionMetric):
+            cm = confusions.get(metric.config_key)
+            if cm is None:
+                cm = confusions[metric.config_key] = metric.confusion(y_pred, y_true)
+            results[metric.name] = metric.from_confusion(cm)
+        else:
+            results[metric.name] = metric.compute(y_pred, y_true)
+    return results
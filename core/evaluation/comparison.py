@@ -1,16 +1,18 @@
 from __future__ import annotations
-from dataclasses import dataclass
-from typing import Dict, List, Optional
+from dataclasses import dataclass, field
+from time import time
+from typing import Dict, List, Optional, Tuple
 
 
 @dataclass(frozen=True)
 class RunMetrics:
-    "Represents evaluation results of a single run"
+    "Represents evaluation results of a single run (created_at: unix seconds)"
 
     trace_id: str
     model_name: str
     version: str
     metrics: Dict[str, float]
+    created_at: float = field(default_factory=time)
 
 
 def compare_runs(
@@ -30,17 +32,24 @@ def compare_runs(
     )
 
 
+def rank_key(
+    run: RunMetrics, metric_name: str, higher_is_better: bool
+) -> Tuple[float, float, str]:
+    "Smaller is better: metric value, then earlier created_at, then trace_id"
+    value = run.metrics[metric_name]
+    return (-value if higher_is_better else value, run.created_at, run.trace_id)
+
+
 def best_run(
     runs: List[RunMetrics],
     metric_name: str,
     higher_is_better: bool = True,
 ) -> Optional[RunMetrics]:
-    "Return the best run according to a metric"
-    if not runs:
+    """
+    Return the best run according to a metric, in O(n).
+    Runs without the metric are skipped; ties are broken like top_k.
+    """
+    candidates = [run for run in runs if metric_name in run.metrics]
+    if not candidates:
         return None
-    sorted_runs = compare_runs(
-        runs,
-        metric_name=metric_name,
-        higher_is_better=higher_is_better,
-    )
-    return sorted_runs[0]
+    return min(candidates, key=lambda run: rank_key(run, metric_name, higher_is_better))
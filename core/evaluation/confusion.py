@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+
+
+def to_labels(
+    x: np.ndarray, num_classes: int = 2, threshold: float = 0.5
+) -> np.ndarray:
+    """
+    Class labels of a prediction or ground-truth array.
+    - binary (num_classes=2): values >= threshold are class 1
+    - multi-class: a (classes, H, W) score stack is argmax-ed over axis 0;
+      anything else is taken as integer labels
+    """
+    if num_classes == 2:
+        return x >= threshold
+    if x.ndim == 3 and x.shape[0] == num_classes:
+        return np.argmax(x, axis=0)
+    return x
+
+
+@dataclass(frozen=True)
+class ConfusionMatrix:
+    """
+    (num_classes x num_classes) pixel counts; rows are true, columns predicted.
+    Every metric (accuracy, IoU, Dice, precision, recall, F1) derives from it.
+    """
+
+    matrix: np.ndarray
+
+    @classmethod
+    def empty(cls, num_classes: int) -> "ConfusionMatrix":
+        return cls(np.zeros((num_classes, num_classes), dtype=np.int64))
+
+    @classmethod
+    def from_labels(
+        cls,
+        y_true: np.ndarray,
+        y_pred: np.ndarray,
+        num_classes: int,
+        ignore_index: Optional[int] = None,
+        valid: Optional[np.ndarray] = None,
+    ) -> "ConfusionMatrix":
+        """
+        Count label pairs with a single np.bincount pass.
+        Pixels where y_true is ignore_index, or valid is False, are skipped;
+        any other label outside [0, num_classes) raises ValueError.
+        """
+        if y_true.size != y_pred.size or (
+            valid is not None and valid.size != y_true.size
+        ):
+            raise ValueError(
+                f"Shape mismatch: y_true {y_true.shape} vs y_pred {y_pred.shape}"
+            )
+        t = y_true.reshape(-1).astype(np.int64, copy=False)
+        p = y_pred.reshape(-1).astype(np.int64, copy=False)
+        keep = None if valid is None else valid.reshape(-1).astype(bool, copy=False)
+        if ignore_index is not None:
+            keep = t != ignore_index if keep is None else keep & (t != ignore_index)
+        if keep is not None:
+            t, p = t[keep], p[keep]
+        if not (_in_range(t, num_classes) and _in_range(p, num_classes)):
+            raise ValueError(
+                f"Labels outside [0, {num_classes}); set ignore_index for no-data"
+            )
+        counts = np.bincount(t * num_classes + p, minlength=num_classes**2)
+        return cls(counts.reshape(num_classes, num_classes).astype(np.int64))
+
+    def __add__(self, other: "ConfusionMatrix") -> "ConfusionMatrix":
+        return ConfusionMatrix(self.matrix + other.matrix)
+
+    @property
+    def num_classes(self) -> int:
+        return int(self.matrix.shape[0])
+
+    @property
+    def total(self) -> int:
+        return int(self.matrix.sum())
+
+    @property
+    def tp(self) -> np.ndarray:
+        return np.diag(self.matrix)
+
+    @property
+    def fp(self) -> np.ndarray:
+        return self.matrix.sum(axis=0) - self.tp
+
+    @property
+    def fn(self) -> np.ndarray:
+        return self.matrix.sum(axis=1) - self.tp
+
+    @property
+    def tn(self) -> np.ndarray:
+        return self.total - self.tp - self.fp - self.fn
+
+
+def _in_range(labels: np.ndarray, num_classes: int) -> bool:
+    return labels.size == 0 or (labels.min() >= 0 and labels.max() < num_classes)
@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import heapq
+from typing import Iterable, List, Mapping
+
+import numpy as np
+from core.evaluation.comparison import RunMetrics, rank_key
+from core.evaluation.persistence import MetricTable
+
+
+def top_k(
+    runs: Iterable[RunMetrics],
+    metric_name: str,
+    k: int,
+    higher_is_better: bool = True,
+) -> List[RunMetrics]:
+    """
+    Best k runs by a metric in O(n log k) (heapq), best first.
+    Runs without the metric are skipped; ties go to the earlier run.
+    """
+    candidates = (run for run in runs if metric_name in run.metrics)
+    return heapq.nsmallest(
+        k, candidates, key=lambda run: rank_key(run, metric_name, higher_is_better)
+    )
+
+
+def top_k_indices(
+    table: MetricTable, metric_name: str, k: int, higher_is_better: bool = True
+) -> np.ndarray:
+    """
+    Row indices of the best k runs of a columnar table, best first.
+    np.argpartition selects them in O(n); only the k winners are sorted.
+    """
+    values = table.metrics.get(metric_name)
+    if values is None or k <= 0:
+        return np.empty(0, dtype=np.intp)
+    rows = np.flatnonzero(~np.isnan(values))
+    scores = -values[rows] if higher_is_better else values[rows]
+    if k < rows.size:
+        # Keep every row tied with the k-th score so tie-breaking is exact
+        kth = np.partition(scores, k - 1)[k - 1]
+        rows, scores = rows[scores <= kth], scores[scores <= kth]
+    # Same order as top_k: score, then created_at, then trace_id
+    order = np.lexsort((_trace_ids(table, rows), table.created_at[rows], scores))
+    return rows[order][:k]
+
+
+def _trace_ids(table: MetricTable, rows: np.ndarray) -> np.ndarray:
+    return np.array([table.trace_ids[i] for i in rows.tolist()], dtype=str)
+
+
+def top_k_table(
+    table: MetricTable, metric_name: str, k: int, higher_is_better: bool = True
+) -> List[RunMetrics]:
+    return table.runs_at(top_k_indices(table, metric_name, k, higher_is_better))
+
+
+def pareto_front_indices(
+    table: MetricTable, objectives: Mapping[str, bool]
+) -> np.ndarray:
+    """
+    Rows not dominated on the given objectives (metric -> higher_is_better).
+    A row is dominated if another is at least as good everywhere and better
+    somewhere; of identical rows only the earliest is kept.
+    Returned in order of the first objective (best first, then created_at
+    and trace_id).
+    """
+    if not objectives:
+        raise ValueError("At least one objective is required")
+    # Orient every objective so that larger is better
+    matrix = np.column_stack(
+        [
+            table.metrics[name] if hib else -table.metrics[name]
+            for name, hib in objectives.items()
+        ]
+    )
+    rows = np.flatnonzero(~np.isnan(matrix).any(axis=1))
+    # Sorted best-first, a row can only be dominated by rows before it
+    keys = [-matrix[rows, j] for j in reversed(range(matrix.shape[1]))]
+    order = np.lexsort([_trace_ids(table, rows), table.created_at[rows]] + keys)
+    front: List[int] = []
+    kept = np.empty((rows.size, matrix.shape[1]))
+    for row in rows[order]:
+        point = matrix[row]
+        # Earlier rows that are >= everywhere dominate (or duplicate) this one
+        if (kept[: len(front)] >= point).all(axis=1).any():
+            continue
+        kept[len(front)] = point
+        front.append(int(row))
+    return np.asarray(front, dtype=np.intp)
+
+
+def pareto_front(
+    table: MetricTable, objectives: Mapping[str, bool]
+) -> List[RunMetrics]:
+    return table.runs_at(pareto_front_indices(table, objectives))
@@ -1,34 +1,330 @@
 from __future__ import annotations
 import json
-from dataclasses import asdict
+import math
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass
 from pathlib import Path
-from typing import List
-from core.evaluation.comparison import RunMetrics
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence
+from urllib.parse import quote
+import numpy as np
+from core.evaluation.comparison import RunMetrics, rank_key
+from core.utils.fs import atomic_write_bytes, encode_json, file_lock
+
+LOG_FILE = "runs.jsonl"
+INDEX_FILE = "runs.index"
+COLUMNS_DIR = "columns"
+LEGACY_DIR = "legacy"
+LOCK_FILE = ".lock"
+_TRACE_IDS = "trace_ids.txt"
+_CREATED_AT = "created_at.f8"
+
+
+@dataclass(frozen=True)
+class MetricTable:
+    """
+    Columnar view of a model/version's evaluation history.
+    metrics[name][i] is NaN when run i did not record that metric.
+    """
+
+    model_name: str
+    version: str
+    trace_ids: List[str]
+    created_at: np.ndarray
+    metrics: Dict[str, np.ndarray]
+
+    def __len__(self) -> int:
+        return len(self.trace_ids)
+
+    def runs(self) -> List[RunMetrics]:
+        return self.runs_at(range(len(self)))
+
+    def runs_at(self, rows: Iterable[int]) -> List[RunMetrics]:
+        "RunMetrics of the given rows (NaN entries are left out)"
+        idx = np.fromiter(rows, dtype=np.intp)
+        # Plain lists avoid per-element numpy scalar overhead
+        columns = {name: col[idx].tolist() for name, col in self.metrics.items()}
+        created_at = self.created_at[idx].tolist()
+        return [
+            RunMetrics(
+                trace_id=self.trace_ids[i],
+                model_name=self.model_name,
+                version=self.version,
+                metrics={
+                    name: col[j]
+                    for name, col in columns.items()
+                    if not math.isnan(col[j])
+                },
+                created_at=created_at[j],
+            )
+            for j, i in enumerate(idx.tolist())
+        ]
 
 
 class EvaluationStore:
-    "Simple file-based persistence for evaluation results"
+    """
+    Append-only evaluation history, one directory per model/version:
+    - runs.jsonl: record log (source of truth), one compact JSON line per run
+    - columns/: float64 column per metric + created_at, and trace_ids.txt
+    - runs.index: record count, metric names, log size and the max/min run
+      per metric (best-run index, updated on every append); written last, so
+      readers only see complete appends. A mismatch with the log (e.g. after
+      a crash mid-append) rebuilds the columns from the log.
+    Per-run JSON files of the previous layout are appended on first access
+    and moved to legacy/.
+    Appends and repairs hold the directory's .lock file (flock), so several
+    processes may write the same model/version; without fcntl (Windows)
+    only the threads of one process are serialized.
+    """
 
     def __init__(self, root_dir: Path) -> None:
         self._root = root_dir
+        self._lock = threading.Lock()
 
     def save(self, run: RunMetrics) -> Path:
-        "Persist evaluation results to JSON file"
-        path = self._root / "evaluations" / run.model_name / run.version
-        path.mkdir(parents=True, exist_ok=True)
-        file_path = path / f"{run.trace_id}.json"
-        with file_path.open("w", encoding="utf-8") as f:
-            json.dump(asdict(run), f, indent=2)
-        return file_path
-
-    def load_all(self, model_name: str, version: str) -> List[RunMetrics]:
-        "Load all persisted runs for a model/version"
-        path = self._root / "evaluations" / model_name / version
-        if not path.exists():
-            return []
-        runs = []
-        for file in path.glob("*.json"):
-            with file.open("r", encoding="utf-8") as f:
-                data = json.load(f)
+        "Append a run to its model/version log; returns the log path"
+        self.save_many([run])
+        return self._dir(run.model_name, run.version) / LOG_FILE
+
+    def save_many(self, runs: Iterable[RunMetrics]) -> None:
+        "Append runs with one write per file and model/version"
+        groups: Dict[tuple, List[RunMetrics]] = {}
+        for run in runs:
+            groups.setdefault((run.model_name, run.version), []).append(run)
+        for (model_name, version), batch in groups.items():
+            path = self._dir(model_name, version)
+            with self._locked(path, create=True):
+                self._ensure(path)
+                _append(path, batch)
+
+    def load_table(
+        self,
+        model_name: str,
+        version: str,
+        metrics: Optional[Sequence[str]] = None,
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+    ) -> MetricTable:
+        """
+        Columns of the stored runs, optionally only some metrics and runs
+        created in [start, end) (unix seconds).
+        """
+        path = self._dir(model_name, version)
+        with self._locked(path):
+            index = self._ensure(path)
+        count = index["count"]
+        columns = path / COLUMNS_DIR
+        created_at = _read_column(columns / _CREATED_AT, count)
+        names = index["metrics"] if metrics is None else list(metrics)
+        values = {
+            name: (
+                _read_column(columns / _metric_file(name), count)
+                if name in index["metrics"]
+                else np.full(count, np.nan)
+            )
+            for name in names
+        }
+        trace_ids = _read_trace_ids(columns / _TRACE_IDS, count)
+
+        if start is not None or end is not None:
+            mask = np.ones(count, dtype=bool)
+            if start is not None:
+                mask &= created_at >= start
+            if end is not None:
+                mask &= created_at < end
+            selected = np.flatnonzero(mask)
+            trace_ids = [trace_ids[i] for i in selected]
+            created_at = created_at[selected]
+            values = {name: col[selected] for name, col in values.items()}
+        return MetricTable(model_name, version, trace_ids, created_at, values)
+
+    def load_all(
+        self,
+        model_name: str,
+        version: str,
+        metrics: Optional[Sequence[str]] = None,
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+    ) -> List[RunMetrics]:
+        """
+        Load persisted runs for a model/version (see load_table for filters).
+        Builds one RunMetrics per run; large histories are much cheaper to
+        analyse as a MetricTable from load_table.
+        """
+        return self.load_table(model_name, version, metrics, start, end).runs()
+
+    def best_run(
+        self,
+        model_name: str,
+        version: str,
+        metric_name: str,
+        higher_is_better: bool = True,
+    ) -> Optional[RunMetrics]:
+        "Best stored run by a metric, from the incrementally maintained index"
+        path = self._dir(model_name, version)
+        with self._locked(path):
+            index = self._ensure(path)
+        entry = index.get("best", {}).get(metric_name)
+        if entry is None:
+            return None
+        record = entry["max" if higher_is_better else "min"]
+        return RunMetrics(model_name=model_name, version=version, **record)
+
+    def versions(self, model_name: str) -> List[str]:
+        "Versions with stored evaluations for a model"
+        path = self._root / "evaluations" / model_name
+        return (
+            sorted(p.name for p in path.iterdir() if p.is_dir())
+            if path.exists()
+            else []
+        )
+
+    @contextmanager
+    def _locked(self, path: Path, create: bool = False) -> Iterator[None]:
+        "Hold the thread lock and path's file lock (if path exists or create)"
+        with self._lock:
+            if create:
+                path.mkdir(parents=True, exist_ok=True)
+            elif not path.exists():
+                yield
+                return
+            with file_lock(path / LOCK_FILE):
+                yield
+
+    def _dir(self, model_name: str, version: str) -> Path:
+        return self._root / "evaluations" / model_name / version
+
+    def _ensure(self, path: Path) -> dict:
+        "Index of path, repairing columns and migrating legacy files if needed"
+        index = _read_index(path)
+        log = path / LOG_FILE
+        log_bytes = log.stat().st_size if log.exists() else 0
+        if index["log_bytes"] != log_bytes:
+            index = _rebuild(path)
+        legacy = sorted(path.glob("*.json")) if path.exists() else []
+        if legacy:
+            runs = []
+            for file in legacy:
+                data = json.loads(file.read_bytes())
+                data.setdefault("created_at", file.stat().st_mtime)
                 runs.append(RunMetrics(**data))
-        return runs
+            runs.sort(key=lambda r: r.created_at)
+            index = _append(path, runs)
+            (path / LEGACY_DIR).mkdir(exist_ok=True)
+            for file in legacy:
+                file.replace(path / LEGACY_DIR / file.name)
+        return index
+
+
+def _metric_file(name: str) -> str:
+    return f"metric.{quote(name, safe='')}.f8"
+
+
+def _read_index(path: Path) -> dict:
+    try:
+        return json.loads((path / INDEX_FILE).read_bytes())
+    except FileNotFoundError:
+        return {"count": 0, "metrics": [], "log_bytes": 0}
+
+
+def _read_column(path: Path, count: int) -> np.ndarray:
+    return np.fromfile(path, dtype="<f8", count=count) if count else np.empty(0)
+
+
+def _read_trace_ids(path: Path, count: int) -> List[str]:
+    if not count:
+        return []
+    return path.read_text(encoding="utf-8").split("\n", count)[:count]
+
+
+def _record(run: RunMetrics) -> bytes:
+    return encode_json(
+        {"trace_id": run.trace_id, "created_at": run.created_at, "metrics": run.metrics}
+    )
+
+
+def _append(path: Path, runs: List[RunMetrics], log: bool = True) -> dict:
+    "Append runs to the log (unless log=False) and the columns; returns the index"
+    index = _read_index(path)
+    columns = path / COLUMNS_DIR
+    columns.mkdir(parents=True, exist_ok=True)
+    if log:
+        with (path / LOG_FILE).open("ab") as f:
+            f.write(b"".join(_record(run) + b"\n" for run in runs))
+
+    count = index["count"]
+    known = set(index["metrics"])
+    for run in runs:
+        for name in run.metrics:
+            if name not in known:
+                # Backfill a new metric column for earlier runs
+                known.add(name)
+                index["metrics"].append(name)
+                np.full(count, np.nan, dtype="<f8").tofile(columns / _metric_file(name))
+
+    _append_column(columns / _CREATED_AT, [run.created_at for run in runs])
+    for name in index["metrics"]:
+        _append_column(
+            columns / _metric_file(name),
+            [run.metrics.get(name, math.nan) for run in runs],
+        )
+    with (columns / _TRACE_IDS).open("ab") as f:
+        f.write(b"".join(run.trace_id.encode("utf-8") + b"\n" for run in runs))
+
+    _update_best(index.setdefault("best", {}), runs)
+    index["count"] = count + len(runs)
+    index["log_bytes"] = (path / LOG_FILE).stat().st_size
+    atomic_write_bytes(path / INDEX_FILE, encode_json(index))
+    return index
+
+
+def _update_best(best: Dict[str, dict], runs: List[RunMetrics]) -> None:
+    """
+    Keep the max and min run record per metric, so the best run is known in
+    O(1) for either direction; ties are broken like top_k (rank_key).
+    """
+    for run in runs:
+        for name, value in run.metrics.items():
+            if math.isnan(value):
+                continue
+            entry = best.setdefault(name, {})
+            for key, higher_is_better in (("max", True), ("min", False)):
+                current = entry.get(key)
+                rank = rank_key(run, name, higher_is_better)
+                if current is None or rank < _record_rank(
+                    current, name, higher_is_better
+                ):
+                    entry[key] = json.loads(_record(run))
+
+
+def _record_rank(record: dict, metric_name: str, higher_is_better: bool) -> tuple:
+    "rank_key of a stored run record"
+    run = RunMetrics(model_name="", version="", **record)
+    return rank_key(run, metric_name, higher_is_better)
+
+
+def _append_column(path: Path, values: List[float]) -> None:
+    with path.open("ab") as f:
+        f.write(np.asarray(values, dtype="<f8").tobytes())
+
+
+def _rebuild(path: Path) -> dict:
+    "Recreate columns and index from the log, dropping a torn last line"
+    log = path / LOG_FILE
+    raw = log.read_bytes() if log.exists() else b""
+    complete = raw[: raw.rfind(b"\n") + 1]
+    if len(complete) != len(raw):
+        with log.open("r+b") as f:
+            f.truncate(len(complete))
+    columns = path / COLUMNS_DIR
+    if columns.exists():
+        for file in columns.iterdir():
+            file.unlink()
+    (path / INDEX_FILE).unlink(missing_ok=True)
+
+    model_name, version = path.parent.name, path.name
+    runs = [
+        RunMetrics(model_name=model_name, version=version, **json.loads(line))
+        for line in complete.splitlines()
+    ]
+    return _append(path, runs, log=False)
@@ -0,0 +1,282 @@
+from __future__ import annotations
+
+from collections import deque
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Executor,
+    Future,
+    ThreadPoolExecutor,
+    wait,
+)
+from dataclasses import dataclass
+from pathlib import Path
+from time import perf_counter
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Union,
+)
+from uuid import uuid4
+
+from core.common.exceptions import DataAccessError, ExecutionError
+from core.data_manager.base import BaseDataManager
+from core.evaluation.basic_metrics import ConfusionMetric
+from core.evaluation.comparison import RunMetrics
+from core.evaluation.persistence import EvaluationStore
+from core.evaluation.streaming import (
+    DEFAULT_TILE_SHAPE,
+    MetricAccumulator,
+    accumulate_tiles,
+    iter_windows,
+)
+from core.inference.engine import InferenceEngine
+from core.inference.io import load_array_from_uri, load_payload_from_uri
+from core.inference.schemas import InferenceRequest, VersionSpec
+from core.logging.logger import Logger
+
+COMPLETION_MODES = ("ordered", "unordered")
+
+
+@dataclass(frozen=True)
+class EvaluationItem:
+    "One dataset item: model input and its ground truth"
+
+    input_uri: str
+    truth_uri: str
+
+
+@dataclass(frozen=True)
+class EvaluationProgress:
+    "Progress snapshot reported after every completed item"
+
+    done: int
+    total: int
+    pixels: int
+    elapsed_s: float
+
+    @property
+    def items_per_s(self) -> float:
+        return self.done / self.elapsed_s if self.elapsed_s > 0 else 0.0
+
+    @property
+    def pixels_per_s(self) -> float:
+        return self.pixels / self.elapsed_s if self.elapsed_s > 0 else 0.0
+
+
+@dataclass(frozen=True)
+class ItemResult:
+    "Metric counts of one item and the model version that produced it"
+
+    accumulator: MetricAccumulator
+    version: str
+
+
+def load_manifest_items(
+    manifest: Union[str, Mapping[str, Any]],
+    truth_uris: Union[Mapping[str, str], Sequence[str]],
+    data_manager: BaseDataManager,
+) -> List[EvaluationItem]:
+    """
+    Pair the files of an ingestion manifest (dict or its URI) with ground truth.
+    - truth_uris as a mapping: keyed by manifest file path; files without an
+      entry (e.g. the truth files themselves) are skipped
+    - truth_uris as a sequence: aligned with manifest["files"]
+    """
+    if isinstance(manifest, str):
+        manifest = load_payload_from_uri(manifest, data_manager)
+    files = manifest.get("files")
+    if not isinstance(files, list):
+        raise DataAccessError("Manifest has no 'files' list")
+
+    if isinstance(truth_uris, Mapping):
+        pairs = [(f, truth_uris[f]) for f in files if f in truth_uris]
+    else:
+        if len(truth_uris) != len(files):
+            raise ValueError(
+                f"Got {len(truth_uris)} ground-truth URIs for {len(files)} files"
+            )
+        pairs = list(zip(files, truth_uris))
+    return [EvaluationItem(_as_uri(f), t) for f, t in pairs]
+
+
+def _as_uri(path_or_uri: str) -> str:
+    "Manifest entries are absolute paths; pass URIs through unchanged"
+    return (
+        Path(path_or_uri).as_uri() if Path(path_or_uri).is_absolute() else path_or_uri
+    )
+
+
+class EvaluationRunner:
+    """
+    Dataset-level evaluation: inference + metrics for every item through a
+    bounded worker pool, merging per-item metric accumulators.
+    - max_workers: pool size (and at most 2 x max_workers items in flight)
+    - completion: "ordered" merges results in item order, "unordered" as
+      soon as they finish
+    - executor: optional pool to use instead of an internal thread pool
+      (a ProcessPoolExecutor requires a picklable engine and data manager)
+    Merging is order-independent, so both modes give identical metrics.
+    """
+
+    def __init__(
+        self,
+        engine: InferenceEngine,
+        data_manager: BaseDataManager,
+        store: Optional[EvaluationStore] = None,
+        logger: Optional[Logger] = None,
+        max_workers: int = 4,
+        completion: str = "unordered",
+        tile_shape: Tuple[int, int] = DEFAULT_TILE_SHAPE,
+        executor: Optional[Executor] = None,
+    ) -> None:
+        if max_workers < 1:
+            raise ValueError("max_workers must be >= 1")
+        if completion not in COMPLETION_MODES:
+            raise ValueError(f"Unknown completion mode: {completion}")
+        self._engine = engine
+        self._dm = data_manager
+        self._store = store
+        self._logger = logger
+        self._max_workers = max_workers
+        self._completion = completion
+        self._tile_shape = tile_shape
+        self._executor = executor
+
+    def run(
+        self,
+        items: Sequence[EvaluationItem],
+        metrics: Sequence[ConfusionMetric],
+        model_name: str,
+        version: Optional[VersionSpec] = None,
+        parameters: Optional[Dict[str, Any]] = None,
+        on_progress: Optional[Callable[[EvaluationProgress], None]] = None,
+    ) -> RunMetrics:
+        "Evaluate all items; the aggregate RunMetrics is saved to the store"
+        if not items:
+            raise ValueError("No items to evaluate")
+        total = MetricAccumulator(metrics)
+        versions: Set[str] = set()
+        t0 = perf_counter()
+        done = 0
+        for result in self._results(items, metrics, model_name, version, parameters):
+            total.merge(result.accumulator)
+            versions.add(result.version)
+            done += 1
+            progress = EvaluationProgress(
+                done, len(items), total.pixels, perf_counter() - t0
+            )
+            self._report(progress, on_progress)
+        if len(versions) != 1:
+            raise ExecutionError(
+                f"Model version changed during evaluation: {sorted(versions)}"
+            )
+
+        run = RunMetrics(
+            trace_id=uuid4().hex[:12],
+            model_name=model_name,
+            version=versions.pop(),
+            metrics={name: r.value for name, r in total.finalize().items()},
+        )
+        if self._store is not None:
+            self._store.save(run)
+        return run
+
+    def _results(
+        self,
+        items: Sequence[EvaluationItem],
+        metrics: Sequence[ConfusionMetric],
+        model_name: str,
+        version: Optional[VersionSpec],
+        parameters: Optional[Dict[str, Any]],
+    ) -> Iterator[ItemResult]:
+        "Per-item results, keeping at most 2 x max_workers futures in flight"
+        executor = self._executor or ThreadPoolExecutor(self._max_workers)
+        pending: Deque[Future] = deque()
+        try:
+            for item in items:
+                pending.append(
+                    executor.submit(
+                        self.evaluate_item,
+                        item,
+                        metrics,
+                        model_name,
+                        version,
+                        parameters,
+                    )
+                )
+                if len(pending) >= 2 * self._max_workers:
+                    yield from self._drain(pending, until=self._max_workers)
+            yield from self._drain(pending, until=0)
+        finally:
+            for future in pending:
+                future.cancel()
+            if self._executor is None:
+                executor.shutdown(wait=True)
+
+    def _drain(self, pending: Deque[Future], until: int) -> Iterator[ItemResult]:
+        "Yield completed results until at most `until` futures are pending"
+        while len(pending) > until:
+            if self._completion == "ordered":
+                yield pending.popleft().result()
+                continue
+            finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in finished:
+                pending.remove(future)
+                yield future.result()
+
+    def evaluate_item(
+        self,
+        item: EvaluationItem,
+        metrics: Sequence[ConfusionMetric],
+        model_name: str,
+        version: Optional[VersionSpec] = None,
+        parameters: Optional[Dict[str, Any]] = None,
+    ) -> ItemResult:
+        "Run inference on one item and accumulate its metrics tile by tile"
+        req = InferenceRequest(
+            model_name=model_name,
+            version=version or VersionSpec(),
+            input_uri=item.input_uri,
+            parameters=dict(parameters or {}),
+        )
+        response = self._engine.execute(req)
+        prediction = response.output.prediction
+        truth = load_array_from_uri(item.truth_uri, self._dm)
+        if tuple(truth.shape[-2:]) != tuple(prediction.shape[-2:]):
+            raise DataAccessError(
+                f"Ground truth {item.truth_uri} has shape {truth.shape}; "
+                f"prediction has {prediction.shape}"
+            )
+        height, width = prediction.shape[-2:]
+        accumulator = accumulate_tiles(
+            MetricAccumulator(metrics),
+            prediction,
+            truth,
+            iter_windows(height, width, self._tile_shape),
+        )
+        return ItemResult(accumulator, response.version)
+
+    def _report(
+        self,
+        progress: EvaluationProgress,
+        on_progress: Optional[Callable[[EvaluationProgress], None]],
+    ) -> None:
+        if self._logger is not None:
+            self._logger.info(
+                "evaluation progress=%d/%d items_per_s=%.2f pixels_per_s=%.0f",
+                progress.done,
+                progress.total,
+                progress.items_per_s,
+                progress.pixels_per_s,
+            )
+        if on_progress is not None:
+            on_progress(progress)
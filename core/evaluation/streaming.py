@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+from typing import Dict, Hashable, Iterable, Iterator, Tuple, Union
+
+import numpy as np
+from core.data_manager.raster_store import ChunkedRasterStore
+from core.data_manager.windows import Window
+from core.evaluation.basic_metrics import ConfusionMetric, check_unique_names
+from core.evaluation.confusion import ConfusionMatrix
+from core.evaluation.metrics import MetricResult
+from core.models.contracts import ModelOutput
+
+# A full array (possibly np.memmap) or a chunked raster store on disk
+RasterSource = Union[np.ndarray, ChunkedRasterStore]
+
+DEFAULT_TILE_SHAPE = (1024, 1024)
+
+
+class MetricAccumulator:
+    """
+    Accumulates confusion counts of a metric set tile by tile.
+    - update(chunk_pred, chunk_true) adds one tile (pixels are counted once)
+    - merge(other) combines accumulators built by different workers
+    - finalize() derives the metrics; since counts are integers, the result
+      is bit-identical to compute() on the full arrays
+    """
+
+    def __init__(self, metrics: Iterable[ConfusionMetric]) -> None:
+        self._metrics = check_unique_names(metrics)
+        self._by_key: Dict[Hashable, ConfusionMetric] = {}
+        for metric in self._metrics:
+            if not isinstance(metric, ConfusionMetric):
+                raise ValueError(f"Metric {metric.name!r} cannot be accumulated")
+            self._by_key.setdefault(metric.config_key, metric)
+        self._confusions = {
+            key: ConfusionMatrix.empty(metric.num_classes)
+            for key, metric in self._by_key.items()
+        }
+        self.pixels = 0
+
+    def update(
+        self, chunk_pred: Union[ModelOutput, np.ndarray], chunk_true: np.ndarray
+    ) -> None:
+        pred = (
+            chunk_pred.prediction if isinstance(chunk_pred, ModelOutput) else chunk_pred
+        )
+        true = np.asarray(chunk_true)
+        for key, metric in self._by_key.items():
+            self._confusions[key] = self._confusions[key] + metric.count(pred, true)
+        self.pixels += int(true.size)
+
+    def merge(self, other: "MetricAccumulator") -> "MetricAccumulator":
+        if self._confusions.keys() != other._confusions.keys():
+            raise ValueError("Cannot merge accumulators of different metric sets")
+        for key, cm in other._confusions.items():
+            self._confusions[key] = self._confusions[key] + cm
+        self.pixels += other.pixels
+        return self
+
+    def finalize(self) -> Dict[str, MetricResult]:
+        return {
+            metric.name: metric.from_confusion(self._confusions[metric.config_key])
+            for metric in self._metrics
+        }
+
+
+def iter_windows(
+    height: int, width: int, tile_shape: Tuple[int, int] = DEFAULT_TILE_SHAPE
+) -> Iterator[Window]:
+    "Row-major tiles covering a height x width raster"
+    rows, cols = tile_shape
+    for row_off in range(0, height, rows):
+        for col_off in range(0, width, cols):
+            yield Window(row_off, col_off, rows, cols).clip(height, width)
+
+
+def read_tile(source: RasterSource, window: Window) -> np.ndarray:
+    "Tile of an in-memory/memory-mapped array or of a chunked raster store"
+    if isinstance(source, ChunkedRasterStore):
+        return source.read_window(window)
+    return np.asarray(source[(Ellipsis,) + window.slices()])
+
+
+def accumulate_tiles(
+    accumulator: MetricAccumulator,
+    y_pred: RasterSource,
+    y_true: RasterSource,
+    windows: Iterable[Window],
+) -> MetricAccumulator:
+    "Feed the given windows of both rasters to accumulator"
+    for window in windows:
+        accumulator.update(read_tile(y_pred, window), read_tile(y_true, window))
+    return accumulator
+
+
+def evaluate_tiled(
+    metrics: Iterable[ConfusionMetric],
+    y_pred: RasterSource,
+    y_true: RasterSource,
+    tile_shape: Tuple[int, int] = DEFAULT_TILE_SHAPE,
+) -> Dict[str, MetricResult]:
+    """
+    Evaluate a metric set over two large rasters with memory bounded by one
+    tile of each. Store-backed predictions are read along their chunk grid.
+    """
+    height, width = y_pred.shape[-2:]
+    if tuple(y_true.shape[-2:]) != (height, width):
+        raise ValueError(
+            f"Shape mismatch: y_true {y_true.shape} vs y_pred {y_pred.shape}"
+        )
+    if isinstance(y_pred, ChunkedRasterStore):
+        windows: Iterable[Window] = y_pred.iter_chunk_windows()
+    else:
+        windows = iter_windows(height, width, tile_shape)
+    return accumulate_tiles(
+        MetricAccumulator(metrics), y_pred, y_true, windows
+    ).finalize()
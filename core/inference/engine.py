@@ -12,6 +12,7 @@ from core.common.exceptions import (
 from core.data_manager.base import BaseDataManager
 from core.logging.logger import Logger
 from core.models.registry import ModelRegistry
+from core.inference.input_cache import DecodedInputCache
 from core.inference.io import load_input_from_request
 from core.inference.providers import BaseModelProvider
 from core.inference.schemas import InferenceRequest, InferenceResponse, TraceEvent
@@ -23,6 +24,7 @@ class InferenceContext:
     model_provider: BaseModelProvider
     data_manager: BaseDataManager
     logger: Logger
+    input_cache: Optional[DecodedInputCache] = None
 
 
 class InferenceEngine:
@@ -98,7 +100,11 @@ class InferenceEngine:
     ) -> Any:
         s = perf_counter()
         try:
-            x = load_input_from_request(req=req, data_manager=self._ctx.data_manager)
+            x = load_input_from_request(
+                req=req,
+                data_manager=self._ctx.data_manager,
+                input_cache=self._ctx.input_cache,
+            )
             self._log_event("load_input", s, trace_id, req, events)
             return x
         except Exception as e:
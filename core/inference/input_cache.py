@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from pathlib import Path
+from typing import Callable, Optional
+
+import numpy as np
+from core.data_manager.cache import LRUCache
+from core.data_manager.disk_cache import DiskCache
+from core.models.contracts import ModelInput, SpatialMetadata
+
+_DATA_FILE = "data.npy"
+_META_FILE = "meta.json"
+
+
+class DecodedInputCache:
+    """
+    Two-tier cache for decoded ModelInput objects.
+    - memory tier: a (shared) LRUCache holding ready ModelInput objects
+    - disk tier: data.npy + meta.json per entry, read back memory-mapped
+    Entries are keyed by (path, mtime, size), so editing the source file
+    naturally misses; stale versions of the same path are dropped on refill.
+    Inputs whose arrays are already memory-mapped from storage, and inputs the
+    loader declines (None), bypass both tiers.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Path,
+        max_disk_bytes: int,
+        memory: Optional[LRUCache] = None,
+    ) -> None:
+        self._disk = DiskCache(cache_dir, max_bytes=max_disk_bytes)
+        self._memory = memory if memory is not None else LRUCache()
+
+    @property
+    def disk(self) -> DiskCache:
+        return self._disk
+
+    def get_or_load(
+        self, path: Path, loader: Callable[[], Optional[ModelInput]]
+    ) -> Optional[ModelInput]:
+        """
+        Return the decoded input for path, decoding it with loader on a miss.
+        A loader returning None marks the input as not cacheable; None is
+        passed through and nothing is stored.
+        """
+        path = path.resolve()
+        path_key = hashlib.sha1(str(path).encode("utf-8")).hexdigest()[:16]
+        st = path.stat()
+        key = f"{path_key}-{st.st_mtime_ns:x}-{st.st_size:x}"
+
+        return self._memory.get_or_compute(
+            ("decoded_input", key),
+            lambda: self._load_from_disk(key) or self._fill(key, path_key, loader),
+            admit=self._is_decoded,
+        )
+
+    def _is_decoded(self, x: Optional[ModelInput]) -> bool:
+        "False when the data is a live memory map of a source file"
+        if x is None:
+            return False
+        if not isinstance(x.data, np.memmap):
+            return True
+        filename = getattr(x.data, "filename", None)
+        return filename is not None and self._disk.root.resolve() in (
+            Path(filename).resolve().parents
+        )
+
+    def _load_from_disk(self, key: str) -> Optional[ModelInput]:
+        entry = self._disk.lookup(key)
+        if entry is None:
+            return None
+        try:
+            meta = json.loads((entry / _META_FILE).read_text(encoding="utf-8"))
+            data = np.load(entry / _DATA_FILE, mmap_mode="r")
+        except (OSError, ValueError):
+            # Half-deleted or corrupt entry: treat as a miss and rebuild it
+            self._disk.discard(key)
+            return None
+        spatial = meta["spatial"]
+        return ModelInput(
+            data=data,
+            bands=list(meta["bands"]),
+            spatial=SpatialMetadata(
+                crs=spatial["crs"],
+                bbox=tuple(spatial["bbox"]),
+                resolution=float(spatial["resolution"]),
+            ),
+            extra=meta.get("extra"),
+            scale=meta.get("scale"),
+            offset=meta.get("offset"),
+        )
+
+    def _fill(
+        self, key: str, path_key: str, loader: Callable[[], Optional[ModelInput]]
+    ) -> Optional[ModelInput]:
+        x = loader()
+        if x is None or not self._is_decoded(x):
+            # Not cacheable, or already backed by binary storage; no copy needed
+            return x
+        meta = {
+            "bands": list(x.bands),
+            "spatial": {
+                "crs": x.spatial.crs,
+                "bbox": list(x.spatial.bbox),
+                "resolution": x.spatial.resolution,
+            },
+            "extra": x.extra,
+            "scale": x.scale,
+            "offset": x.offset,
+        }
+        try:
+            meta_text = json.dumps(meta, ensure_ascii=False)
+        except (TypeError, ValueError):
+            # Not representable on disk; keep the memory tier only
+            return x
+
+        def write(entry: Path) -> None:
+            np.save(entry / _DATA_FILE, np.ascontiguousarray(x.data))
+            (entry / _META_FILE).write_text(meta_text, encoding="utf-8")
+
+        self._disk.discard_prefix(f"{path_key}-", keep=key)
+        self._disk.store(key, write)
+        return x
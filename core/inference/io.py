@@ -1,58 +1,256 @@
 from __future__ import annotations
 import json
+import math
+from dataclasses import dataclass, replace
 from pathlib import Path
-from typing import Any, Dict
-from urllib.parse import urlparse
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from urllib.parse import ParseResult, urlparse
 import numpy as np
 from core.common.exceptions import DataAccessError
-from core.data_manager.base import BaseDataManager
+from core.data_manager.base import BaseDataManager, read_local_array
+from core.data_manager.raster_store import ChunkedRasterStore
+from core.data_manager.windows import Window, read_subset
 from core.models.contracts import ModelInput, SpatialMetadata
+from core.inference.input_cache import DecodedInputCache
+from core.inference.json_stream import load_json_payload
 from core.inference.schemas import InferenceRequest
 from urllib.request import url2pathname
 
+# JSON inputs at least this large are parsed with the streaming loader
+STREAMING_JSON_MIN_BYTES = 8 * 1024 * 1024
+
 
 def load_input_from_request(
-    req: InferenceRequest, data_manager: BaseDataManager
+    req: InferenceRequest,
+    data_manager: BaseDataManager,
+    input_cache: Optional[DecodedInputCache] = None,
 ) -> ModelInput:
     "Load/convert the request input into a standardized ModelInput"
+    subset = InputSubset.from_parameters(req.parameters)
     if req.input_payload is not None:
-        return payload_to_model_input(req.input_payload)
+        return payload_to_model_input(req.input_payload, subset, data_manager)
 
     if req.input_uri is None:
         raise DataAccessError("No input_uri provided.")
 
-    payload = load_payload_from_uri(req.input_uri, data_manager=data_manager)
-    return payload_to_model_input(payload)
+    uri = req.input_uri
+
+    def decode(sub: Optional[InputSubset]) -> ModelInput:
+        payload = load_payload_from_uri(uri, data_manager=data_manager)
+        return payload_to_model_input(payload, sub, data_manager)
+
+    local_path = _local_input_path(uri, data_manager)
+    if local_path is not None and ChunkedRasterStore.is_store(local_path):
+        # Chunked stores are already tiled binary data: read just the window
+        return load_raster_input(ChunkedRasterStore.open(local_path), subset)
+    if input_cache is not None and local_path is not None and local_path.is_file():
+        return _load_cached_input(uri, local_path, subset, data_manager, input_cache)
+    return decode(subset)
+
+
+def _load_cached_input(
+    uri: str,
+    local_path: Path,
+    subset: Optional[InputSubset],
+    data_manager: BaseDataManager,
+    input_cache: DecodedInputCache,
+) -> ModelInput:
+    """
+    Inline payloads are decoded once in full and cached; subsets are then cut
+    from the memory-mapped entry, touching only the pages they need.
+    data_ref payloads bypass the cache: their storage already reads just the
+    subset, and an entry keyed on the JSON file would outlive the array.
+    """
+    ref_payloads: List[Dict[str, Any]] = []
+
+    def decode_inline() -> Optional[ModelInput]:
+        payload = load_payload_from_uri(uri, data_manager=data_manager)
+        if payload.get("data_ref"):
+            ref_payloads.append(payload)
+            return None
+        return payload_to_model_input(payload, None, data_manager)
+
+    x = input_cache.get_or_load(local_path, decode_inline)
+    if x is None:
+        payload = ref_payloads[0] if ref_payloads else None
+        if payload is None:
+            payload = load_payload_from_uri(uri, data_manager=data_manager)
+        return payload_to_model_input(payload, subset, data_manager)
+    return apply_subset(x, subset) if subset is not None else x
+
+
+@dataclass(frozen=True)
+class InputSubset:
+    """
+    Band and pixel subset requested via InferenceRequest.parameters:
+    - "bands": band names to keep (in the requested order)
+    - "window": [row_off, col_off, height, width] in pixels
+    - "bbox": [minx, miny, maxx, maxy] in the input CRS (used if no window)
+    """
+
+    bands: Optional[Tuple[str, ...]] = None
+    window: Optional[Window] = None
+    bbox: Optional[Tuple[float, float, float, float]] = None
+
+    @classmethod
+    def from_parameters(cls, params: Dict[str, Any]) -> Optional["InputSubset"]:
+        bands, window, bbox = (params or {}).get("bands"), None, None
+        try:
+            raw_window = (params or {}).get("window")
+            if isinstance(raw_window, dict):
+                window = Window(**{k: int(v) for k, v in raw_window.items()})
+            elif raw_window is not None:
+                window = Window(*(int(v) for v in raw_window))
+            raw_bbox = (params or {}).get("bbox")
+            if raw_bbox is not None:
+                minx, miny, maxx, maxy = (float(v) for v in raw_bbox)
+                bbox = (minx, miny, maxx, maxy)
+        except (TypeError, ValueError) as e:
+            raise DataAccessError(f"Invalid window/bbox parameters: {e}") from e
+        if bands is None and window is None and bbox is None:
+            return None
+        return cls(
+            bands=tuple(str(b) for b in bands) if bands is not None else None,
+            window=window,
+            bbox=bbox,
+        )
+
+    def resolve(
+        self, bands: Sequence[str], spatial: SpatialMetadata
+    ) -> Tuple[Optional[List[int]], Optional[Window]]:
+        "Band indices and pixel window of this subset for a concrete input"
+        band_idx = None
+        if self.bands is not None:
+            missing = [b for b in self.bands if b not in bands]
+            if missing:
+                raise DataAccessError(f"Requested bands not in input: {missing}")
+            band_idx = [list(bands).index(b) for b in self.bands]
+        window = self.window
+        if window is None and self.bbox is not None:
+            window = bbox_to_window(spatial, self.bbox)
+        return band_idx, window
+
+
+def load_raster_input(
+    store: ChunkedRasterStore, subset: Optional[InputSubset] = None
+) -> ModelInput:
+    "Read a ModelInput (or a band/window subset of it) from a chunked store"
+    header = store.header
+    if header.bands is None or header.spatial is None:
+        raise DataAccessError(
+            f"Raster store lacks bands/spatial metadata: {store.root}"
+        )
+    spatial = SpatialMetadata(
+        crs=str(header.spatial["crs"]),
+        bbox=tuple(header.spatial["bbox"]),
+        resolution=float(header.spatial["resolution"]),
+    )
+    band_idx, window = subset.resolve(header.bands, spatial) if subset else (None, None)
+    data = store.read_window(window, bands=band_idx)
+    x = ModelInput(data=data, bands=list(header.bands), spatial=spatial)
+    if subset is None:
+        return x
+    return _subset_input(x, data, band_idx, window)
+
+
+def bbox_to_window(
+    spatial: SpatialMetadata, bbox: Tuple[float, float, float, float]
+) -> Window:
+    "Pixel window covering bbox, using the input bbox origin and resolution"
+    minx, _, _, maxy = spatial.bbox
+    res = spatial.resolution
+    col_start = max(0, math.floor((bbox[0] - minx) / res))
+    col_stop = max(col_start, math.ceil((bbox[2] - minx) / res))
+    row_start = max(0, math.floor((maxy - bbox[3]) / res))
+    row_stop = max(row_start, math.ceil((maxy - bbox[1]) / res))
+    return Window(row_start, col_start, row_stop - row_start, col_stop - col_start)
+
+
+def window_bbox(
+    spatial: SpatialMetadata, window: Window
+) -> Tuple[float, float, float, float]:
+    "Geographic bbox of a pixel window"
+    minx, _, _, maxy = spatial.bbox
+    res = spatial.resolution
+    return (
+        minx + window.col_off * res,
+        maxy - (window.row_off + window.height) * res,
+        minx + (window.col_off + window.width) * res,
+        maxy - window.row_off * res,
+    )
+
+
+def apply_subset(x: ModelInput, subset: InputSubset) -> ModelInput:
+    "Copy only the requested bands/window of x into a new ModelInput"
+    band_idx, window = subset.resolve(x.bands, x.spatial)
+    _, height, width = x.data.shape
+    if window is not None:
+        window = window.clip(height, width)
+    data = read_subset(x.data, bands=band_idx, window=window)
+    return _subset_input(x, data, band_idx, window)
+
+
+def _subset_input(
+    x: ModelInput,
+    data: np.ndarray,
+    band_idx: Optional[List[int]],
+    window: Optional[Window],
+) -> ModelInput:
+    if data.size == 0:
+        raise DataAccessError("Requested window/bbox does not overlap the input.")
+    bands = [x.bands[i] for i in band_idx] if band_idx is not None else x.bands
+    spatial = x.spatial
+    if window is not None:
+        effective = Window(window.row_off, window.col_off, *data.shape[1:])
+        spatial = replace(spatial, bbox=window_bbox(spatial, effective))
+    return replace(x, data=data, bands=list(bands), spatial=spatial)
+
+
+def _local_input_path(uri: str, data_manager: BaseDataManager) -> Optional[Path]:
+    "Filesystem path behind a file:// or data_root-relative URI (None otherwise)"
+    parsed = urlparse(uri)
+    if parsed.scheme == "file":
+        return _file_uri_to_path(parsed)
+    if parsed.scheme == "":
+        try:
+            return data_manager.local_path(uri)
+        except Exception:
+            return None
+    return None
+
+
+def _file_uri_to_path(parsed: ParseResult) -> Path:
+    # Windows-safe conversion: file:///C:/... -> C:\...
+    raw_path = url2pathname(parsed.path)
+    # On Windows, urlparse gives "/C:/..." so remove the leading slash
+    if raw_path.startswith("\\") and len(raw_path) > 3 and raw_path[2] == ":":
+        raw_path = raw_path.lstrip("\\")
+    return Path(raw_path)
 
 
 def load_payload_from_uri(uri: str, data_manager: BaseDataManager) -> Dict[str, Any]:
-    "Load a JSON payload from either file:// or a relative path under data_root"
+    "Load a JSON payload from file://, s3:// or a relative path under data_root"
     parsed = urlparse(uri)
 
     # absolute path
     if parsed.scheme == "file":
-        # Windows-safe conversion: file:///C:/... -> C:\...
-        raw_path = url2pathname(parsed.path)
-        # On Windows, urlparse gives "/C:/..." so remove the leading slash
-        if raw_path.startswith("\\") and len(raw_path) > 3 and raw_path[2] == ":":
-            raw_path = raw_path.lstrip("\\")
-        path = Path(raw_path)
-        if not path.exists():
-            raise DataAccessError(f"Input file not found: {path}")
-        if path.suffix.lower() != ".json":
-            raise DataAccessError(
-                f"Only JSON inputs are supported for file:// URIs (got: {path.suffix})"
-            )
-        try:
-            return json.loads(path.read_text(encoding="utf-8"))
-        except Exception as e:
-            raise DataAccessError(f"Failed to parse JSON input file: {path}") from e
+        return _load_json_file(_file_uri_to_path(parsed))
+
+    # Object store URIs are served by a data manager that owns the bucket
+    if parsed.scheme == "s3":
+        key = data_manager.key_for_uri(uri)
+        if key is None:
+            raise DataAccessError(f"No data manager configured for {uri}")
+        uri, parsed = key, urlparse(key)
 
     # No scheme -> treat as relative path in data_root
     if parsed.scheme == "":
         rel = uri
         if not data_manager.exists(rel):
             raise DataAccessError(f"Input not found under data_root: {rel}")
+        path = data_manager.local_path(rel)
+        if path is not None and path.suffix.lower() == ".json" and path.is_file():
+            return _load_json_file(path)
         data = data_manager.load(rel)
         if not isinstance(data, dict):
             raise DataAccessError(
@@ -62,26 +260,153 @@ def load_payload_from_uri(uri: str, data_manager: BaseDataManager) -> Dict[str,
     raise DataAccessError(f"Unsupported input_uri scheme: {parsed.scheme}")
 
 
-def payload_to_model_input(payload: Dict[str, Any]) -> ModelInput:
-    "Convert a JSON-like payload into ModelInput"
+def load_array_from_uri(uri: str, data_manager: BaseDataManager) -> np.ndarray:
+    """
+    Load a bare array (e.g. a ground-truth mask) from a .npy file, a chunked
+    raster store or a JSON payload's "data" field.
+    .npy arrays come back memory-mapped and stores as (C, H, W).
+    """
+    parsed = urlparse(uri)
+    if parsed.scheme == "s3":
+        key = data_manager.key_for_uri(uri)
+        if key is None:
+            raise DataAccessError(f"No data manager configured for {uri}")
+        parsed = urlparse(key)
+    if parsed.scheme in ("", "file") and not parsed.path.lower().endswith(".json"):
+        return _read_array(uri, parsed, data_manager)
+    payload = load_payload_from_uri(uri, data_manager)
+    if "data" not in payload:
+        raise DataAccessError(f"No 'data' array in payload: {uri}")
+    return _payload_array(payload)
+
+
+def _read_array(
+    uri: str, parsed: ParseResult, data_manager: BaseDataManager
+) -> np.ndarray:
+    # file:// paths are read in place; everything else goes through the
+    # manager so remote backends serve it with ranged reads
+    if parsed.scheme == "file":
+        path = _file_uri_to_path(parsed)
+        found = path.exists()
+    else:
+        found = data_manager.exists(parsed.path)
+    if not found:
+        raise DataAccessError(f"Array not found: {uri}")
     try:
-        data = np.asarray(payload["data"], dtype=np.float32)
-        bands = list(payload["bands"])
-        spatial_raw = payload["spatial"]
-        spatial = SpatialMetadata(
-            crs=str(spatial_raw["crs"]),
-            bbox=tuple(spatial_raw["bbox"]),
-            resolution=float(spatial_raw["resolution"]),
+        if parsed.scheme == "file":
+            return read_local_array(path)
+        return data_manager.read_array(parsed.path)
+    except DataAccessError:
+        raise
+    except Exception as e:
+        raise DataAccessError(f"Failed to read array: {uri}") from e
+
+
+def _load_json_file(path: Path) -> Dict[str, Any]:
+    if not path.exists():
+        raise DataAccessError(f"Input file not found: {path}")
+    if path.suffix.lower() != ".json":
+        raise DataAccessError(
+            f"Only JSON inputs are supported for file:// URIs (got: {path.suffix})"
+        )
+    try:
+        if path.stat().st_size >= STREAMING_JSON_MIN_BYTES:
+            # Large payloads: parse the array straight into a float32 buffer
+            payload = load_json_payload(path)
+        else:
+            payload = json.loads(path.read_bytes())
+    except DataAccessError:
+        raise
+    except Exception as e:
+        raise DataAccessError(f"Failed to parse JSON input file: {path}") from e
+    if not isinstance(payload, dict):
+        raise DataAccessError(
+            f"Expected JSON object at {path}, got: {type(payload).__name__}"
         )
-        extra = payload.get("extra")
+    return payload
+
+
+def payload_to_model_input(
+    payload: Dict[str, Any],
+    subset: Optional[InputSubset] = None,
+    data_manager: Optional[BaseDataManager] = None,
+) -> ModelInput:
+    """
+    Convert a JSON-like payload into ModelInput.
+    The array is either inline ("data") or a (C,H,W) .npy under the data
+    manager ("data_ref"); for data_ref the subset is read without loading
+    the rest of the array. The storage dtype is kept ("dtype" field for
+    inline data) and optional "scale"/"offset" describe physical values.
+    """
+    try:
+        data_ref = payload.get("data_ref")
+        data = None if data_ref else _payload_array(payload)
+        spatial_raw = payload["spatial"]
+        meta: Dict[str, Any] = {
+            "bands": list(payload["bands"]),
+            "spatial": SpatialMetadata(
+                crs=str(spatial_raw["crs"]),
+                bbox=tuple(spatial_raw["bbox"]),
+                resolution=float(spatial_raw["resolution"]),
+            ),
+            "extra": payload.get("extra"),
+            "scale": _optional_float(payload.get("scale")),
+            "offset": _optional_float(payload.get("offset")),
+        }
     except KeyError as e:
         raise DataAccessError(f"Missing required payload field: {e}") from e
     except Exception as e:
         raise DataAccessError("Invalid input payload structure.") from e
 
-    # Expect data shaped (C, H, W); accept (H, W, C) and transpose
-    if data.ndim == 3 and data.shape[0] != len(bands) and data.shape[-1] == len(bands):
+    if data is None:
+        return _load_referenced_input(str(data_ref), meta, subset, data_manager)
+
+    # Expect data shaped (C, H, W); accept (H, W, C) as a transposed view
+    n_bands = len(meta["bands"])
+    if data.ndim == 3 and data.shape[0] != n_bands and data.shape[-1] == n_bands:
         data = np.transpose(data, (2, 0, 1))
     if data.ndim != 3:
         raise DataAccessError(f"Input data must be 3D (C,H,W); got shape={data.shape}")
-    return ModelInput(data=data, bands=bands, spatial=spatial, extra=extra)
+    x = ModelInput(data=data, **meta)
+    return apply_subset(x, subset) if subset is not None else x
+
+
+def _payload_array(payload: Dict[str, Any]) -> np.ndarray:
+    """
+    Inline payload array in its storage dtype: the payload "dtype" field,
+    the dtype of an already decoded array, or float32 for plain JSON lists.
+    """
+    raw = payload["data"]
+    dtype = payload.get("dtype")
+    if dtype is None:
+        dtype = raw.dtype if isinstance(raw, np.ndarray) else np.float32
+    return np.asarray(raw, dtype=np.dtype(dtype))
+
+
+def _optional_float(value: Any) -> Optional[float]:
+    return None if value is None else float(value)
+
+
+def _load_referenced_input(
+    data_ref: str,
+    meta: Dict[str, Any],
+    subset: Optional[InputSubset],
+    data_manager: Optional[BaseDataManager],
+) -> ModelInput:
+    if data_manager is None:
+        raise DataAccessError("data_ref payloads require a data manager.")
+    band_idx, window = (
+        subset.resolve(meta["bands"], meta["spatial"]) if subset else (None, None)
+    )
+    try:
+        data = data_manager.read_array(data_ref, bands=band_idx, window=window)
+    except DataAccessError:
+        raise
+    except Exception as e:
+        raise DataAccessError(f"Failed to read input array: {data_ref}") from e
+    if data.ndim != 3:
+        raise DataAccessError(f"Input data must be 3D (C,H,W); got shape={data.shape}")
+    x = ModelInput(data=data, **meta)
+    if subset is None:
+        return x
+    return _subset_input(x, data, band_idx, window)
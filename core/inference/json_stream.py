@@ -0,0 +1,251 @@
+from __future__ import annotations
+
+import json
+import warnings
+from pathlib import Path
+from typing import IO, Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from core.common.exceptions import DataAccessError
+
+CHUNK_SIZE = 1024 * 1024
+# Brackets and commas of the numeric array become whitespace for np.fromstring
+_SEPARATORS = bytes.maketrans(b"[],\r\n\t", b"      ")
+_WS = b" \t\r\n"
+_OPEN, _CLOSE, _COMMA = ord("["), ord("]"), ord(",")
+_QUOTE, _BACKSLASH = ord('"'), ord("\\")
+_SCALAR_END = b",}]" + _WS
+
+
+def load_json_payload(
+    path: Path, array_key: str = "data", chunk_size: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Load a JSON object whose array_key holds a large nested numeric array.
+    The array is parsed chunk by chunk straight into a preallocated ndarray
+    (float32 unless the payload has a "dtype" field), so peak memory is that
+    array plus a few chunk-sized buffers.
+    The shape comes from a "shape" field that precedes the array or, if
+    there is none, from a first vectorized pass over its brackets.
+    Other fields are small and are decoded with the json module.
+    """
+    chunk_size = chunk_size or CHUNK_SIZE
+    with path.open("rb") as f:
+        reader = _Reader(f, chunk_size)
+        fields, data_offset = _parse_object(reader, array_key)
+        if data_offset is None:
+            return fields
+
+        shape = fields.pop("__shape__", None)
+        if shape is None:
+            raise DataAccessError(f"Could not determine array shape in {path}")
+        out = np.empty(shape, dtype=np.dtype(fields.get("dtype") or np.float32))
+        f.seek(data_offset)
+        _fill_array(_Reader(f, chunk_size), out, path)
+    fields[array_key] = out
+    return fields
+
+
+class _Reader:
+    "Buffered byte reader with single-byte lookahead and absolute offsets"
+
+    def __init__(self, f: IO[bytes], chunk_size: int) -> None:
+        self._f = f
+        self._chunk_size = chunk_size
+        self._buf = b""
+        self._pos = 0
+        self._base = f.tell()
+
+    @property
+    def offset(self) -> int:
+        return self._base + self._pos
+
+    def peek(self) -> int:
+        if self._pos >= len(self._buf) and not self._refill():
+            return -1
+        return self._buf[self._pos]
+
+    def next(self) -> int:
+        b = self.peek()
+        self._pos += 1
+        return b
+
+    def skip_ws(self) -> int:
+        while True:
+            b = self.peek()
+            if b == -1 or b not in _WS:
+                return b
+            self._pos += 1
+
+    def expect(self, char: bytes) -> None:
+        if self.skip_ws() != char[0]:
+            raise DataAccessError(f"Malformed JSON: expected {char!r} at {self.offset}")
+        self._pos += 1
+
+    def take_chunk(self) -> bytes:
+        "Remaining buffered bytes (or the next chunk) in one piece"
+        if self._pos >= len(self._buf) and not self._refill():
+            return b""
+        chunk = self._buf[self._pos :]
+        self._pos = len(self._buf)
+        return chunk
+
+    def unread(self, count: int) -> None:
+        self._pos -= count
+
+    def _refill(self) -> bool:
+        self._base += len(self._buf)
+        self._buf = self._f.read(self._chunk_size)
+        self._pos = 0
+        return bool(self._buf)
+
+
+def _parse_object(
+    reader: _Reader, array_key: str
+) -> Tuple[Dict[str, Any], Optional[int]]:
+    "Decode the top-level object, skipping over (and measuring) the array"
+    fields: Dict[str, Any] = {}
+    data_offset = None
+    reader.expect(b"{")
+    if reader.skip_ws() == ord("}"):
+        reader.next()
+        return fields, None
+    while True:
+        key = json.loads(_raw_value(reader))
+        reader.expect(b":")
+        if key == array_key and reader.skip_ws() == _OPEN:
+            data_offset = reader.offset
+            shape = fields.get("shape")
+            fields["__shape__"] = (
+                tuple(int(v) for v in shape) if shape else _measure_array(reader)
+            )
+            if shape:
+                _skip_array(reader)
+        else:
+            fields[key] = json.loads(_raw_value(reader))
+        sep = reader.skip_ws()
+        reader.next()
+        if sep == ord("}"):
+            return fields, data_offset
+        if sep != _COMMA:
+            raise DataAccessError(f"Malformed JSON object at offset {reader.offset}")
+
+
+def _raw_value(reader: _Reader) -> bytes:
+    "Bytes of one (small) JSON value, tracking strings and nesting"
+    reader.skip_ws()
+    out = bytearray()
+    depth = 0
+    while True:
+        b = reader.peek()
+        if b == -1:
+            raise DataAccessError("Unexpected end of JSON input")
+        if depth == 0 and out and b in _SCALAR_END:
+            return bytes(out)  # end of a number/literal
+        out.append(reader.next())
+        if b == _QUOTE:
+            _read_string_tail(reader, out)
+        elif b in b"[{":
+            depth += 1
+        elif b in b"]}":
+            depth -= 1
+        if depth == 0 and b in b'"]}':
+            return bytes(out)
+
+
+def _read_string_tail(reader: _Reader, out: bytearray) -> None:
+    "Append the rest of a string (after its opening quote) to out"
+    while True:
+        b = reader.next()
+        if b == -1:
+            raise DataAccessError("Unterminated JSON string")
+        out.append(b)
+        if b == _BACKSLASH:
+            out.append(reader.next())
+        elif b == _QUOTE:
+            return
+
+
+def _scan_array(reader: _Reader, visit) -> None:
+    "Feed chunks of the array (up to its closing bracket) to visit(arr, depth0)"
+    depth = 0
+    while True:
+        chunk = reader.take_chunk()
+        if not chunk:
+            raise DataAccessError("Unexpected end of JSON array")
+        arr = np.frombuffer(chunk, dtype=np.uint8)
+        delta = (arr == _OPEN).view(np.int8) - (arr == _CLOSE).view(np.int8)
+        depths = np.cumsum(delta, dtype=np.int16)
+        depths += depth
+        closed = np.flatnonzero(depths == 0)
+        if closed.size:
+            end = int(closed[0]) + 1
+            visit(arr[:end], depths[:end])
+            reader.unread(len(chunk) - end)
+            return
+        visit(arr, depths)
+        depth = int(depths[-1])
+
+
+def _skip_array(reader: _Reader) -> None:
+    _scan_array(reader, lambda arr, depths: None)
+
+
+def _measure_array(reader: _Reader) -> Tuple[int, ...]:
+    """
+    Shape of a rectangular nested array from bracket and comma counts:
+    opens[d] = prod(shape[:d]) and items = commas at the deepest level
+    plus the number of innermost arrays.
+    """
+    opens: List[int] = []
+    commas: List[int] = []
+
+    def visit(arr: np.ndarray, depths: np.ndarray) -> None:
+        for counts, mask in ((opens, arr == _OPEN), (commas, arr == _COMMA)):
+            hist = np.bincount(depths[mask])
+            counts.extend([0] * (len(hist) - len(counts)))
+            for d, n in enumerate(hist):
+                counts[d] += int(n)
+
+    _scan_array(reader, visit)
+    ndim = len(opens) - 1
+    commas.extend([0] * (ndim + 1 - len(commas)))
+    dims = [opens[d + 1] // opens[d] for d in range(1, ndim)]
+    dims.append((commas[ndim] + opens[ndim]) // opens[ndim])
+    if int(np.prod(dims)) != commas[ndim] + opens[ndim]:
+        raise DataAccessError("Input array is ragged (not rectangular)")
+    return tuple(dims)
+
+
+def _fill_array(reader: _Reader, out: np.ndarray, path: Path) -> None:
+    "Tokenize numbers chunk by chunk into the flat view of out"
+    flat = out.reshape(-1)
+    pos = 0
+    carry = b""
+
+    def visit(arr: np.ndarray, depths: np.ndarray) -> None:
+        nonlocal pos, carry
+        text = carry + arr.tobytes().translate(_SEPARATORS)
+        cut = text.rfind(b" ") + 1
+        carry = text[cut:]
+        pos = _parse_numbers(text[:cut], flat, pos, path)
+
+    _scan_array(reader, visit)
+    pos = _parse_numbers(carry, flat, pos, path)
+    if pos != flat.size:
+        raise DataAccessError(f"Array in {path} has {pos} values; expected {flat.size}")
+
+
+def _parse_numbers(text: bytes, flat: np.ndarray, pos: int, path: Path) -> int:
+    if not text.strip():
+        return pos
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        try:
+            values = np.fromstring(text.decode("ascii"), dtype=flat.dtype, sep=" ")
+        except (ValueError, UnicodeDecodeError, DeprecationWarning) as e:
+            raise DataAccessError(f"Non-numeric values in array of {path}") from e
+    if pos + values.size > flat.size:
+        raise DataAccessError(f"Array in {path} is larger than its declared shape")
+    flat[pos : pos + values.size] = values
+    return pos + values.size
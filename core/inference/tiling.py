@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+from dataclasses import replace
+from pathlib import Path
+from typing import Optional, Tuple
+
+import numpy as np
+from core.data_manager.raster_store import (
+    ROLE_CONTINUOUS,
+    ChunkedRasterStore,
+    prediction_role,
+)
+from core.data_manager.windows import Window, read_subset
+from core.inference.io import window_bbox
+from core.models.base import BaseModel
+from core.models.contracts import ModelInput, ModelOutput, SpatialMetadata
+
+
+def predict_tiled(
+    model: BaseModel,
+    x: ModelInput,
+    root: Path,
+    tile_shape: Tuple[int, int] = (256, 256),
+    compression: Optional[str] = None,
+) -> ChunkedRasterStore:
+    """
+    Run model tile by tile over x and stream predictions into a chunked store.
+    Tiles follow the store chunk grid, so every write is a whole chunk and
+    only one tile of input and output is held in memory at a time (x.data
+    may be memory-mapped). Confidence, if produced, goes to aux/confidence.
+    """
+    _, height, width = x.data.shape
+    rows, cols = tile_shape
+    prediction: Optional[ChunkedRasterStore] = None
+    confidence: Optional[ChunkedRasterStore] = None
+
+    for row_off in range(0, height, rows):
+        for col_off in range(0, width, cols):
+            win = Window(row_off, col_off, rows, cols).clip(height, width)
+            y = model.predict(_tile_input(x, win))
+            if prediction is None:
+                prediction = _create_like(
+                    root,
+                    y.prediction,
+                    x,
+                    tile_shape,
+                    compression,
+                    prediction_role(y.prediction),
+                )
+                if y.confidence is not None:
+                    confidence = _create_like(
+                        root / "aux" / "confidence",
+                        y.confidence,
+                        x,
+                        tile_shape,
+                        compression,
+                        ROLE_CONTINUOUS,
+                    )
+            _write_tile(prediction, y.prediction, win)
+            if confidence is not None and y.confidence is not None:
+                _write_tile(confidence, y.confidence, win)
+
+    if prediction is None:
+        raise ValueError("Cannot run tiled inference on an empty input")
+    return prediction
+
+
+def read_output(store: ChunkedRasterStore) -> ModelOutput:
+    "Materialize a store written by predict_tiled as a ModelOutput"
+    aux = store.root / "aux" / "confidence"
+    spatial = store.header.spatial or {}
+    return ModelOutput(
+        prediction=store.read_window(),
+        spatial=SpatialMetadata(
+            crs=str(spatial.get("crs", "")),
+            bbox=tuple(spatial.get("bbox", (0.0, 0.0, 0.0, 0.0))),
+            resolution=float(spatial.get("resolution", 0.0)),
+        ),
+        confidence=(
+            ChunkedRasterStore.open(aux).read_window()
+            if ChunkedRasterStore.is_store(aux)
+            else None
+        ),
+    )
+
+
+def _tile_input(x: ModelInput, win: Window) -> ModelInput:
+    return replace(
+        x,
+        data=read_subset(x.data, window=win),
+        spatial=replace(x.spatial, bbox=window_bbox(x.spatial, win)),
+    )
+
+
+def _create_like(
+    root: Path,
+    sample: np.ndarray,
+    x: ModelInput,
+    tile_shape: Tuple[int, int],
+    compression: Optional[str],
+    role: str,
+) -> ChunkedRasterStore:
+    channels = 1 if sample.ndim == 2 else sample.shape[0]
+    _, height, width = x.data.shape
+    return ChunkedRasterStore.create(
+        root,
+        shape=(channels, height, width),
+        dtype=sample.dtype,
+        chunk_shape=tile_shape,
+        compression=compression,
+        spatial={
+            "crs": x.spatial.crs,
+            "bbox": list(x.spatial.bbox),
+            "resolution": x.spatial.resolution,
+        },
+        overwrite=True,
+        role=role,
+    )
+
+
+def _write_tile(store: ChunkedRasterStore, data: np.ndarray, win: Window) -> None:
+    if data.ndim == 2:
+        data = data[None]
+    if data.shape[1:] != (win.height, win.width):
+        raise ValueError(
+            f"Model output {data.shape[1:]} does not match tile "
+            f"{(win.height, win.width)}"
+        )
+    store.write_window(data, win.row_off, win.col_off)
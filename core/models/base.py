@@ -1,5 +1,6 @@
 from __future__ import annotations
 from abc import ABC, abstractmethod
+import numpy as np
 from core.models.metadata import ModelMetadata
 from core.models.contracts import ModelInput, ModelOutput
 
@@ -41,6 +42,14 @@ class BaseModel(ABC):
         self.on_after_predict(y)
         return y
 
+    def input_array(self, x: ModelInput) -> np.ndarray:
+        """
+        x.data in the dtype/layout declared by metadata (input_dtype,
+        input_layout); x.data itself when it already fits, else a new array
+        per call (nothing is kept on the input).
+        """
+        return x.as_array(self._metadata.input_dtype, self._metadata.input_layout)
+
     def release(self) -> None:
         "Release resources. Safe to call multiple times"
         if not self._is_loaded:
@@ -4,6 +4,8 @@ from dataclasses import dataclass
 from typing import Any, Dict, List, Optional, Tuple
 import numpy as np
 
+LAYOUTS = ("CHW", "HWC")
+
 
 @dataclass(frozen=True)
 class SpatialMetadata:
@@ -16,12 +18,42 @@ class SpatialMetadata:
 
 @dataclass(frozen=True)
 class ModelInput:
-    "Standardized input contract for all models"
+    """
+    Standardized input contract for all models
+    data keeps its storage dtype (e.g. uint16 reflectance); physical values
+    are data * scale + offset. Use as_array() for a model-ready array.
+    """
 
     data: np.ndarray  # shape: (C, H, W)
     bands: List[str]  # e.g. ["B02", "B03", "B04", "B08"]
     spatial: SpatialMetadata
     extra: Optional[Dict[str, Any]] = None
+    scale: Optional[float] = None
+    offset: Optional[float] = None
+
+    def as_array(self, dtype: Any = None, layout: str = "CHW") -> np.ndarray:
+        """
+        C-contiguous data in dtype and layout ("CHW" or "HWC").
+        scale/offset are applied when converting to a floating dtype.
+        Returns data itself when it already matches; otherwise a new array.
+        Conversions are not kept on the input: cached inputs are sized once,
+        so anything stored on them later would escape the cache budget.
+        """
+        if layout not in LAYOUTS:
+            raise ValueError(f"Unsupported layout: {layout}")
+        target = self.data.dtype if dtype is None else np.dtype(dtype)
+        rescale = target.kind == "f" and (self.scale, self.offset) != (None, None)
+        src = self.data if layout == "CHW" else np.moveaxis(self.data, 0, -1)
+        if src.dtype == target and not rescale and src.flags.c_contiguous:
+            return src
+        out = np.empty(src.shape, dtype=target)
+        out[...] = src  # single pass: cast + layout change into contiguous memory
+        if rescale:
+            if self.scale is not None:
+                out *= target.type(self.scale)
+            if self.offset is not None:
+                out += target.type(self.offset)
+        return out
 
 
 @dataclass(frozen=True)
@@ -35,5 +35,7 @@ class ModelMetadata:
     version: ModelVersion  # model version
     schema_version: str  # I/O contract version, e.g. "v1"
     artifact_uri: Optional[str] = None  # e.g. "s3://.../model.pt" or "file://..."
+    input_dtype: Optional[str] = None  # e.g. "float32"; None keeps the storage dtype
+    input_layout: str = "CHW"  # "CHW" or "HWC" (channels last)
     created_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
     extra: Dict[str, Any] = field(default_factory=dict)
@@ -1,9 +1,10 @@
 # Plugin execution engine (sync execution with a clean contract)
 
 from __future__ import annotations
+import threading
 from dataclasses import dataclass
 from typing import Any, Dict, Optional, Type
-from core.plugins.interface import BasePlugin
+from core.plugins.interface import BasePlugin, ProgressListener
 from core.plugins.registry import PluginRegistry
 from core.logging.logger import Logger
 
@@ -33,10 +34,17 @@ class PluginExecutor:
                 f"Failed to initialize plugin '{plugin_cls.__name__}': {exc}"
             ) from exc
 
-    def run(self, plugin_name: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+    def run(
+        self,
+        plugin_name: str,
+        payload: Dict[str, Any],
+        on_progress: Optional[ProgressListener] = None,
+    ) -> Dict[str, Any]:
         "Run plugin by name with payload and return raw result dict"
         plugin_cls = self.registry.get(plugin_name)
         plugin = self._create_instance(plugin_cls)
+        if on_progress is not None:
+            plugin.set_progress_listener(on_progress)
 
         self.logger.info(
             "Running plugin: %s (%s)",
@@ -66,25 +74,41 @@ class PluginExecutor:
         plugin_name: str,
         payload: Dict[str, Any],
         timeout_seconds: Optional[float] = None,
+        on_progress: Optional[ProgressListener] = None,
     ) -> Dict[str, Any]:
         """
         Run plugin with a timeout (best-effort).
         Uses a thread pool to enforce time limits for sync plugin code.
+        Returns as soon as the timeout expires. A thread cannot be killed, so
+        the plugin is stopped cooperatively: its next report_progress call
+        raises PluginTimeoutError. Until then it runs on in the background
+        and its result is discarded.
         """
         timeout = (
             timeout_seconds
             if timeout_seconds is not None
             else self.default_timeout_seconds
         )
+        expired = threading.Event()
 
-        with ThreadPoolExecutor(max_workers=1) as pool:
-            future = pool.submit(self.run, plugin_name, payload)
-            try:
-                return future.result(timeout=timeout)
-            except FuturesTimeoutError as exc:
-                self.logger.error(
-                    "Plugin '%s' timed out after %s seconds", plugin_name, timeout
-                )
-                raise PluginTimeoutError(
-                    f"Plugin '{plugin_name}' timed out after {timeout} seconds"
-                ) from exc
+        def progress(stage: str, done: int, total: Optional[int], unit: str) -> None:
+            if expired.is_set():
+                raise PluginTimeoutError(f"Plugin '{plugin_name}' timed out")
+            if on_progress is not None:
+                on_progress(stage, done, total, unit)
+
+        pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="plugin")
+        future = pool.submit(self.run, plugin_name, payload, progress)
+        try:
+            return future.result(timeout=timeout)
+        except FuturesTimeoutError as exc:
+            expired.set()
+            self.logger.error(
+                "Plugin '%s' timed out after %s seconds", plugin_name, timeout
+            )
+            raise PluginTimeoutError(
+                f"Plugin '{plugin_name}' timed out after {timeout} seconds"
+            ) from exc
+        finally:
+            # Do not wait for a timed-out plugin
+            pool.shutdown(wait=False, cancel_futures=True)
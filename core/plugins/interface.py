@@ -1,7 +1,10 @@
 # Plugin contract definition
 from __future__ import annotations
 from abc import ABC, abstractmethod
-from typing import Any, Dict
+from typing import Any, Callable, Dict, Optional
+
+# (stage, done, total, unit)
+ProgressListener = Callable[[str, int, Optional[int], str], None]
 
 
 class BasePlugin(ABC):
@@ -15,6 +18,7 @@ class BasePlugin(ABC):
 
     def __init__(self, config: Dict[str, Any] | None = None) -> None:
         self.config = config or {}
+        self._progress_listener: Optional[ProgressListener] = None
 
     @abstractmethod
     def run(self, payload: Dict[str, Any]) -> Dict[str, Any]:
@@ -25,6 +29,21 @@ class BasePlugin(ABC):
         """
         raise NotImplementedError
 
+    def set_progress_listener(self, listener: Optional[ProgressListener]) -> None:
+        "Attached by the executor; receives report_progress calls"
+        self._progress_listener = listener
+
+    def report_progress(
+        self, stage: str, done: int, total: Optional[int] = None, unit: str = "items"
+    ) -> None:
+        """
+        Report progress of a stage (e.g. "tiles", 120, 400, "tiles").
+        A no-op unless the caller asked for progress.
+        """
+        listener = getattr(self, "_progress_listener", None)
+        if listener is not None:
+            listener(stage, done, total, unit)
+
     def shutdown(self) -> None:
         """
         Optional cleanup hook
@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+import struct
+import zlib
+
+import numpy as np
+
+_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+_COLOR_TYPES = {1: 0, 3: 2, 4: 6}  # channels -> gray / RGB / RGBA
+
+
+def encode_png(image: np.ndarray, level: int = 6) -> bytes:
+    """
+    Encode an 8-bit (H, W), (H, W, 3) or (H, W, 4) array as PNG.
+    Uses filter type 0 on every row, so encoding is one zlib pass.
+    """
+    if image.dtype != np.uint8:
+        raise ValueError(f"PNG encoder expects uint8 data; got {image.dtype}")
+    if image.ndim == 2:
+        image = image[:, :, np.newaxis]
+    height, width, channels = image.shape
+    if channels not in _COLOR_TYPES:
+        raise ValueError(f"Unsupported channel count: {channels}")
+
+    rows = np.zeros((height, width * channels + 1), dtype=np.uint8)
+    rows[:, 1:] = image.reshape(height, width * channels)
+    header = struct.pack(">IIBBBBB", width, height, 8, _COLOR_TYPES[channels], 0, 0, 0)
+    return b"".join(
+        [
+            _SIGNATURE,
+            _chunk(b"IHDR", header),
+            _chunk(b"IDAT", zlib.compress(rows.tobytes(), level)),
+            _chunk(b"IEND", b""),
+        ]
+    )
+
+
+def _chunk(kind: bytes, body: bytes) -> bytes:
+    crc = zlib.crc32(body, zlib.crc32(kind)) & 0xFFFFFFFF
+    return struct.pack(">I", len(body)) + kind + body + struct.pack(">I", crc)
@@ -0,0 +1,231 @@
+from __future__ import annotations
+
+import hashlib
+import math
+from pathlib import Path
+from typing import Optional, Tuple
+
+import numpy as np
+from core.common.exceptions import TileError
+from core.data_manager.cache import LRUCache
+from core.data_manager.disk_cache import DiskCache
+from core.data_manager.raster_store import (
+    HEADER_FILE,
+    ROLE_CATEGORICAL,
+    ChunkedRasterStore,
+)
+from core.data_manager.windows import Window
+from core.rendering.png import encode_png
+
+TILE_SIZE = 256
+MAX_ZOOM = 30
+EARTH_RADIUS = 6378137.0
+MERCATOR_HALF = math.pi * EARTH_RADIUS
+SUPPORTED_CRS = ("EPSG:3857", "EPSG:4326")
+COLORMAPS = ("classes", "viridis")
+_TILE_FILE = "tile.png"
+
+# Class palette for integer masks (index = class value modulo palette size)
+_CLASS_PALETTE = np.array(
+    [
+        [0, 0, 0, 0],
+        [230, 25, 75, 200],
+        [60, 180, 75, 200],
+        [255, 225, 25, 200],
+        [0, 130, 200, 200],
+        [245, 130, 48, 200],
+        [145, 30, 180, 200],
+        [70, 240, 240, 200],
+        [240, 50, 230, 200],
+        [210, 245, 60, 200],
+    ],
+    dtype=np.uint8,
+)
+_VIRIDIS_ANCHORS = np.array(
+    [[68, 1, 84], [59, 82, 139], [33, 145, 140], [94, 201, 98], [253, 231, 37]],
+    dtype=np.float64,
+)
+
+
+def _viridis_lut() -> np.ndarray:
+    "256-entry RGBA ramp interpolated from a few viridis anchor colors"
+    pos = np.linspace(0, len(_VIRIDIS_ANCHORS) - 1, 256)
+    rgb = np.stack(
+        [
+            np.interp(pos, np.arange(len(_VIRIDIS_ANCHORS)), c)
+            for c in _VIRIDIS_ANCHORS.T
+        ],
+        axis=-1,
+    )
+    lut = np.full((256, 4), 255, dtype=np.uint8)
+    lut[:, :3] = np.rint(rgb).astype(np.uint8)
+    return lut
+
+
+_VIRIDIS = _viridis_lut()
+
+
+def tile_resolution(z: int, crs: str) -> float:
+    "Pixel size of an XYZ tile at zoom z, in units of crs"
+    if crs == "EPSG:4326":
+        return 360.0 / (TILE_SIZE * 2**z)
+    return 2 * MERCATOR_HALF / (TILE_SIZE * 2**z)
+
+
+def tile_pixel_centers(
+    z: int, x: int, y: int, crs: str
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    X coordinates of the tile columns and Y coordinates of its rows in crs.
+    Both supported CRS are separable, so two 1-D arrays describe the grid.
+    """
+    if not (0 <= z <= MAX_ZOOM and 0 <= x < 2**z and 0 <= y < 2**z):
+        raise TileError(f"Invalid tile address {z}/{x}/{y}")
+    span = 2 * MERCATOR_HALF / 2**z
+    step = (np.arange(TILE_SIZE) + 0.5) * (span / TILE_SIZE)
+    xs = -MERCATOR_HALF + x * span + step
+    ys = MERCATOR_HALF - y * span - step
+    if crs == "EPSG:4326":
+        xs = np.degrees(xs / EARTH_RADIUS)
+        ys = np.degrees(np.arctan(np.sinh(ys / EARTH_RADIUS)))
+    return xs, ys
+
+
+def colorize(
+    values: np.ndarray,
+    valid: np.ndarray,
+    colormap: str,
+    vmin: float = 0.0,
+    vmax: float = 1.0,
+) -> np.ndarray:
+    "Map a 2-D array to RGBA through a lookup table; invalid pixels are clear"
+    if colormap == "classes":
+        idx = np.mod(values.astype(np.int64), len(_CLASS_PALETTE))
+        rgba = _CLASS_PALETTE[idx]
+    elif colormap == "viridis":
+        scale = 255.0 / (vmax - vmin) if vmax > vmin else 0.0
+        idx = np.clip((values.astype(np.float64) - vmin) * scale, 0, 255)
+        rgba = _VIRIDIS[np.nan_to_num(idx).astype(np.uint8)]
+    else:
+        raise TileError(f"Unknown colormap: {colormap}")
+    rgba[~valid] = 0
+    return rgba
+
+
+def default_colormap(store: ChunkedRasterStore) -> str:
+    """
+    Class colors for categorical stores, viridis for continuous ones (e.g.
+    uint16 reflectance); the dtype decides only for stores without a role.
+    """
+    role = store.header.role
+    if role is None:
+        return "classes" if store.dtype.kind in "biu" else "viridis"
+    return "classes" if role == ROLE_CATEGORICAL else "viridis"
+
+
+def render_tile(
+    store: ChunkedRasterStore,
+    z: int,
+    x: int,
+    y: int,
+    colormap: Optional[str] = None,
+    band: int = 0,
+) -> Optional[np.ndarray]:
+    """
+    Render one XYZ tile of a chunked store as (256, 256, 4) RGBA.
+    Reads only the window under the tile from the coarsest overview that
+    still matches the tile resolution, so cost does not grow with scene size.
+    Returns None when the tile does not overlap the raster.
+    """
+    spatial = store.header.spatial
+    crs = str((spatial or {}).get("crs", "")).upper()
+    if spatial is None or crs not in SUPPORTED_CRS:
+        raise TileError(f"Tiles need a raster in one of {SUPPORTED_CRS}; got {crs!r}")
+
+    xs, ys = tile_pixel_centers(z, x, y, crs)
+    factor, level = store.level_for_resolution(tile_resolution(z, crs))
+    res = float(spatial["resolution"]) * factor
+    minx, _, _, maxy = spatial["bbox"]
+    _, height, width = level.shape
+    cols = np.floor((xs - minx) / res).astype(np.int64)
+    rows = np.floor((maxy - ys) / res).astype(np.int64)
+    col_ok = (cols >= 0) & (cols < width)
+    row_ok = (rows >= 0) & (rows < height)
+    if not col_ok.any() or not row_ok.any():
+        return None
+
+    r0, r1 = int(rows[row_ok].min()), int(rows[row_ok].max()) + 1
+    c0, c1 = int(cols[col_ok].min()), int(cols[col_ok].max()) + 1
+    block = level.read_window(Window(r0, c0, r1 - r0, c1 - c0), bands=[band])[0]
+    values = block[
+        np.ix_(np.clip(rows - r0, 0, r1 - r0 - 1), np.clip(cols - c0, 0, c1 - c0 - 1))
+    ]
+    valid = np.outer(row_ok, col_ok)
+    return colorize(values, valid, colormap or default_colormap(store))
+
+
+class TileRenderer:
+    """
+    Renders PNG map tiles of chunked raster stores behind a memory + disk cache.
+    Tiles are addressed by an ETag derived from the store path, the header
+    mtime (which changes on rewrite or new overviews) and the tile address.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Path,
+        max_disk_bytes: int = 512 * 1024 * 1024,
+        max_memory_bytes: int = 64 * 1024 * 1024,
+    ) -> None:
+        self._disk = DiskCache(cache_dir, max_bytes=max_disk_bytes)
+        self._memory = LRUCache(max_bytes=max_memory_bytes)
+        self._empty: Optional[bytes] = None
+
+    def etag(
+        self, path: Path, z: int, x: int, y: int, colormap: Optional[str] = None
+    ) -> str:
+        try:
+            version = (path / HEADER_FILE).stat().st_mtime_ns
+        except FileNotFoundError as e:
+            raise TileError(f"Not a raster store: {path}") from e
+        raw = f"{path.resolve()}|{version}|{z}/{x}/{y}|{colormap or ''}"
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:24]
+
+    def get_tile(
+        self, path: Path, z: int, x: int, y: int, colormap: Optional[str] = None
+    ) -> Tuple[bytes, str]:
+        "PNG bytes and ETag of a tile; rendered at most once per ETag"
+        tag = self.etag(path, z, x, y, colormap)
+        png = self._memory.get_or_compute(
+            ("tile", tag), lambda: self._load_or_render(tag, path, z, x, y, colormap)
+        )
+        return png, tag
+
+    def _load_or_render(
+        self,
+        tag: str,
+        path: Path,
+        z: int,
+        x: int,
+        y: int,
+        colormap: Optional[str],
+    ) -> bytes:
+        entry = self._disk.lookup(tag)
+        if entry is not None:
+            try:
+                return (entry / _TILE_FILE).read_bytes()
+            except OSError:
+                self._disk.discard(tag)
+
+        rgba = render_tile(ChunkedRasterStore.open(path), z, x, y, colormap)
+        if rgba is None:
+            return self._empty_tile()
+        png = encode_png(rgba)
+        self._disk.store(tag, lambda d: (d / _TILE_FILE).write_bytes(png))
+        return png
+
+    def _empty_tile(self) -> bytes:
+        if self._empty is None:
+            blank = np.zeros((TILE_SIZE, TILE_SIZE, 4), dtype=np.uint8)
+            self._empty = encode_png(blank)
+        return self._empty
@@ -8,8 +8,11 @@ from core.logging.logger import get_logger, Logger
 from core.plugins.registry import PluginRegistry
 from core.plugins.discovery import discover_plugins
 from core.data_manager.local_fs import LocalFileSystemDataManager
-from core.data_manager.cache import SimpleCache
+from core.data_manager.object_store import ObjectStoreDataManager
+from core.data_manager.cache import LRUCache
 from core.data_manager.base import BaseDataManager
+from core.inference.input_cache import DecodedInputCache
+from core.rendering.tiles import TileRenderer
 from core.llm.engine import BaseLLMEngine, NullLLMEngine
 from core.models.registry import ModelRegistry
 from core.models.artifacts import LocalArtifactStore
@@ -28,11 +31,13 @@ class ServiceContainer:
     logger: Logger
     # Placeholders for Phase 2+ components
     data_manager: BaseDataManager
-    cache: SimpleCache
+    cache: LRUCache
     # llm_engin: Optional[object] = None
     llm_engine: BaseLLMEngine
     registry: ModelRegistry  # model registry
     plugin_registry: Optional[PluginRegistry] = None
+    input_cache: Optional[DecodedInputCache] = None
+    tiles: Optional[TileRenderer] = None
 
     @classmethod
     def build(cls) -> "ServiceContainer":
@@ -43,8 +48,30 @@ class ServiceContainer:
         plugin_registry = PluginRegistry()
         discover_plugins("plugins", plugin_registry)
 
-        data_manager = LocalFileSystemDataManager(config.data_root)
-        cache = SimpleCache()
+        data_manager: BaseDataManager
+        if config.data_backend == "s3":
+            data_manager = ObjectStoreDataManager.from_settings(
+                cache_dir=config.data_root / ".cache" / "objects"
+            )
+        else:
+            data_manager = LocalFileSystemDataManager(
+                config.data_root, fsync=config.data_fsync
+            )
+        cache = LRUCache(
+            max_bytes=config.cache_max_bytes, default_ttl=config.cache_ttl_seconds
+        )
+        # Decoded inputs share the process cache as their hot tier
+        input_cache = None
+        if config.input_cache_max_bytes > 0:
+            input_cache = DecodedInputCache(
+                cache_dir=config.data_root / ".cache" / "inputs",
+                max_disk_bytes=config.input_cache_max_bytes,
+                memory=cache,
+            )
+        tiles = TileRenderer(
+            cache_dir=config.data_root / ".cache" / "tiles",
+            max_disk_bytes=config.tile_cache_max_bytes,
+        )
 
         # Model registry
         artifact_store = LocalArtifactStore(root_dir=Path("artifacts"))
@@ -52,7 +79,9 @@ class ServiceContainer:
 
         logger.info("ServiceContainer initialized.")
         logger.info("Plugins discovered: %s", plugin_registry.list())
-        logger.info("DataManager initialized at %s", config.data_root)
+        logger.info(
+            "DataManager initialized (%s) at %s", config.data_backend, config.data_root
+        )
 
         return cls(
             config=config,
@@ -60,6 +89,8 @@ class ServiceContainer:
             plugin_registry=plugin_registry,
             data_manager=data_manager,
             cache=cache,
+            input_cache=input_cache,
+            tiles=tiles,
             llm_engine=llm_engine,
             registry=model_registry,
         )
@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import json
+import os
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Iterable, Iterator, Optional, Set, Tuple
+from uuid import uuid4
+
+try:  # Optional fast JSON encoder
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+try:  # POSIX advisory file locks
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+# fsync policies for atomic writes:
+# - "none": rely on the OS page cache (fast; a crash may lose recent writes)
+# - "file": fsync file contents before the rename
+# - "full": additionally fsync the parent directory so the rename is durable
+FSYNC_POLICIES = ("none", "file", "full")
+
+
+def encode_json(data: Any) -> bytes:
+    "Compact UTF-8 JSON (orjson when installed, stdlib otherwise)"
+    if orjson is not None:
+        try:
+            return orjson.dumps(data)
+        except TypeError:
+            # e.g. non-str dict keys; the stdlib encoder is more permissive
+            pass
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def dumps_json(data: Any) -> str:
+    return encode_json(data).decode("utf-8")
+
+
+def fsync_dir(path: Path) -> None:
+    "Persist directory entries (renames/creates) of path"
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return  # e.g. directories cannot be opened on Windows
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+@contextmanager
+def file_lock(path: Path) -> Iterator[None]:
+    """
+    Exclusive advisory lock across processes, held on path (created if
+    missing) for the with block. Without fcntl (Windows) this is a no-op.
+    """
+    with path.open("ab") as f:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+def write_temp(
+    path: Path, data: bytes, fsync: bool = False, token: Optional[str] = None
+) -> Path:
+    "Write data to a hidden temp file next to path and return the temp path"
+    tmp = path.with_name(f".{path.name}.{token or uuid4().hex}.tmp")
+    with tmp.open("wb") as f:
+        f.write(data)
+        if fsync:
+            f.flush()
+            os.fsync(f.fileno())
+    return tmp
+
+
+def atomic_write_bytes(path: Path, data: bytes, fsync: str = "none") -> None:
+    """
+    Write data to path via temp file + os.replace, so readers only ever see
+    the old or the complete new content.
+    """
+    atomic_write_many([(path, data)], fsync=fsync)
+
+
+def atomic_write_many(items: Iterable[Tuple[Path, bytes]], fsync: str = "none") -> None:
+    """
+    Atomically write many files; each is committed with os.replace after all
+    temp files are written, and every parent directory is fsynced once.
+    """
+    if fsync not in FSYNC_POLICIES:
+        raise ValueError(f"Unknown fsync policy: {fsync}")
+    staged = []
+    parents: Set[Path] = set()
+    batch = uuid4().hex
+    try:
+        for i, (path, data) in enumerate(items):
+            if path.parent not in parents:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                parents.add(path.parent)
+            tmp = write_temp(path, data, fsync != "none", token=f"{batch}-{i}")
+            staged.append((tmp, path))
+        for tmp, path in staged:
+            os.replace(tmp, path)
+    except BaseException:
+        for tmp, _ in staged:
+            tmp.unlink(missing_ok=True)
+        raise
+    if fsync == "full":
+        for parent in parents:
+            fsync_dir(parent)
@@ -89,6 +89,7 @@ class ModelAdapterPlugin(BasePlugin):
             model_provider=_PROVIDER,
             data_manager=c.data_manager,
             logger=c.logger,
+            input_cache=c.input_cache,
         )
         engine = InferenceEngine(ctx)
         resp = engine.execute(req)
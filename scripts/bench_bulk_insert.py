@@ -0,0 +1,83 @@
+"""
+Result insert throughput against the configured PostgreSQL (DATABASE_URL).
+
+Compares ResultRepository.add (flush + refresh per row) with add_many at
+several batch sizes; batches >= COPY_MIN_ROWS go through COPY. Every
+measurement runs in a transaction that is rolled back.
+
+    python scripts/bench_bulk_insert.py --sizes 1 100 10000
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+from time import perf_counter
+from typing import Callable, List
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from backend.db.models import Dataset, Result, Run  # noqa: E402
+from backend.db.repositories.results import ResultRepository  # noqa: E402
+from backend.db.session import SessionLocal  # noqa: E402
+
+
+def make_results(run_id: str, count: int) -> List[Result]:
+    return [
+        Result(
+            run_id=run_id,
+            result_type="tile",
+            uri=f"file:///data/tiles/{i:06d}.bin",
+            metrics_json={"iou": 0.5 + (i % 50) / 100, "pixels": 65536},
+            footprint_wkt="POLYGON((0 0,1 0,1 1,0 1,0 0))",
+        )
+        for i in range(count)
+    ]
+
+
+def timed(label: str, count: int, fn: Callable[[ResultRepository, str], None]) -> None:
+    session = SessionLocal()
+    try:
+        ds = Dataset(name=f"bench-{label}")
+        session.add(ds)
+        session.flush()
+        run = Run(dataset_id=ds.id, plugin_name="bench")
+        session.add(run)
+        session.flush()
+        repo = ResultRepository(session)
+        t0 = perf_counter()
+        fn(repo, run.id)
+        elapsed = perf_counter() - t0
+    finally:
+        session.rollback()
+        session.close()
+    print(f"{label:<22} {count:>7} rows {count / elapsed:>10.0f} rows/s")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 100, 10_000])
+    parser.add_argument(
+        "--max-single", type=int, default=2000, help="cap for the per-row baseline"
+    )
+    args = parser.parse_args()
+
+    for size in args.sizes:
+        single = min(size, args.max_single)
+
+        def add_each(repo: ResultRepository, run_id: str, n: int = single) -> None:
+            for res in make_results(run_id, n):
+                repo.add(res)
+
+        def add_many(repo: ResultRepository, run_id: str, n: int = size) -> None:
+            repo.add_many(make_results(run_id, n))
+
+        timed(f"add x{size}", single, add_each)
+        timed(f"add_many({size})", size, add_many)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,89 @@
+"""
+Read throughput of the sync and async DB stacks under many concurrent
+clients, against the configured PostgreSQL (DATABASE_URL).
+
+Each client repeatedly fetches a page of runs, as GET /runs does:
+- sync: UnitOfWork in a thread pool sized like Starlette's (40 threads)
+- async: AsyncUnitOfWork, all clients in one event loop (asyncio.gather)
+
+    python scripts/bench_db_concurrency.py --clients 200 --requests 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from time import perf_counter
+from typing import List
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from backend.db.async_session import get_async_engine  # noqa: E402
+from backend.db.async_uow import AsyncUnitOfWork  # noqa: E402
+from backend.db.uow import UnitOfWork  # noqa: E402
+
+
+def sync_request(t0: float) -> float:
+    # Latency includes the wait for a free thread, as a client would see it
+    with UnitOfWork() as uow:
+        uow.runs.page(limit=50)
+    return perf_counter() - t0
+
+
+async def async_request() -> float:
+    t0 = perf_counter()
+    async with AsyncUnitOfWork() as uow:
+        await uow.runs.page(limit=50)
+    return perf_counter() - t0
+
+
+def bench_sync(clients: int, requests: int, threads: int) -> List[float]:
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        futures = [
+            pool.submit(sync_request, perf_counter()) for _ in range(clients * requests)
+        ]
+        return [f.result() for f in futures]
+
+
+async def bench_async(clients: int, requests: int) -> List[float]:
+    async def client() -> List[float]:
+        return [await async_request() for _ in range(requests)]
+
+    per_client = await asyncio.gather(*(client() for _ in range(clients)))
+    await get_async_engine().dispose()
+    return [t for times in per_client for t in times]
+
+
+def report(label: str, latencies: List[float], elapsed: float) -> None:
+    latencies = sorted(latencies)
+    p95 = latencies[int(0.95 * (len(latencies) - 1))]
+    print(
+        f"{label:<6} {len(latencies) / elapsed:>9.0f} req/s"
+        f"  p50 {latencies[len(latencies) // 2] * 1000:>7.1f} ms"
+        f"  p95 {p95 * 1000:>7.1f} ms"
+    )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--clients", type=int, default=200)
+    parser.add_argument("--requests", type=int, default=20)
+    parser.add_argument("--threads", type=int, default=40)
+    args = parser.parse_args()
+
+    t0 = perf_counter()
+    latencies = bench_sync(args.clients, args.requests, args.threads)
+    report("sync", latencies, perf_counter() - t0)
+
+    t0 = perf_counter()
+    latencies = asyncio.run(bench_async(args.clients, args.requests))
+    report("async", latencies, perf_counter() - t0)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
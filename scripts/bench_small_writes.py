@@ -0,0 +1,86 @@
+"""
+Small-file write throughput of LocalFileSystemDataManager.
+
+Compares the previous direct json.dump(indent=2) write with atomic saves
+under each fsync policy and with the batched write_many API.
+
+    python scripts/bench_small_writes.py --files 2000
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import tempfile
+from pathlib import Path
+from time import perf_counter
+from typing import Any, Callable, Dict
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from core.data_manager.local_fs import LocalFileSystemDataManager  # noqa: E402
+
+
+def make_items(count: int) -> Dict[str, Any]:
+    return {
+        f"runs/run_{i // 100:03d}/metrics_{i:05d}.json": {
+            "run_id": f"run_{i:05d}",
+            "metrics": {"iou": 0.5 + (i % 50) / 100, "f1": 0.7, "pixels": 65536},
+            "classes": list(range(10)),
+        }
+        for i in range(count)
+    }
+
+
+def legacy_save(root: Path, items: Dict[str, Any]) -> None:
+    "Write path of the data manager before atomic writes were introduced"
+    for rel, data in items.items():
+        path = root / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with path.open("w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
+
+
+def timed(label: str, count: int, fn: Callable[[Path], None]) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        t0 = perf_counter()
+        fn(root)
+        elapsed = perf_counter() - t0
+        size = sum(p.stat().st_size for p in root.rglob("*.json"))
+    print(
+        f"{label:<26} {count / elapsed:>10.0f} files/s  "
+        f"{elapsed * 1000:>8.1f} ms  {size / 1024:>8.0f} KiB"
+    )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--files", type=int, default=2000)
+    args = parser.parse_args()
+    items = make_items(args.files)
+
+    def save_each(policy: str) -> Callable[[Path], None]:
+        def run(root: Path) -> None:
+            dm = LocalFileSystemDataManager(root, fsync=policy)
+            for rel, data in items.items():
+                dm.save(rel, data)
+
+        return run
+
+    def batch(policy: str) -> Callable[[Path], None]:
+        return lambda root: LocalFileSystemDataManager(root, fsync=policy).write_many(
+            items
+        )
+
+    timed("before: direct indent=2", args.files, lambda r: legacy_save(r, items))
+    for policy in ("none", "file", "full"):
+        timed(f"save, fsync={policy}", args.files, save_each(policy))
+        timed(f"write_many, fsync={policy}", args.files, batch(policy))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,40 @@
+import asyncio
+from datetime import datetime
+
+import pytest
+from fastapi import HTTPException, Response
+from backend.api.pagination import NEXT_CURSOR_HEADER, paginate_async
+from backend.db.pagination import Cursor, Page
+from core.config.settings import DatabaseSettings
+
+
+@pytest.mark.parametrize(
+    "url, expected",
+    [
+        ("postgresql://u:p@db:5432/geo", "postgresql+asyncpg://u:p@db:5432/geo"),
+        ("postgresql+psycopg2://u@db/geo", "postgresql+asyncpg://u@db/geo"),
+        ("sqlite:///local.db", "sqlite:///local.db"),
+    ],
+)
+def test_async_url_switches_postgres_driver(url, expected):
+    assert DatabaseSettings(url=url).async_url == expected
+
+
+def test_paginate_async_sets_cursor_header():
+    token = Cursor(datetime(2026, 1, 1), "r1").encode()
+
+    async def fetch():
+        return Page(["a", "b"], token)
+
+    response = Response()
+    assert asyncio.run(paginate_async(fetch, response)) == ["a", "b"]
+    assert response.headers[NEXT_CURSOR_HEADER] == token
+
+
+def test_paginate_async_rejects_bad_cursor():
+    async def fetch():
+        Cursor.decode("not-a-cursor")
+
+    with pytest.raises(HTTPException) as e:
+        asyncio.run(paginate_async(fetch, Response()))
+    assert e.value.status_code == 400
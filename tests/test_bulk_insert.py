@@ -0,0 +1,53 @@
+from datetime import datetime
+
+from geoalchemy2.elements import WKTElement
+from sqlalchemy import DateTime, String, create_engine, event, func, select
+from sqlalchemy.orm import DeclarativeBase, Mapped, Session, mapped_column
+from backend.db.bulk import _copy_value, apply_defaults, bulk_insert
+from backend.db.models import Run, new_id
+
+
+class _Base(DeclarativeBase):
+    pass
+
+
+class Tile(_Base):
+    __tablename__ = "tiles"
+
+    id: Mapped[str] = mapped_column(String, primary_key=True, default=new_id)
+    uri: Mapped[str] = mapped_column(String)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+
+
+def test_apply_defaults_generates_client_side_values():
+    runs = [Run(dataset_id="d", plugin_name="p"), Run(id="fixed", dataset_id="d")]
+    apply_defaults(runs)
+
+    assert len(runs[0].id) == 36 and runs[1].id == "fixed"
+    assert runs[0].status == "created" and runs[0].params_json == {}
+    assert isinstance(runs[0].created_at, datetime)
+
+
+def test_bulk_insert_batches_statements():
+    engine = create_engine("sqlite://")
+    _Base.metadata.create_all(engine)
+    statements = []
+    event.listen(
+        engine,
+        "before_cursor_execute",
+        lambda conn, cursor, stmt, *args: statements.append(stmt),
+    )
+    with Session(engine) as session:
+        tiles = bulk_insert(session, [Tile(uri=f"t{i}") for i in range(500)])
+        inserts = [s for s in statements if s.startswith("INSERT")]
+        assert len(inserts) < 10
+        assert session.scalar(select(func.count()).select_from(Tile)) == 500
+        assert len({t.id for t in tiles}) == 500
+
+
+def test_copy_text_encoding():
+    assert _copy_value(None) == "\\N"
+    assert _copy_value("a\tb\nc\\d") == "a\\tb\\nc\\\\d"
+    assert _copy_value({"iou": 0.5}) == '{"iou":0.5}'
+    assert _copy_value(datetime(2026, 1, 2, 3, 4, 5)) == "2026-01-02 03:04:05"
+    assert _copy_value(WKTElement("POINT(1 2)", srid=4326)) == "SRID=4326;POINT(1 2)"
@@ -0,0 +1,113 @@
+import numpy as np
+import pytest
+from core.evaluation import basic_metrics
+from core.evaluation.basic_metrics import (
+    AccuracyMetric,
+    DiceMetric,
+    F1Metric,
+    IoUMetric,
+    PrecisionMetric,
+    RecallMetric,
+    compute_many,
+)
+from core.evaluation.confusion import ConfusionMatrix
+from core.models.contracts import ModelOutput, SpatialMetadata
+
+SPATIAL = SpatialMetadata(crs="EPSG:4326", bbox=(0, 0, 1, 1), resolution=10.0)
+
+
+def _make_output(arr: np.ndarray) -> ModelOutput:
+    return ModelOutput(prediction=arr, spatial=SPATIAL)
+
+
+def test_binary_values_and_details():
+    pred = _make_output(np.array([[1, 0], [1, 0]], dtype=np.float32))
+    true = np.array([[1, 0], [0, 0]], dtype=np.float32)
+
+    assert AccuracyMetric().compute(pred, true).value == 0.75
+    iou = IoUMetric().compute(pred, true)
+    assert iou.value == 0.5 and iou.details == {"intersection": 1, "union": 2}
+    dice = DiceMetric().compute(pred, true)
+    assert dice.value == pytest.approx(2 / 3)
+    assert dice.details == {"intersection": 1, "sum_pred_true": 3}
+    assert PrecisionMetric().compute(pred, true).value == 0.5
+    assert RecallMetric().compute(pred, true).value == 1.0
+    assert F1Metric().compute(pred, true).value == dice.value
+
+
+def test_empty_masks_score_perfectly():
+    zeros = np.zeros((4, 4), dtype=np.float32)
+    assert IoUMetric().compute(_make_output(zeros), zeros).value == 1.0
+    assert DiceMetric().compute(_make_output(zeros), zeros).value == 1.0
+
+
+def test_multiclass_macro_micro_and_argmax_scores():
+    true = np.array([[0, 1, 2], [2, 2, 1]])
+    pred = np.array([[0, 2, 2], [2, 1, 1]])
+    scores = np.eye(3, dtype=np.float32)[pred].transpose(2, 0, 1)
+
+    cm = ConfusionMatrix.from_labels(true, pred, 3)
+    np.testing.assert_array_equal(cm.matrix, [[1, 0, 0], [0, 1, 1], [0, 1, 2]])
+
+    macro = IoUMetric(num_classes=3).compute(_make_output(scores), true)
+    assert macro.value == pytest.approx((1.0 + 1 / 3 + 2 / 4) / 3)
+    assert len(macro.details["per_class"]) == 3
+    micro = IoUMetric(num_classes=3, average="micro").compute(_make_output(pred), true)
+    assert micro.value == pytest.approx(4 / 8)
+    assert AccuracyMetric(num_classes=3).compute(
+        _make_output(pred), true
+    ).value == pytest.approx(4 / 6)
+    with pytest.raises(ValueError):
+        IoUMetric(num_classes=3, average="binary")
+
+
+def test_ignore_index_and_absent_classes():
+    true = np.array([0, 1, 255, 255])
+    pred = np.array([0, 1, 2, 0])
+    cm = ConfusionMatrix.from_labels(true, pred, 4, ignore_index=255)
+    assert cm.total == 2
+
+    # Classes 2 and 3 occur nowhere and do not drag the macro mean down
+    result = IoUMetric(num_classes=4, ignore_index=255).compute(
+        _make_output(pred), true
+    )
+    assert result.value == 1.0
+    assert result.details["per_class"][2:] == [None, None]
+
+
+def test_binary_ignore_index_masks_raw_ground_truth():
+    true = np.array([[[1, 0, 255, 255]]], dtype=np.uint8)
+    pred = _make_output(np.array([[[1, 0, 0, 0]]], dtype=np.float32))
+
+    assert IoUMetric(ignore_index=255).compute(pred, true).value == 1.0
+    accuracy = AccuracyMetric(ignore_index=255).compute(pred, true)
+    assert accuracy.value == 1.0 and accuracy.details["total"] == 2
+
+
+def test_out_of_range_labels_raise_unless_ignored():
+    true = np.array([0, 1, 7])
+    pred = np.array([0, 1, 1])
+    with pytest.raises(ValueError, match="outside"):
+        ConfusionMatrix.from_labels(true, pred, 3)
+    assert ConfusionMatrix.from_labels(true, pred, 3, ignore_index=7).total == 2
+
+
+def test_compute_many_shares_one_confusion_pass(monkeypatch):
+    calls = []
+    original = ConfusionMatrix.from_labels
+
+    def counting(*args, **kwargs):
+        calls.append(1)
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(basic_metrics.ConfusionMatrix, "from_labels", counting)
+    pred = _make_output(np.random.default_rng(0).random((32, 32)))
+    true = np.random.default_rng(1).random((32, 32)) > 0.5
+    metrics = [AccuracyMetric(), IoUMetric(), DiceMetric(), F1Metric()]
+
+    results = compute_many(metrics, pred, true)
+
+    assert len(calls) == 1
+    assert set(results) == {"accuracy", "iou", "dice", "f1"}
+    for metric in metrics:
+        assert results[metric.name] == metric.compute(pred, true)
@@ -0,0 +1,120 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine, event, insert, text
+from sqlalchemy.orm import Session
+from backend.api.schemas.datasets import DatasetSummaryOut
+from backend.db.models import Dataset, Result, Run
+from backend.db.repositories.datasets import DatasetRepository
+
+T0 = datetime(2026, 3, 1)
+
+# SQLite stand-ins for the PostgreSQL tables (no JSONB / PostGIS)
+_DDL = [
+    "CREATE TABLE datasets (id TEXT PRIMARY KEY, name TEXT, description TEXT,"
+    " created_at DATETIME)",
+    "CREATE TABLE runs (id TEXT PRIMARY KEY, dataset_id TEXT, plugin_name TEXT,"
+    " status TEXT, params_json TEXT, created_at DATETIME, worker_id TEXT,"
+    " attempts INTEGER, started_at DATETIME, heartbeat_at DATETIME,"
+    " finished_at DATETIME, error TEXT)",
+    "CREATE TABLE results (id TEXT PRIMARY KEY, run_id TEXT, result_type TEXT,"
+    " uri TEXT, metrics_json TEXT, footprint_wkt TEXT, footprint_geom BLOB,"
+    " created_at DATETIME)",
+]
+
+
+@pytest.fixture
+def session():
+    engine = create_engine("sqlite://")
+    with engine.begin() as conn:
+        for ddl in _DDL:
+            conn.execute(text(ddl))
+    with Session(engine) as s:
+        s.execute(
+            insert(Dataset.__table__),
+            [
+                {"id": "ds", "name": "s2", "created_at": T0},
+                {"id": "other", "name": "x", "created_at": T0},
+            ],
+        )
+        statuses = ["done", "done", "failed", "running"]
+        s.execute(
+            insert(Run.__table__),
+            [
+                {
+                    "id": f"run-{i}",
+                    "dataset_id": "ds",
+                    "plugin_name": "seg",
+                    "status": status,
+                    "created_at": T0 + timedelta(hours=i),
+                }
+                for i, status in enumerate(statuses)
+            ]
+            + [
+                {
+                    "id": "foreign",
+                    "dataset_id": "other",
+                    "plugin_name": "seg",
+                    "status": "done",
+                    "created_at": T0,
+                }
+            ],
+        )
+        s.execute(
+            insert(Result.__table__),
+            [
+                {
+                    "id": f"res-{i}-{j}",
+                    "run_id": f"run-{i}",
+                    "result_type": "mask" if j % 2 else "tile",
+                    "uri": f"file:///r/{i}/{j}",
+                    "created_at": T0 + timedelta(hours=i, minutes=j),
+                }
+                for i in range(3)
+                for j in range(3)
+            ]
+            + [
+                {
+                    "id": "f",
+                    "run_id": "foreign",
+                    "result_type": "mask",
+                    "uri": "u",
+                    "created_at": T0,
+                }
+            ],
+        )
+        s.commit()
+        yield s
+
+
+def test_summary_aggregates_in_sql(session):
+    statements = []
+    event.listen(
+        session.get_bind(),
+        "before_cursor_execute",
+        lambda conn, cursor, stmt, *args: statements.append(stmt),
+    )
+    summary = DatasetRepository(session).summary("ds", max_runs=3, latest_per_run=2)
+
+    assert len(statements) == 5
+    assert not any("metrics_json" in s or "params_json" in s for s in statements[1:])
+    assert summary.runs_by_status == {"done": 2, "failed": 1, "running": 1}
+    assert summary.results_by_type == {"tile": 6, "mask": 3}
+    assert (summary.run_count, summary.result_count) == (4, 9)
+    # Newest runs first, each with its newest results
+    assert [r.id for r in summary.runs] == ["run-3", "run-2", "run-1"]
+    assert summary.runs[0].latest_results == []
+    assert [r.id for r in summary.runs[1].latest_results] == ["res-2-2", "res-2-1"]
+
+    out = DatasetSummaryOut.model_validate(summary)
+    assert out.dataset.id == "ds"
+    assert out.runs[2].latest_results[0].uri == "file:///r/1/2"
+
+
+def test_summary_of_unknown_dataset_is_none(session):
+    assert DatasetRepository(session).summary("missing") is None
+
+
+def test_summary_without_latest_results(session):
+    summary = DatasetRepository(session).summary("ds", latest_per_run=0)
+    assert all(run.latest_results == [] for run in summary.runs)
@@ -0,0 +1,45 @@
+import os
+
+import pytest
+from backend.db import session as db
+from backend.db.health import check_db
+
+
+@pytest.fixture
+def sqlite_url(tmp_path, monkeypatch):
+    monkeypatch.setenv("DATABASE_URL", f"sqlite:///{tmp_path / 'geo.db'}")
+    db.dispose_engine()
+    yield
+    db.dispose_engine()
+
+
+def test_engine_is_created_lazily_and_shared(sqlite_url):
+    assert db._ENGINE is None
+    engine = db.get_engine()
+
+    assert check_db()
+    assert check_db()
+    with db.db_session() as session:
+        assert session.get_bind() is engine
+    assert db.get_engine() is engine
+
+
+def test_dispose_engine_rebuilds_on_next_use(sqlite_url):
+    first = db.get_engine()
+    db.dispose_engine()
+    assert db.get_engine() is not first
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="needs fork")
+def test_forked_child_does_not_reuse_parent_connections(sqlite_url):
+    engine = db.get_engine()
+    check_db()
+    pool = engine.pool
+
+    pid = os.fork()
+    if pid == 0:
+        # Child: the inherited pool was replaced, queries still work
+        ok = engine.pool is not pool and check_db()
+        os._exit(0 if ok else 1)
+    _, status = os.waitpid(pid, 0)
+    assert os.waitstatus_to_exitcode(status) == 0
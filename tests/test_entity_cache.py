@@ -0,0 +1,179 @@
+import asyncio
+from datetime import datetime
+
+import pytest
+from fastapi import Request, Response
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from backend.api.conditional import not_modified
+from backend.api.schemas.results import ResultOut
+from backend.db.cache import (
+    ALL,
+    CACHE_CHANNEL,
+    EntityCache,
+    SharedDirCache,
+    changed_keys,
+    decode_invalidation,
+    entity_key,
+    invalidation_statement,
+    invalidate_committed,
+    mark_changed,
+    run_results_key,
+)
+from backend.db.models import Result
+from backend.db.repositories.results import AsyncResultRepository
+from core.data_manager.cache import LRUCache
+
+T0 = datetime(2026, 5, 1, 12, 30)
+
+
+def _result(i=1, run_id="run-1"):
+    return Result(
+        id=f"res-{i}",
+        run_id=run_id,
+        result_type="mask",
+        uri=f"file:///data/{i}.tif",
+        metrics_json={"iou": 0.5},
+        footprint_wkt="POINT (1 2)",
+        created_at=T0,
+    )
+
+
+def _put(cache, res):
+    cache.put(Session(), res, cache.version(entity_key(Result, res.id)))
+
+
+def _put_page(cache, session, run_id, page_key, items, next_cursor):
+    version = cache.version(run_results_key(run_id))
+    cache.put_page(session, run_id, page_key, items, next_cursor, version)
+
+
+@pytest.fixture(params=["memory", "shared"])
+def cache(request, tmp_path):
+    if request.param == "memory":
+        return EntityCache(LRUCache(max_bytes=1024**2))
+    return EntityCache(SharedDirCache(tmp_path / "entities"))
+
+
+def test_hit_is_attached_without_a_database(cache):
+    # Sessions have no bind: any SQL would raise
+    _put(cache, _result())
+
+    session = Session()
+    res = cache.attach(session, Result, "res-1")
+    assert res in session and res not in session.dirty
+    assert ResultOut.model_validate(res) == ResultOut.model_validate(_result())
+    # The cached snapshot is a copy, not the caller's object
+    res.metrics_json["iou"] = 0.9
+    assert cache.get(Result, "res-1")["metrics_json"] == {"iou": 0.5}
+    assert cache.attach(Session(), Result, "missing") is None
+
+
+def test_run_pages_are_dropped_after_commit(cache):
+    session = Session()
+    _put_page(cache, session, "run-1", (2, None, 0), [_result(1), _result(2)], "c1")
+    items, cursor = cache.attach_page(Session(), "run-1", (2, None, 0))
+    assert [r.id for r in items] == ["res-1", "res-2"] and cursor == "c1"
+
+    # A new result of the run: not visible to readers until the commit
+    mark_changed(session, changed_keys(_result(3)))
+    assert cache.attach_page(session, "run-1", (2, None, 0)) is None
+    assert cache.attach_page(Session(), "run-1", (2, None, 0)) is not None
+    invalidate_committed(session, cache)
+    assert cache.attach_page(Session(), "run-1", (2, None, 0)) is None
+
+
+def test_reads_racing_an_invalidation_are_not_stored(cache):
+    # Reader misses and queries; a writer commits before the reader stores
+    version = cache.version(entity_key(Result, "res-1"))
+    assert cache.attach(Session(), Result, "res-1") is None
+    stale = _result()
+    cache.invalidate([entity_key(Result, "res-1")])
+    cache.put(Session(), stale, version)
+    assert cache.get(Result, "res-1") is None
+
+    page_version = cache.version(run_results_key("run-1"))
+    cache.invalidate([run_results_key("run-1")])
+    cache.put_page(Session(), "run-1", (2, None, 0), [stale], None, page_version)
+    assert cache.attach_page(Session(), "run-1", (2, None, 0)) is None
+
+    # Clearing everything also fences off reads that started before it
+    version = cache.version(entity_key(Result, "res-1"))
+    cache.invalidate([ALL])
+    cache.put(Session(), stale, version)
+    assert cache.get(Result, "res-1") is None
+
+    # A read started after the invalidation is cached as usual
+    _put(cache, _result())
+    assert cache.get(Result, "res-1") is not None
+
+
+def test_shared_cache_entries_expire(tmp_path):
+    store = SharedDirCache(tmp_path, ttl=-1)
+    store.set(("Result", "a"), {"created_at": T0})
+    assert store.get(("Result", "a")) is None
+
+    store = SharedDirCache(tmp_path)
+    store.set(("Result", "a"), {"created_at": T0})
+    assert store.get(("Result", "a")) == {"created_at": T0}
+    store.clear()
+    assert store.get(("Result", "a")) is None
+
+
+def _request(if_none_match=None):
+    headers = [(b"if-none-match", if_none_match.encode())] if if_none_match else []
+    return Request({"type": "http", "method": "GET", "headers": headers})
+
+
+def test_matching_etag_short_circuits_to_304():
+    out = [ResultOut.model_validate(_result())]
+    response = Response()
+    assert not_modified(_request(), response, out, T0) is None
+    etag = response.headers["etag"]
+    assert response.headers["last-modified"] == "Fri, 01 May 2026 12:30:00 GMT"
+
+    cached = not_modified(_request(f'W/{etag}, "other"'), Response(), out, T0)
+    assert cached is not None and cached.status_code == 304
+    assert cached.headers["etag"] == etag
+    assert not_modified(_request('"stale"'), Response(), out) is None
+
+
+def test_async_result_repository_reads_through_the_cache(cache):
+    _put(cache, _result())
+    _put_page(cache, Session(), "run-1", (200, None, 0), [_result()], None)
+
+    # No bind: any SQL would raise
+    repo = AsyncResultRepository(AsyncSession(), cache)
+    assert asyncio.run(repo.get("res-1")).uri == "file:///data/1.tif"
+    page = asyncio.run(repo.page(run_id="run-1"))
+    assert [r.id for r in page.items] == ["res-1"]
+
+
+def _notified_keys(session):
+    stmt = invalidation_statement(session)
+    channel, payload = stmt.compile().params.values()
+    assert channel == CACHE_CHANNEL
+    return decode_invalidation(payload)
+
+
+def test_committed_writes_are_announced_to_other_processes(cache, monkeypatch):
+    from backend.events import pg
+
+    # Not connected: the engine only supplies the dialect
+    session = Session(bind=create_engine("postgresql+psycopg2://u@db/geo"))
+    assert invalidation_statement(session) is None
+    mark_changed(session, changed_keys(_result()))
+    assert sorted(_notified_keys(session)) == sorted(changed_keys(_result()))
+
+    # Too many keys for one NOTIFY payload: everything is dropped instead
+    mark_changed(session, [("Result", f"res-{i}") for i in range(1000)])
+    assert _notified_keys(session) == [ALL]
+    assert invalidation_statement(Session(bind=create_engine("sqlite://"))) is None
+
+    # Another process receives the notification
+    _put(cache, _result())
+    monkeypatch.setattr(pg, "get_entity_cache", lambda: cache)
+    listener = pg.RunEventListener("postgresql://u@db/geo")
+    listener._on_invalidate(None, 0, CACHE_CHANNEL, '[["Result","res-1"]]')
+    assert cache.get(Result, "res-1") is None
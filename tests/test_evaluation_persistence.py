@@ -1,4 +1,10 @@
+import json
+import multiprocessing
+import time
+from dataclasses import asdict
 from pathlib import Path
+
+import numpy as np
 from core.evaluation.comparison import RunMetrics
 from core.evaluation.persistence import EvaluationStore
 
@@ -17,3 +23,102 @@ def test_save_and_load_run(tmp_path: Path):
     assert len(loaded) == 1
     assert loaded[0].trace_id == "abc123"
     assert loaded[0].metrics["iou"] == 0.8
+
+
+def _run(i: int, **metrics) -> RunMetrics:
+    return RunMetrics(
+        trace_id=f"t{i}",
+        model_name="m",
+        version="1.0.0",
+        metrics=metrics or {"iou": i / 10},
+        created_at=1000.0 + i,
+    )
+
+
+def test_appends_select_metrics_and_time_range(tmp_path: Path):
+    store = EvaluationStore(root_dir=tmp_path)
+    for i in range(5):
+        store.save(_run(i))
+    store.save(_run(5, iou=0.9, dice=0.95))
+
+    assert [r.trace_id for r in store.load_all("m", "1.0.0")] == [
+        f"t{i}" for i in range(6)
+    ]
+    assert store.load_all("m", "1.0.0")[0].metrics == {"iou": 0.0}
+    assert store.load_all("m", "1.0.0")[5] == _run(5, iou=0.9, dice=0.95)
+
+    table = store.load_table("m", "1.0.0", metrics=["dice"], start=1002, end=1006)
+    assert table.trace_ids == ["t2", "t3", "t4", "t5"]
+    assert list(table.metrics) == ["dice"]
+    assert np.isnan(table.metrics["dice"][:3]).all()
+    assert table.metrics["dice"][3] == 0.95
+    assert EvaluationStore(tmp_path).load_all("other", "1.0.0") == []
+
+
+def test_legacy_files_are_migrated(tmp_path: Path):
+    legacy_dir = tmp_path / "evaluations" / "m" / "1.0.0"
+    legacy_dir.mkdir(parents=True)
+    for i in range(3):
+        legacy = asdict(_run(i))
+        legacy.pop("created_at")
+        (legacy_dir / f"t{i}.json").write_text(json.dumps(legacy), encoding="utf-8")
+
+    store = EvaluationStore(root_dir=tmp_path)
+    store.save(_run(3))
+    runs = store.load_all("m", "1.0.0")
+
+    assert sorted(r.trace_id for r in runs) == ["t0", "t1", "t2", "t3"]
+    assert not list(legacy_dir.glob("*.json"))
+    assert len(list((legacy_dir / "legacy").glob("*.json"))) == 3
+
+
+def test_torn_append_is_repaired_from_the_log(tmp_path: Path):
+    store = EvaluationStore(root_dir=tmp_path)
+    store.save(_run(0))
+    store.save(_run(1))
+    log = tmp_path / "evaluations" / "m" / "1.0.0" / "runs.jsonl"
+    with log.open("ab") as f:
+        f.write(b'{"trace_id": "t2", "crea')
+
+    assert [r.trace_id for r in store.load_all("m", "1.0.0")] == ["t0", "t1"]
+    store.save(_run(2))
+    assert EvaluationStore(tmp_path).load_all("m", "1.0.0")[-1] == _run(2)
+
+
+def test_large_history_loads_from_columns(tmp_path: Path):
+    store = EvaluationStore(root_dir=tmp_path)
+    store.save_many(_run(i, iou=i * 1e-5, dice=0.5) for i in range(100_000))
+
+    t0 = time.perf_counter()
+    table = store.load_table("m", "1.0.0", metrics=["iou"])
+    elapsed = time.perf_counter() - t0
+
+    assert len(table) == 100_000 and table.metrics["iou"][-1] == 99_999 * 1e-5
+    assert elapsed < 0.5
+
+
+def _append_from_process(root: str, worker: int) -> None:
+    store = EvaluationStore(root_dir=Path(root))
+    for i in range(200):
+        store.save(_run(worker * 1000 + i))
+
+
+def test_appends_from_several_processes_stay_in_step(tmp_path: Path):
+    ctx = multiprocessing.get_context("spawn")
+    procs = [
+        ctx.Process(target=_append_from_process, args=(str(tmp_path), w))
+        for w in range(4)
+    ]
+    for proc in procs:
+        proc.start()
+    for proc in procs:
+        proc.join()
+        assert proc.exitcode == 0
+
+    path = tmp_path / "evaluations" / "m" / "1.0.0"
+    index = json.loads((path / "runs.index").read_bytes())
+    assert index["log_bytes"] == (path / "runs.jsonl").stat().st_size
+    table = EvaluationStore(tmp_path).load_table("m", "1.0.0")
+    assert len(table) == 800 == len((path / "runs.jsonl").read_bytes().splitlines())
+    by_id = dict(zip(table.trace_ids, table.metrics["iou"].tolist()))
+    assert by_id["t3005"] == 300.5 and len(by_id) == 800
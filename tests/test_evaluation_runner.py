@@ -0,0 +1,110 @@
+import json
+from pathlib import Path
+
+import numpy as np
+import pytest
+from core.config.loader import AppConfig
+from core.data_manager.local_fs import LocalFileSystemDataManager
+from core.evaluation.basic_metrics import AccuracyMetric, DiceMetric, IoUMetric
+from core.evaluation.persistence import EvaluationStore
+from core.evaluation.runner import EvaluationRunner, load_manifest_items
+from core.evaluation.streaming import MetricAccumulator
+from core.inference.engine import InferenceContext, InferenceEngine
+from core.inference.providers import InMemoryModelProvider
+from core.logging.logger import get_module_logger
+from core.models.artifacts import LocalArtifactStore
+from core.models.base import BaseModel
+from core.models.contracts import ModelInput, ModelOutput
+from core.models.metadata import ModelMetadata, ModelVersion
+from core.models.registry import ModelRegistry
+
+SPATIAL = {"crs": "EPSG:4326", "bbox": [0, 0, 1, 1], "resolution": 0.1}
+
+
+class FirstBandModel(BaseModel):
+    def __init__(self) -> None:
+        super().__init__(
+            ModelMetadata(
+                name="first_band",
+                task="segmentation",
+                framework="numpy",
+                version=ModelVersion(1, 2, 0),
+                schema_version="v1",
+            )
+        )
+
+    def on_load(self) -> None:
+        return None
+
+    def on_predict(self, x: ModelInput) -> ModelOutput:
+        return ModelOutput(prediction=x.data[:1], spatial=x.spatial)
+
+
+def _metrics():
+    return [AccuracyMetric(), IoUMetric(), DiceMetric()]
+
+
+@pytest.fixture
+def setup(tmp_path: Path):
+    cfg = AppConfig(env="test", data_root=tmp_path / "data", log_level="INFO")
+    registry = ModelRegistry(artifact_store=LocalArtifactStore(tmp_path / "art"))
+    provider = InMemoryModelProvider(registry=registry)
+    provider.register(FirstBandModel())
+    dm = LocalFileSystemDataManager(tmp_path / "data")
+    engine = InferenceEngine(
+        InferenceContext(
+            registry=registry,
+            model_provider=provider,
+            data_manager=dm,
+            logger=get_module_logger("tests.runner", config=cfg),
+        )
+    )
+
+    rng = np.random.default_rng(0)
+    source = tmp_path / "scenes"
+    source.mkdir()
+    files, truths, expected = [], {}, MetricAccumulator(_metrics())
+    for i in range(7):
+        data = rng.random((2, 9 + i, 11)).astype(np.float32)
+        truth = rng.random((9 + i, 11)) > 0.5
+        path = source / f"scene_{i}.json"
+        path.write_text(
+            json.dumps({"data": data.tolist(), "bands": ["a", "b"], "spatial": SPATIAL})
+        )
+        np.save(tmp_path / "data" / f"truth_{i}.npy", truth)
+        files.append(str(path))
+        truths[str(path)] = f"truth_{i}.npy"
+        expected.update(data[:1], truth)
+    manifest_uri = dm.write_text(
+        "datasets/ds1/manifest.json", json.dumps({"dataset_id": "ds1", "files": files})
+    )
+    return engine, dm, manifest_uri, truths, expected
+
+
+@pytest.mark.parametrize("completion", ["ordered", "unordered"])
+def test_runner_merges_items_and_saves_run(tmp_path: Path, setup, completion):
+    engine, dm, manifest_uri, truths, expected = setup
+    store = EvaluationStore(tmp_path / "evals")
+    items = load_manifest_items(manifest_uri, truths, dm)
+    progress = []
+
+    runner = EvaluationRunner(
+        engine, dm, store=store, max_workers=2, completion=completion, tile_shape=(4, 4)
+    )
+    run = runner.run(items, _metrics(), "first_band", on_progress=progress.append)
+
+    assert run.version == "1.2.0"
+    assert run.metrics == {k: r.value for k, r in expected.finalize().items()}
+    assert [p.done for p in progress] == list(range(1, 8))
+    assert progress[-1].pixels == expected.pixels
+    assert progress[-1].pixels_per_s > 0
+    assert store.load_all("first_band", "1.2.0") == [run]
+
+
+def test_manifest_items_pairing(setup):
+    _, dm, manifest_uri, truths, _ = setup
+    items = load_manifest_items(manifest_uri, list(truths.values()), dm)
+    assert [i.truth_uri for i in items] == list(truths.values())
+    assert items[0].input_uri.startswith("file://")
+    with pytest.raises(ValueError):
+        load_manifest_items(manifest_uri, ["truth_0.npy"], dm)
@@ -0,0 +1,104 @@
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+from core.data_manager.cache import LRUCache
+from core.data_manager.disk_cache import DiskCache
+from core.data_manager.local_fs import LocalFileSystemDataManager
+from core.inference.input_cache import DecodedInputCache
+from core.inference.io import load_input_from_request
+from core.inference.schemas import InferenceRequest
+
+
+def _write_payload(path: Path, fill: float) -> None:
+    payload = {
+        "data": np.full((2, 3, 3), fill, dtype=np.float32).tolist(),
+        "bands": ["R", "G"],
+        "spatial": {"crs": "EPSG:4326", "bbox": [0, 0, 1, 1], "resolution": 10.0},
+    }
+    path.write_text(json.dumps(payload), encoding="utf-8")
+
+
+def test_decoded_input_is_served_from_disk_memory_mapped(tmp_path: Path):
+    dm = LocalFileSystemDataManager(data_root=tmp_path / "data")
+    _write_payload(dm.resolve("scene.json"), 1.0)
+    cache = DecodedInputCache(tmp_path / "cache", max_disk_bytes=1024**2)
+    req = InferenceRequest(model_name="m", input_uri="scene.json")
+
+    first = load_input_from_request(req, dm, input_cache=cache)
+    assert float(first.data[0, 0, 0]) == 1.0
+
+    # A fresh process (empty memory tier) reads the npy entry back via mmap
+    cold = DecodedInputCache(tmp_path / "cache", max_disk_bytes=1024**2)
+    second = load_input_from_request(req, dm, input_cache=cold)
+    assert isinstance(second.data, np.memmap)
+    assert second.bands == ["R", "G"]
+    assert second.spatial.bbox == (0, 0, 1, 1)
+    np.testing.assert_array_equal(second.data, first.data)
+
+
+def test_source_change_invalidates_entry(tmp_path: Path):
+    dm = LocalFileSystemDataManager(data_root=tmp_path / "data")
+    path = dm.resolve("scene.json")
+    _write_payload(path, 1.0)
+    cache = DecodedInputCache(
+        tmp_path / "cache", max_disk_bytes=1024**2, memory=LRUCache()
+    )
+    req = InferenceRequest(model_name="m", input_uri="scene.json")
+    load_input_from_request(req, dm, input_cache=cache)
+
+    _write_payload(path, 5.0)
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+
+    x = load_input_from_request(req, dm, input_cache=cache)
+    assert float(x.data[0, 0, 0]) == 5.0
+    assert len(list((tmp_path / "cache").iterdir())) == 1
+
+
+def test_data_ref_input_bypasses_cache_and_reads_subset(tmp_path: Path):
+    dm = LocalFileSystemDataManager(data_root=tmp_path / "data")
+    arr = np.arange(2 * 4 * 4, dtype=np.uint16).reshape(2, 4, 4)
+    dm.save_raster("scene.raster", arr, chunk_shape=(2, 2))
+    payload = {
+        "data_ref": "scene.raster",
+        "bands": ["R", "G"],
+        "spatial": {"crs": "EPSG:4326", "bbox": [0, 0, 4, 4], "resolution": 1.0},
+    }
+    dm.resolve("scene.json").write_text(json.dumps(payload), encoding="utf-8")
+    cache = DecodedInputCache(
+        tmp_path / "cache", max_disk_bytes=1024**2, memory=LRUCache()
+    )
+    req = InferenceRequest(
+        model_name="m",
+        input_uri="scene.json",
+        parameters={"bands": ["G"], "window": [1, 1, 2, 2]},
+    )
+
+    x = load_input_from_request(req, dm, input_cache=cache)
+    np.testing.assert_array_equal(x.data, arr[[1], 1:3, 1:3])
+
+    # Rewriting only the referenced array is still picked up
+    dm.save_raster("scene.raster", arr * 2, chunk_shape=(2, 2))
+    x = load_input_from_request(req, dm, input_cache=cache)
+    np.testing.assert_array_equal(x.data, arr[[1], 1:3, 1:3] * 2)
+    assert not list((tmp_path / "cache").iterdir())
+
+
+def test_disk_cache_evicts_least_recently_used(tmp_path: Path):
+    disk = DiskCache(tmp_path / "disk", max_bytes=250)
+
+    def writer(entry: Path) -> None:
+        (entry / "blob").write_bytes(b"x" * 100)
+
+    disk.store("a", writer)
+    disk.store("b", writer)
+    os.utime(tmp_path / "disk" / "a", (1, 1))
+    os.utime(tmp_path / "disk" / "b", (2, 2))
+    disk.store("c", writer)
+
+    assert disk.lookup("a") is None
+    assert disk.lookup("b") is not None
+    assert disk.lookup("c") is not None
+    assert disk.size_bytes == 200
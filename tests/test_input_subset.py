@@ -0,0 +1,83 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+from core.common.exceptions import DataAccessError
+from core.data_manager.local_fs import LocalFileSystemDataManager
+from core.inference.input_cache import DecodedInputCache
+from core.inference.io import load_input_from_request
+from core.inference.schemas import InferenceRequest
+
+BANDS = ["B02", "B03", "B04", "B08"]
+# 4 bands x 8 rows x 10 cols, 10 m pixels, origin (1000, 2080)
+SPATIAL = {"crs": "EPSG:32633", "bbox": [1000, 2000, 1100, 2080], "resolution": 10.0}
+
+
+def _scene() -> np.ndarray:
+    return np.arange(4 * 8 * 10, dtype=np.float32).reshape(4, 8, 10)
+
+
+def test_inline_payload_band_and_window_subset():
+    payload = {"data": _scene().tolist(), "bands": BANDS, "spatial": SPATIAL}
+    req = InferenceRequest(
+        model_name="m",
+        input_payload=payload,
+        parameters={"bands": ["B08", "B03"], "window": [2, 3, 4, 5]},
+    )
+    x = load_input_from_request(req, data_manager=None)
+
+    assert x.bands == ["B08", "B03"]
+    np.testing.assert_array_equal(x.data, _scene()[[3, 1], 2:6, 3:8])
+    assert x.data.flags.c_contiguous
+    assert x.spatial.bbox == (1030.0, 2020.0, 1080.0, 2060.0)
+
+
+def test_data_ref_reads_only_requested_subset(tmp_path: Path):
+    dm = LocalFileSystemDataManager(data_root=tmp_path)
+    np.save(dm.resolve("scene.npy"), _scene())
+    payload = {"data_ref": "scene.npy", "bands": BANDS, "spatial": SPATIAL}
+    req = InferenceRequest(
+        model_name="m",
+        input_payload=payload,
+        parameters={"bands": ["B04"], "bbox": [1010, 2050, 1030, 2070]},
+    )
+    x = load_input_from_request(req, data_manager=dm)
+
+    np.testing.assert_array_equal(x.data, _scene()[[2], 1:3, 1:3])
+    assert x.spatial.bbox == (1010.0, 2050.0, 1030.0, 2070.0)
+
+
+def test_subset_applies_to_cached_input(tmp_path: Path):
+    dm = LocalFileSystemDataManager(data_root=tmp_path / "data")
+    dm.save(
+        "scene.json", {"data": _scene().tolist(), "bands": BANDS, "spatial": SPATIAL}
+    )
+    cache = DecodedInputCache(tmp_path / "cache", max_disk_bytes=1024**2)
+    req = InferenceRequest(
+        model_name="m",
+        input_uri="scene.json",
+        parameters={"window": {"row_off": 6, "col_off": 8, "height": 9, "width": 9}},
+    )
+    x = load_input_from_request(req, data_manager=dm, input_cache=cache)
+    assert x.data.shape == (4, 2, 2)
+    assert x.spatial.bbox == (1080.0, 2000.0, 1100.0, 2020.0)
+
+
+def test_unknown_band_or_empty_window_is_rejected():
+    payload = {"data": _scene().tolist(), "bands": BANDS, "spatial": SPATIAL}
+    with pytest.raises(DataAccessError):
+        load_input_from_request(
+            InferenceRequest(
+                model_name="m", input_payload=payload, parameters={"bands": ["B11"]}
+            ),
+            data_manager=None,
+        )
+    with pytest.raises(DataAccessError):
+        load_input_from_request(
+            InferenceRequest(
+                model_name="m",
+                input_payload=payload,
+                parameters={"window": [20, 20, 4, 4]},
+            ),
+            data_manager=None,
+        )
@@ -0,0 +1,84 @@
+import json
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+import pytest
+from core.common.exceptions import DataAccessError
+from core.inference import io
+from core.inference.json_stream import load_json_payload
+from core.inference.schemas import InferenceRequest
+
+SPATIAL = {"crs": "EPSG:4326", "bbox": [0, 0, 1, 1], "resolution": 0.1}
+
+
+def _array(shape=(3, 17, 23)) -> np.ndarray:
+    return np.random.default_rng(0).normal(size=shape).astype(np.float32)
+
+
+@pytest.mark.parametrize("chunk_size", [7, 64, 1024**2])
+def test_streaming_loader_matches_json_module(tmp_path: Path, chunk_size):
+    data = _array()
+    payload = {
+        "extra": {"note": 'brackets ] and "quotes", in strings {'},
+        "data": data.tolist(),
+        "bands": ["B02", "B03", "B04"],
+        "spatial": SPATIAL,
+        "flag": True,
+    }
+    path = tmp_path / "input.json"
+    path.write_text(json.dumps(payload), encoding="utf-8")
+
+    loaded = load_json_payload(path, chunk_size=chunk_size)
+
+    assert loaded["data"].dtype == np.float32
+    np.testing.assert_array_equal(loaded["data"], data)
+    assert {k: v for k, v in loaded.items() if k != "data"} == {
+        k: v for k, v in payload.items() if k != "data"
+    }
+
+
+def test_shape_header_skips_the_measuring_pass(tmp_path: Path, monkeypatch):
+    data = _array((2, 4, 5))
+    path = tmp_path / "input.json"
+    path.write_text(
+        json.dumps({"shape": [2, 4, 5], "data": data.tolist()}, indent=2),
+        encoding="utf-8",
+    )
+    monkeypatch.setattr(
+        "core.inference.json_stream._measure_array",
+        lambda reader: pytest.fail("shape header should be used"),
+    )
+    np.testing.assert_array_equal(load_json_payload(path, chunk_size=16)["data"], data)
+
+
+@pytest.mark.parametrize(
+    "body", ['{"data": [[1, 2], [3]]}', '{"data": [[1, null], [3, 4]]}']
+)
+def test_ragged_or_non_numeric_arrays_are_rejected(tmp_path: Path, body):
+    path = tmp_path / "bad.json"
+    path.write_text(body, encoding="utf-8")
+    with pytest.raises(DataAccessError):
+        load_json_payload(path)
+
+
+def test_large_file_input_peak_memory_stays_near_array_size(
+    tmp_path: Path, monkeypatch
+):
+    data = _array((4, 256, 256))
+    path = tmp_path / "scene.json"
+    path.write_text(
+        json.dumps({"data": data.tolist(), "bands": list("abcd"), "spatial": SPATIAL}),
+        encoding="utf-8",
+    )
+    monkeypatch.setattr(io, "STREAMING_JSON_MIN_BYTES", 0)
+    monkeypatch.setattr("core.inference.json_stream.CHUNK_SIZE", 64 * 1024)
+    req = InferenceRequest(model_name="m", input_uri=path.as_uri())
+
+    tracemalloc.start()
+    x = io.load_input_from_request(req, data_manager=None)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    np.testing.assert_array_equal(x.data, data)
+    assert peak < 2 * data.nbytes
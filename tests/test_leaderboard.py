@@ -0,0 +1,95 @@
+from pathlib import Path
+
+import numpy as np
+from core.evaluation.comparison import RunMetrics, best_run, compare_runs
+from core.evaluation.leaderboard import (
+    pareto_front,
+    top_k,
+    top_k_indices,
+    top_k_table,
+)
+from core.evaluation.persistence import EvaluationStore
+
+
+def _runs(values, **extra):
+    return [
+        RunMetrics(
+            trace_id=f"r{i}",
+            model_name="m",
+            version="1",
+            metrics={"iou": v, **{k: col[i] for k, col in extra.items()}},
+            created_at=float(i),
+        )
+        for i, v in enumerate(values)
+    ]
+
+
+def test_top_k_matches_full_sort_with_ties():
+    values = np.random.default_rng(0).integers(0, 20, 500) / 20
+    runs = _runs(values.tolist())
+    expected = compare_runs(runs, "iou")[:10]
+
+    assert top_k(runs, "iou", 10) == expected
+    assert (
+        top_k(runs, "iou", 3, higher_is_better=False)
+        == compare_runs(runs, "iou", higher_is_better=False)[:3]
+    )
+    assert best_run(runs, "iou") == expected[0]
+
+
+def test_table_top_k_and_best_run_index(tmp_path: Path):
+    values = np.random.default_rng(1).integers(0, 50, 2000) / 50
+    runs = _runs(values.tolist())
+    store = EvaluationStore(tmp_path)
+    store.save_many(runs[:1500])
+    store.save(runs[1500])
+    store.save_many(runs[1501:])
+    table = store.load_table("m", "1")
+
+    assert top_k_table(table, "iou", 25) == top_k(runs, "iou", 25)
+    assert top_k_table(table, "iou", 5, False) == top_k(runs, "iou", 5, False)
+    assert top_k_indices(table, "missing", 5).size == 0
+    assert store.best_run("m", "1", "iou") == best_run(runs, "iou")
+    assert store.best_run("m", "1", "iou", higher_is_better=False) == best_run(
+        runs, "iou", higher_is_better=False
+    )
+    assert store.best_run("m", "1", "dice") is None
+
+
+def test_table_top_k_breaks_ties_like_top_k(tmp_path: Path):
+    # Same score and created_at everywhere: only trace_id orders the runs
+    runs = [
+        RunMetrics(
+            trace_id=trace_id,
+            model_name="m",
+            version="1",
+            metrics={"iou": 0.5},
+            created_at=1.0,
+        )
+        for trace_id in ["r7", "r2", "r9", "r0", "r5"]
+    ]
+    store = EvaluationStore(tmp_path)
+    store.save_many(runs)
+    table = store.load_table("m", "1")
+
+    for k in (1, 3, 5):
+        assert top_k_table(table, "iou", k) == top_k(runs, "iou", k)
+    assert [r.trace_id for r in top_k(runs, "iou", 3)] == ["r0", "r2", "r5"]
+    assert [r.trace_id for r in pareto_front(table, {"iou": True})] == ["r0"]
+    for higher in (True, False):
+        expected = top_k(runs, "iou", 1, higher)[0]
+        assert best_run(runs, "iou", higher) == expected
+        assert store.best_run("m", "1", "iou", higher) == expected
+
+
+def test_pareto_front(tmp_path: Path):
+    runs = _runs(
+        [0.9, 0.8, 0.7, 0.9, 0.6, 0.8],
+        latency=[50.0, 20.0, 30.0, 50.0, 10.0, 25.0],
+    )
+    store = EvaluationStore(tmp_path)
+    store.save_many(runs)
+
+    front = pareto_front(store.load_table("m", "1"), {"iou": True, "latency": False})
+    # r3 duplicates r0 (earlier wins); r2 and r5 are dominated by r1
+    assert [r.trace_id for r in front] == ["r0", "r1", "r4"]
@@ -0,0 +1,60 @@
+import os
+from pathlib import Path
+
+import pytest
+from core.data_manager.local_fs import LocalFileSystemDataManager
+from core.utils import fs
+
+
+def _leftovers(root: Path) -> list:
+    return [p for p in root.rglob("*") if p.name.endswith(".tmp")]
+
+
+@pytest.mark.parametrize("policy", ["none", "file", "full"])
+def test_save_is_compact_atomic_and_roundtrips(tmp_path: Path, policy):
+    dm = LocalFileSystemDataManager(tmp_path, fsync=policy)
+    dm.save("a/b/manifest.json", {"files": ["x", "ü"], "n": 2})
+    uri = dm.write_text("a/note.txt", "hello")
+
+    raw = dm.resolve("a/b/manifest.json").read_bytes()
+    assert raw == '{"files":["x","ü"],"n":2}'.encode("utf-8")
+    assert dm.load("a/b/manifest.json") == {"files": ["x", "ü"], "n": 2}
+    assert uri == f"file://{dm.resolve('a/note.txt').as_posix()}"
+    assert _leftovers(tmp_path) == []
+
+
+def test_failed_write_keeps_previous_content(tmp_path: Path, monkeypatch):
+    dm = LocalFileSystemDataManager(tmp_path)
+    dm.save("state.json", {"v": 1})
+
+    def broken_replace(src, dst):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(fs.os, "replace", broken_replace)
+    with pytest.raises(OSError):
+        dm.save("state.json", {"v": 2})
+    assert dm.load("state.json") == {"v": 1}
+    assert _leftovers(tmp_path) == []
+
+
+def test_write_many_commits_batch_with_one_fsync_per_directory(
+    tmp_path: Path, monkeypatch
+):
+    synced = []
+    monkeypatch.setattr(fs, "fsync_dir", lambda path: synced.append(path))
+    dm = LocalFileSystemDataManager(tmp_path, fsync="full")
+    items = {f"runs/{i % 2}/m{i}.json": {"i": i} for i in range(10)}
+    items["runs/readme.txt"] = "text"
+
+    uris = dm.write_many(items)
+
+    assert len(uris) == 11
+    assert dm.load("runs/1/m7.json") == {"i": 7}
+    assert sorted(p.name for p in synced) == ["0", "1", "runs"]
+    assert _leftovers(tmp_path) == []
+
+
+def test_unknown_fsync_policy_is_rejected(tmp_path: Path):
+    with pytest.raises(ValueError):
+        LocalFileSystemDataManager(tmp_path, fsync="sometimes")
+    assert os.listdir(tmp_path) == []
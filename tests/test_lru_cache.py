@@ -0,0 +1,97 @@
+import threading
+import time
+
+import numpy as np
+import pytest
+from core.data_manager.cache import LRUCache
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_get_set_and_stats():
+    cache = LRUCache(max_bytes=1024)
+    assert cache.get("a") is None
+    cache.set("a", b"x" * 10)
+    assert cache.get("a") == b"x" * 10
+
+    stats = cache.stats()
+    assert stats.hits == 1
+    assert stats.misses == 1
+    assert stats.entries == 1
+    assert stats.size_bytes == 10
+
+
+def test_evicts_least_recently_used_by_nbytes():
+    arr = np.zeros(25, dtype=np.float32)  # 100 bytes
+    cache = LRUCache(max_bytes=250)
+    cache.set("a", arr)
+    cache.set("b", arr.copy())
+    cache.get("a")  # "b" is now least recently used
+    cache.set("c", arr.copy())
+
+    assert "a" in cache
+    assert "b" not in cache
+    assert "c" in cache
+    assert cache.stats().evictions == 1
+    assert cache.stats().size_bytes == 200
+
+
+def test_oversized_value_is_not_admitted():
+    cache = LRUCache(max_bytes=10)
+    cache.set("small", b"1234")
+    cache.set("big", b"x" * 100)
+    assert "big" not in cache
+    assert "small" in cache
+
+
+def test_ttl_expiry():
+    clock = FakeClock()
+    cache = LRUCache(max_bytes=1024, default_ttl=5.0, clock=clock)
+    cache.set("a", "value")
+    cache.set("b", "value", ttl=60.0)
+    clock.now = 10.0
+    assert cache.get("a") is None
+    assert cache.get("b") == "value"
+    assert cache.stats().expirations == 1
+
+
+def test_get_or_compute_is_single_flight():
+    cache = LRUCache(max_bytes=1024)
+    calls = []
+    barrier = threading.Barrier(8)
+
+    def loader():
+        calls.append(1)
+        time.sleep(0.05)
+        return "loaded"
+
+    def worker(out):
+        barrier.wait()
+        out.append(cache.get_or_compute("k", loader))
+
+    results: list = []
+    threads = [threading.Thread(target=worker, args=(results,)) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert results == ["loaded"] * 8
+    assert len(calls) == 1
+
+
+def test_get_or_compute_propagates_errors_without_caching():
+    cache = LRUCache(max_bytes=1024)
+
+    def failing():
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        cache.get_or_compute("k", failing)
+    assert cache.get_or_compute("k", lambda: 42) == 42
@@ -0,0 +1,108 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+from core.data_manager.local_fs import LocalFileSystemDataManager
+from core.inference.input_cache import DecodedInputCache
+from core.inference.io import load_input_from_request, payload_to_model_input
+from core.inference.schemas import InferenceRequest
+from core.models.base import BaseModel
+from core.models.contracts import ModelInput, ModelOutput, SpatialMetadata
+from core.models.metadata import ModelMetadata, ModelVersion
+
+SPATIAL = SpatialMetadata(crs="EPSG:4326", bbox=(0, 0, 1, 1), resolution=0.25)
+BANDS = ["B02", "B03", "B04"]
+
+
+def _reflectance() -> np.ndarray:
+    return np.arange(3 * 4 * 4, dtype=np.uint16).reshape(3, 4, 4) * 100
+
+
+class ChannelsLastModel(BaseModel):
+    def __init__(self) -> None:
+        super().__init__(
+            ModelMetadata(
+                name="channels_last",
+                task="test",
+                framework="numpy",
+                version=ModelVersion(1, 0, 0),
+                schema_version="v1",
+                input_dtype="float32",
+                input_layout="HWC",
+            )
+        )
+
+    def on_load(self) -> None:
+        return None
+
+    def on_predict(self, x: ModelInput) -> ModelOutput:
+        arr = self.input_array(x)
+        return ModelOutput(prediction=arr.mean(axis=-1)[None], spatial=x.spatial)
+
+
+def test_as_array_is_zero_copy_when_nothing_to_convert():
+    x = ModelInput(data=_reflectance(), bands=BANDS, spatial=SPATIAL)
+    assert x.as_array() is x.data
+    assert x.as_array("uint16", "CHW") is x.data
+
+
+def test_as_array_converts_in_one_pass_and_applies_scale():
+    x = ModelInput(
+        data=_reflectance(), bands=BANDS, spatial=SPATIAL, scale=1e-4, offset=-0.1
+    )
+    hwc = x.as_array("float32", "HWC")
+
+    assert hwc.shape == (4, 4, 3) and hwc.flags.c_contiguous
+    assert hwc.dtype == np.float32
+    np.testing.assert_allclose(
+        hwc, np.moveaxis(_reflectance(), 0, -1) * 1e-4 - 0.1, atol=1e-6
+    )
+    # Nothing is memoized on the (possibly cached) input
+    again = x.as_array(np.float32, "HWC")
+    assert again is not hwc and not np.shares_memory(again, hwc)
+    assert vars(x).keys() == {"data", "bands", "spatial", "extra", "scale", "offset"}
+    # Integer targets keep raw counts
+    np.testing.assert_array_equal(x.as_array("int32"), _reflectance())
+    with pytest.raises(ValueError):
+        x.as_array(layout="WHC")
+
+
+def test_payload_keeps_storage_dtype_and_transposes_lazily():
+    payload = {
+        "data": np.moveaxis(_reflectance(), 0, -1).tolist(),
+        "dtype": "uint16",
+        "scale": 0.0001,
+        "bands": BANDS,
+        "spatial": SPATIAL.__dict__,
+    }
+    x = payload_to_model_input(payload)
+
+    assert x.data.dtype == np.uint16
+    assert x.data.shape == (3, 4, 4) and not x.data.flags.c_contiguous
+    assert x.scale == 1e-4 and x.offset is None
+    np.testing.assert_array_equal(x.as_array(), _reflectance())
+    assert x.as_array().flags.c_contiguous
+
+
+def test_model_declared_dtype_and_layout(tmp_path: Path):
+    dm = LocalFileSystemDataManager(tmp_path / "data")
+    cache = DecodedInputCache(tmp_path / "cache", max_disk_bytes=1024**2)
+    dm.save(
+        "scene.json",
+        {
+            "data": _reflectance().tolist(),
+            "dtype": "uint16",
+            "scale": 0.5,
+            "bands": BANDS,
+            "spatial": SPATIAL.__dict__,
+        },
+    )
+    req = InferenceRequest(model_name="m", input_uri="scene.json")
+    load_input_from_request(req, dm, input_cache=cache)
+    x = DecodedInputCache(tmp_path / "cache", 1024**2).get_or_load(
+        dm.resolve("scene.json"), lambda: pytest.fail("expected a disk hit")
+    )
+    assert x.data.dtype == np.uint16 and x.scale == 0.5
+
+    y = ChannelsLastModel().predict(x)
+    np.testing.assert_allclose(y.prediction[0], _reflectance().mean(axis=0) * 0.5)
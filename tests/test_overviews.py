@@ -0,0 +1,104 @@
+from pathlib import Path
+from types import SimpleNamespace
+
+import numpy as np
+from backend.api.routers.results import _local_raster_path
+from core.data_manager.local_fs import LocalFileSystemDataManager
+from core.data_manager.overviews import build_overviews, downsample
+from core.data_manager.raster_store import ROLE_CATEGORICAL, ChunkedRasterStore
+from core.data_manager.windows import Window
+from core.models.contracts import ModelInput, ModelOutput, SpatialMetadata
+
+SPATIAL = SpatialMetadata(crs="EPSG:32633", bbox=(0, 0, 100, 60), resolution=10.0)
+
+
+def test_downsample_mean_and_mode_handle_partial_edge_cells():
+    block = np.array([[[1, 1, 2, 9, 4], [1, 2, 2, 9, 4], [3, 3, 3, 3, 5]]])
+
+    np.testing.assert_array_equal(
+        downsample(block.astype(np.float32), 2, "mean"),
+        [[[1.25, 5.5, 4.0], [3.0, 3.0, 5.0]]],
+    )
+    np.testing.assert_array_equal(
+        downsample(block.astype(np.uint8), 2, "mode"), [[[1, 2, 4], [3, 3, 5]]]
+    )
+
+
+def test_build_overviews_streams_levels_and_records_header(tmp_path: Path):
+    rng = np.random.default_rng(0)
+    mask = rng.integers(0, 4, size=(1, 60, 100), dtype=np.uint8)
+    store = ChunkedRasterStore.create(
+        tmp_path / "mask",
+        mask.shape,
+        mask.dtype,
+        chunk_shape=(16, 16),
+        role=ROLE_CATEGORICAL,
+    )
+    store.write_window(mask)
+
+    assert build_overviews(store) == [2, 4, 8]
+    reopened = ChunkedRasterStore.open(tmp_path / "mask")
+    assert reopened.header.overviews == [2, 4, 8]
+
+    level2 = reopened.overview(2)
+    assert level2.shape == (1, 30, 50)
+    np.testing.assert_array_equal(level2.read_window(), downsample(mask, 2, "mode"))
+    assert reopened.overview(8).shape == (1, 8, 13)
+    assert set(np.unique(reopened.overview(8).read_window())) <= {0, 1, 2, 3}
+
+
+def test_reader_picks_coarsest_level_meeting_resolution(tmp_path: Path):
+    dm = LocalFileSystemDataManager(data_root=tmp_path)
+    data = np.ones((2, 60, 100), dtype=np.float32)
+    dm.save_raster(
+        "scene", ModelInput(data=data, bands=["B04", "B08"], spatial=SPATIAL)
+    )
+    store = dm.open_raster("scene")
+    build_overviews(store, factors=[2, 4], resampling="mean")
+
+    assert store.level_for_resolution(5.0)[0] == 1
+    assert store.level_for_resolution(35.0)[0] == 2
+    assert store.level_for_resolution(1000.0)[0] == 4
+    assert store.overview(4).header.spatial["resolution"] == 40.0
+
+    full = dm.read_array("scene", window=Window(0, 0, 60, 100))
+    quick = dm.read_array(
+        "scene", bands=[1], window=Window(6, 6, 20, 20), resolution=40
+    )
+    assert full.shape == (2, 60, 100)
+    assert quick.shape == (1, 6, 6)
+
+
+def test_resampling_follows_the_recorded_role_not_the_dtype(tmp_path: Path):
+    dm = LocalFileSystemDataManager(data_root=tmp_path)
+    dn = np.array([[[100, 300], [200, 400]]], dtype=np.uint16)
+    labels = np.array([[[1, 1], [1, 2]]], dtype=np.uint8)
+    dm.save_raster("scene", ModelInput(data=dn, bands=["B04"], spatial=SPATIAL))
+    dm.save_raster("mask", ModelOutput(prediction=labels, spatial=SPATIAL))
+
+    scene, mask = dm.open_raster("scene"), dm.open_raster("mask")
+    build_overviews(scene, factors=[2])
+    build_overviews(mask, factors=[2])
+
+    # uint16 reflectance is averaged, the uint8 class mask keeps its majority
+    assert scene.overview(2).read_window()[0, 0, 0] == 250
+    assert mask.overview(2).read_window()[0, 0, 0] == 1
+    assert mask.overview(2).header.role == ROLE_CATEGORICAL
+
+
+def test_raster_paths_outside_data_root_are_rejected(tmp_path: Path):
+    dm = LocalFileSystemDataManager(data_root=tmp_path / "data")
+    inside = dm.save_raster("runs/pred.raster", np.zeros((1, 4, 4), np.uint8))
+    ChunkedRasterStore.create(tmp_path / "outside.raster", (1, 4, 4), np.uint8)
+    request = SimpleNamespace(
+        app=SimpleNamespace(
+            state=SimpleNamespace(container=SimpleNamespace(data_manager=dm))
+        )
+    )
+
+    assert _local_raster_path(request, inside) == dm.resolve("runs/pred.raster")
+    assert _local_raster_path(request, "runs/pred.raster") is not None
+    assert _local_raster_path(request, "../outside.raster") is None
+    assert _local_raster_path(request, "runs/../../outside.raster") is None
+    outside_uri = (tmp_path / "outside.raster").as_uri()
+    assert _local_raster_path(request, outside_uri) is None
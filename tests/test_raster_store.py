@@ -0,0 +1,114 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+from core.common.exceptions import DataAccessError
+from core.data_manager.local_fs import LocalFileSystemDataManager
+from core.data_manager.raster_store import ChunkedRasterStore
+from core.data_manager.windows import Window
+from core.inference.io import load_input_from_request
+from core.inference.schemas import InferenceRequest
+from core.inference.tiling import predict_tiled, read_output
+from core.models.base import BaseModel
+from core.models.contracts import ModelInput, ModelOutput, SpatialMetadata
+from core.models.metadata import ModelMetadata, ModelVersion
+
+BANDS = ["B02", "B03", "B04"]
+SPATIAL = SpatialMetadata(crs="EPSG:32633", bbox=(0, 0, 70, 50), resolution=1.0)
+
+
+def _scene() -> np.ndarray:
+    return np.arange(3 * 50 * 70, dtype=np.float32).reshape(3, 50, 70)
+
+
+class BandSumModel(BaseModel):
+    def __init__(self) -> None:
+        super().__init__(
+            ModelMetadata(
+                name="band_sum",
+                task="test",
+                framework="numpy",
+                version=ModelVersion(1, 0, 0),
+                schema_version="v1",
+            )
+        )
+        self.tiles = 0
+
+    def on_load(self) -> None:
+        return None
+
+    def on_predict(self, x: ModelInput) -> ModelOutput:
+        self.tiles += 1
+        pred = x.data.sum(axis=0, keepdims=True)
+        return ModelOutput(prediction=pred, spatial=x.spatial, confidence=pred / 10)
+
+
+@pytest.mark.parametrize("compression", [None, "zlib"])
+def test_store_roundtrip_and_window_reads(tmp_path: Path, compression):
+    store = ChunkedRasterStore.create(
+        tmp_path / "r", (3, 50, 70), np.float32, (16, 16), compression
+    )
+    store.write_window(_scene())
+
+    reopened = ChunkedRasterStore.open(tmp_path / "r")
+    np.testing.assert_array_equal(reopened.read_window(), _scene())
+    np.testing.assert_array_equal(
+        reopened.read_window(Window(10, 20, 30, 40), bands=[2, 0]),
+        _scene()[[2, 0], 10:40, 20:60],
+    )
+    assert reopened.header.grid == (4, 5)
+
+
+def test_partial_writes_patch_chunks_and_missing_chunks_read_fill(tmp_path: Path):
+    store = ChunkedRasterStore.create(
+        tmp_path / "r", (1, 20, 20), np.int16, (8, 8), fill_value=-1
+    )
+    store.write_window(np.full((1, 3, 3), 7, dtype=np.int16), row_off=6, col_off=6)
+
+    out = store.read_window()
+    assert (out[0, 6:9, 6:9] == 7).all()
+    assert (out == -1).sum() == 400 - 9
+    assert not store._chunk_path(0, 2, 2).exists()
+    with pytest.raises(ValueError):
+        store.write_window(np.zeros((1, 5, 5), dtype=np.int16), row_off=18)
+
+
+def test_local_data_manager_saves_output_and_io_reads_windows(tmp_path: Path):
+    dm = LocalFileSystemDataManager(data_root=tmp_path)
+    uri = dm.save_raster(
+        "scene.raster",
+        ModelInput(data=_scene(), bands=BANDS, spatial=SPATIAL),
+        chunk_shape=(16, 16),
+    )
+    assert uri.startswith("file://")
+
+    req = InferenceRequest(
+        model_name="m",
+        input_uri="scene.raster",
+        parameters={"bands": ["B04"], "window": [0, 64, 10, 10]},
+    )
+    x = load_input_from_request(req, data_manager=dm)
+    np.testing.assert_array_equal(x.data, _scene()[[2], 0:10, 64:70])
+    assert x.spatial.bbox == (64.0, 40.0, 70.0, 50.0)
+
+    payload = {"data_ref": "scene.raster", "bands": BANDS, "spatial": SPATIAL.__dict__}
+    req = InferenceRequest(model_name="m", input_payload=payload)
+    np.testing.assert_array_equal(load_input_from_request(req, dm).data, _scene())
+
+    # A bare array has no band/spatial metadata to build a ModelInput from
+    dm.save_raster("plain", _scene()[0])
+    with pytest.raises(DataAccessError):
+        load_input_from_request(InferenceRequest(model_name="m", input_uri="plain"), dm)
+
+
+def test_predict_tiled_streams_into_store(tmp_path: Path):
+    model = BandSumModel()
+    x = ModelInput(data=_scene(), bands=BANDS, spatial=SPATIAL)
+
+    store = predict_tiled(model, x, tmp_path / "pred", tile_shape=(32, 32))
+    y = read_output(store)
+
+    assert model.tiles == 6
+    np.testing.assert_allclose(y.prediction, _scene().sum(axis=0, keepdims=True))
+    np.testing.assert_allclose(y.confidence, y.prediction / 10)
+    assert y.spatial == SPATIAL
@@ -0,0 +1,36 @@
+import pytest
+from fastapi import HTTPException
+from pydantic import ValidationError
+from shapely import wkt as shapely_wkt
+from backend.api.routers.results import _search_area
+from backend.api.schemas.results import ResultCreate
+from backend.db.models import Result
+
+
+def test_footprint_geometry_follows_wkt():
+    res = Result(run_id="r", result_type="t", uri="u", footprint_wkt="POINT(1 2)")
+    assert res.footprint_geom.data == "POINT(1 2)"
+    assert res.footprint_geom.srid == 4326
+
+    res.footprint_wkt = None
+    assert res.footprint_geom is None
+
+
+def test_invalid_footprint_wkt_is_rejected():
+    with pytest.raises(ValidationError):
+        ResultCreate(run_id="r", result_type="t", uri="u", footprint_wkt="POLY(")
+
+
+def test_search_area_from_bbox_or_wkt():
+    area = shapely_wkt.loads(_search_area("10,20,11,21.5", None))
+    assert area.bounds == (10.0, 20.0, 11.0, 21.5)
+    assert _search_area(None, "POINT(1 2)") == "POINT(1 2)"
+    assert _search_area(None, None) is None
+    for bbox, wkt in [
+        ("1,2,3", None),
+        ("3,0,1,1", None),
+        (None, "x"),
+        ("0,0,1,1", "x"),
+    ]:
+        with pytest.raises(HTTPException):
+            _search_area(bbox, wkt)
@@ -0,0 +1,71 @@
+import asyncio
+import csv
+import io
+import json
+from datetime import datetime
+
+import pytest
+from sqlalchemy.dialects import postgresql
+from backend.api.export import CSV_FIELDS, encode_export
+from backend.db.repositories.results import export_statement
+
+T0 = datetime(2026, 6, 1, 8, 0)
+
+
+def _row(i, footprint="POINT (1 2)"):
+    return {
+        "id": f"res-{i}",
+        "run_id": "run-1",
+        "result_type": "mask",
+        "uri": f"file:///data/{i}.tif",
+        "created_at": T0,
+        "footprint_wkt": footprint,
+        "metrics_json": {"iou": 0.5},
+    }
+
+
+def _export(fmt, batches):
+    async def source():
+        for batch in batches:
+            yield batch
+
+    async def collect():
+        return [chunk async for chunk in encode_export(fmt, source())]
+
+    return asyncio.run(collect())
+
+
+def test_ndjson_writes_one_chunk_per_batch():
+    chunks = _export("ndjson", [[_row(1), _row(2)], [_row(3)]])
+    assert len(chunks) == 2
+    lines = "".join(chunks).splitlines()
+    assert [json.loads(line)["id"] for line in lines] == ["res-1", "res-2", "res-3"]
+    assert json.loads(lines[0])["created_at"] == "2026-06-01T08:00:00"
+
+
+def test_csv_has_header_and_json_metrics():
+    body = "".join(_export("csv", [[_row(1), _row(2, footprint=None)]]))
+    rows = list(csv.DictReader(io.StringIO(body)))
+    assert tuple(rows[0]) == CSV_FIELDS
+    assert json.loads(rows[0]["metrics_json"]) == {"iou": 0.5}
+    assert rows[1]["footprint_wkt"] == ""
+
+
+@pytest.mark.parametrize("batches", [[], [[]], [[_row(1)], [], [_row(2, None)]]])
+def test_geojson_is_one_valid_feature_collection(batches):
+    collection = json.loads("".join(_export("geojson", batches)))
+    features = collection["features"]
+    assert collection["type"] == "FeatureCollection"
+    assert len(features) == sum(len(b) for b in batches)
+    if features:
+        assert features[0]["geometry"] == {"type": "Point", "coordinates": [1, 2]}
+        assert features[0]["properties"]["uri"] == "file:///data/1.tif"
+        assert features[1]["geometry"] is None
+
+
+def test_export_selects_columns_only_newest_first():
+    stmt = export_statement(run_id="run-1", result_type="mask")
+    sql = str(stmt.compile(dialect=postgresql.dialect()))
+    assert "footprint_geom" not in sql
+    assert "WHERE results.result_type = " in sql and "results.run_id = " in sql
+    assert sql.endswith("ORDER BY results.created_at DESC, results.id DESC")
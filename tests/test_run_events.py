@@ -0,0 +1,110 @@
+import asyncio
+import threading
+
+from backend.api.sse import format_event, is_terminal
+from backend.events.bus import PROGRESS, STATUS, EventBus, RunEvent
+from backend.jobs.worker import _Progress
+
+
+def test_run_event_json_roundtrip():
+    event = RunEvent.status("run-1", "failed", error="boom")
+    assert RunEvent.from_json(event.to_json()) == event
+    assert event.data == {"status": "failed", "error": "boom"}
+    assert is_terminal(event)
+    assert not is_terminal(RunEvent.status("run-1", "running"))
+    assert format_event(event, 3).startswith("event: status\nid: 3\ndata: {")
+
+
+def test_bus_delivers_to_subscribers_of_the_run_only():
+    bus = EventBus()
+
+    async def scenario():
+        with bus.subscribe("a") as a, bus.subscribe("b") as b:
+            assert bus.subscriber_count("a") == 1
+            # Published from another thread, as the worker threads do
+            thread = threading.Thread(
+                target=bus.publish, args=(RunEvent.status("a", "running"),)
+            )
+            thread.start()
+            thread.join()
+            got = await a.get(timeout=1)
+            assert (got.run_id, got.data["status"]) == ("a", "running")
+            assert await b.get(timeout=0.05) is None
+        assert bus.subscriber_count("a") == 0
+        assert bus.publish(RunEvent.status("a", "done")) == 0
+
+    asyncio.run(scenario())
+
+
+def test_slow_subscriber_drops_oldest_events():
+    bus = EventBus(queue_size=2)
+
+    async def scenario():
+        with bus.subscribe("a") as sub:
+            for i in range(5):
+                bus.publish(RunEvent("a", PROGRESS, {"done": i}))
+            await asyncio.sleep(0)
+            received = [(await sub.get(timeout=1)).data["done"] for _ in range(2)]
+            return received, sub.dropped
+
+    assert asyncio.run(scenario()) == ([3, 4], 3)
+
+
+class _Recorder:
+    def __init__(self):
+        self.events = []
+
+    def publish(self, event):
+        self.events.append(event)
+
+
+def test_progress_is_throttled_per_stage_but_keeps_the_last_report():
+    worker = _Recorder()
+    progress = _Progress(worker, "run-1", min_interval=60)
+    for done in range(1, 11):
+        progress("tiles", done, 10, "tiles")
+    progress("upload", 1, None, "files")
+
+    reports = [(e.data["stage"], e.data["done"]) for e in worker.events]
+    assert reports == [("tiles", 1), ("tiles", 10), ("upload", 1)]
+    assert all(e.type == PROGRESS and e.type != STATUS for e in worker.events)
+    assert worker.events[1].data["rate"] > 0
+
+
+class _Conn:
+    def __init__(self, rows):
+        self.rows = rows
+        self.queries = []
+
+    async def fetch(self, query, run_ids):
+        self.queries.append(sorted(run_ids))
+        return [row for row in self.rows if row["id"] in run_ids]
+
+
+def test_reconnect_resyncs_subscribers_and_clears_the_cache(monkeypatch):
+    from backend.db.cache import EntityCache, entity_key
+    from backend.db.models import Run
+    from backend.events import pg
+    from core.data_manager.cache import LRUCache
+    from sqlalchemy.orm import Session
+
+    cache = EntityCache(LRUCache(max_bytes=1024**2))
+    cache.put(
+        Session(), Run(id="a", status="running"), cache.version(entity_key(Run, "a"))
+    )
+    monkeypatch.setattr(pg, "get_entity_cache", lambda: cache)
+    bus = EventBus()
+    listener = pg.RunEventListener("postgresql://u@db/geo", bus)
+    conn = _Conn([{"id": "a", "status": "failed", "error": "boom"}])
+
+    async def scenario():
+        # Nobody listening: nothing to query
+        await listener._resync(conn)
+        with bus.subscribe("a") as sub:
+            await listener._resync(conn)
+            return await sub.get(timeout=1)
+
+    event = asyncio.run(scenario())
+    assert conn.queries == [["a"]]
+    assert event.data == {"status": "failed", "error": "boom"} and is_terminal(event)
+    assert cache.get(Run, "a") is None
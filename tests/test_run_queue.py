@@ -0,0 +1,261 @@
+import logging
+import time
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import event, insert, text
+from backend.db import session as db
+from backend.db.cache import EntityCache
+from backend.db.models import Result, Run
+from backend.db.uow import UnitOfWork
+from backend.jobs.worker import RunWorker, WorkerSettings, output_results
+from core.data_manager.cache import LRUCache
+from core.plugins.executor import PluginExecutor
+from core.plugins.interface import BasePlugin
+from core.plugins.registry import PluginRegistry
+
+T0 = datetime(2026, 4, 1)
+
+_DDL = [
+    "CREATE TABLE runs (id TEXT PRIMARY KEY, dataset_id TEXT, plugin_name TEXT,"
+    " status TEXT, params_json TEXT, created_at DATETIME, worker_id TEXT,"
+    " attempts INTEGER DEFAULT 0, started_at DATETIME, heartbeat_at DATETIME,"
+    " finished_at DATETIME, error TEXT)",
+    "CREATE TABLE results (id TEXT PRIMARY KEY, run_id TEXT, result_type TEXT,"
+    " uri TEXT, metrics_json TEXT, footprint_wkt TEXT, footprint_geom TEXT,"
+    " created_at DATETIME)",
+]
+
+
+class Tiles(BasePlugin):
+    name = "tiles"
+    version = "1"
+
+    def run(self, payload):
+        if payload.get("fail"):
+            raise RuntimeError("bad input")
+        return {
+            "results": [
+                {"result_type": "tile", "uri": f"file:///t/{i}.tif", "metrics": {}}
+                for i in range(payload["n"])
+            ]
+        }
+
+
+@pytest.fixture
+def uow(tmp_path, monkeypatch):
+    monkeypatch.setenv("DATABASE_URL", f"sqlite:///{tmp_path / 'queue.db'}")
+    db.dispose_engine()
+    engine = db.get_engine()
+    # PostGIS stand-in for the footprint_geom bind expression
+    event.listen(
+        engine,
+        "connect",
+        lambda conn, _: conn.create_function("GeomFromEWKT", 1, lambda v: v),
+    )
+    with engine.begin() as conn:
+        for ddl in _DDL:
+            conn.execute(text(ddl))
+        conn.execute(
+            insert(Run.__table__),
+            [
+                {
+                    "id": f"run-{i}",
+                    "dataset_id": "ds",
+                    "plugin_name": plugin,
+                    "status": "created",
+                    "params_json": params,
+                    "created_at": T0 + timedelta(minutes=i),
+                    "attempts": 0,
+                }
+                for i, (plugin, params) in enumerate(
+                    [("tiles", {"n": 2}), ("tiles", {"fail": True}), ("nope", {})]
+                )
+            ],
+        )
+    cache = EntityCache(LRUCache(max_bytes=1024**2))
+    yield lambda: UnitOfWork(cache=cache)
+    db.dispose_engine()
+
+
+def _worker(uow, worker_id="w1"):
+    registry = PluginRegistry()
+    registry.register(Tiles)
+    executor = PluginExecutor(
+        registry=registry, logger=logging.getLogger("tests.queue")
+    )
+    return RunWorker(executor, uow, WorkerSettings(heartbeat_seconds=60), worker_id)
+
+
+def _run(uow, run_id):
+    with uow() as u:
+        return u.runs.get(run_id)
+
+
+def test_only_queued_runs_are_claimed_oldest_first(uow):
+    with uow() as u:
+        assert u.runs.claim_next("w1") is None
+        assert u.runs.enqueue("run-1") and u.runs.enqueue("run-0")
+        assert not u.runs.enqueue("run-0")  # already queued
+    with uow() as u:
+        first = u.runs.claim_next("w1")
+        assert (first.id, first.status, first.attempts) == ("run-0", "running", 1)
+    with uow() as u:
+        assert u.runs.claim_next("w2").id == "run-1"
+        assert u.runs.claim_next("w3") is None
+        # Only the owner can finish a claim
+        assert not u.runs.finish("run-1", "w1", "done")
+        assert u.runs.finish("run-1", "w2", "done")
+
+
+def test_worker_records_outputs_and_failures(uow):
+    worker = _worker(uow)
+    with uow() as u:
+        for run_id in ("run-0", "run-1", "run-2"):
+            u.runs.enqueue(run_id)
+
+    assert [worker.run_once() for _ in range(4)] == ["run-0", "run-1", "run-2", None]
+
+    done = _run(uow, "run-0")
+    assert (done.status, done.worker_id, done.error) == ("done", "w1", None)
+    assert done.finished_at is not None
+    with uow() as u:
+        tiles = u.results.page(run_id="run-0").items
+    assert sorted(r.uri for r in tiles) == ["file:///t/0.tif", "file:///t/1.tif"]
+
+    failed = _run(uow, "run-1")
+    assert failed.status == "failed" and "bad input" in failed.error
+    assert "not registered" in _run(uow, "run-2").error
+
+    # Failed runs can be submitted again
+    with uow() as u:
+        assert u.runs.enqueue("run-1") and not u.runs.enqueue("run-0")
+
+
+def test_stale_runs_are_requeued_then_failed(uow):
+    with uow() as u:
+        u.runs.enqueue("run-0")
+    with uow() as u:
+        u.runs.claim_next("dead-worker")
+        u.session.get(Run, "run-0").heartbeat_at = T0
+    worker = _worker(uow)
+
+    assert worker.requeue_stale() == 1
+    assert _run(uow, "run-0").status == "queued"
+
+    with uow() as u:
+        u.runs.claim_next("dead-worker")  # second attempt
+        u.session.get(Run, "run-0").heartbeat_at = T0
+    stale = timedelta(seconds=60)
+    with uow() as u:
+        assert u.runs.requeue_stale(stale, max_attempts=2) == 1
+    run = _run(uow, "run-0")
+    assert run.status == "failed" and "heartbeat" in run.error
+    # The dead worker's late outcome is discarded
+    with uow() as u:
+        assert not u.runs.finish("run-0", "dead-worker", "done")
+
+
+def test_plain_outputs_become_one_result():
+    (res,) = output_results("r", {"score": 0.5})
+    assert isinstance(res, Result)
+    assert (res.result_type, res.uri, res.metrics_json) == (
+        "output",
+        "run://r/output",
+        {"score": 0.5},
+    )
+
+
+def test_invalid_footprints_and_rejected_rows_fail_the_run(uow):
+    with pytest.raises(ValueError, match="footprint_wkt"):
+        output_results("r", {"results": [{"uri": "a", "footprint_wkt": "POINT ("}]})
+
+    worker = _worker(uow)
+    with uow() as u:
+        u.runs.enqueue("run-0")
+        u.session.execute(text("DROP TABLE results"))
+
+    assert worker.run_once() == "run-0"
+    run = _run(uow, "run-0")
+    assert run.status == "failed" and "OperationalError" in run.error
+
+
+class Staged(BasePlugin):
+    name = "staged"
+    version = "1"
+
+    def run(self, payload):
+        for i in range(1, 4):
+            self.report_progress("tiles", i, 3, "tiles")
+        return {"ok": True}
+
+
+def test_status_and_progress_events_are_published_after_commit(uow):
+    import asyncio
+
+    from backend.events.bus import get_event_bus
+
+    registry = PluginRegistry()
+    registry.register(Staged)
+    executor = PluginExecutor(registry=registry, logger=logging.getLogger("tests"))
+    worker = RunWorker(
+        executor, uow, WorkerSettings(60, progress_interval_seconds=0), "w1"
+    )
+    with uow() as u:
+        u.session.get(Run, "run-0").plugin_name = "staged"
+
+    async def scenario():
+        with get_event_bus().subscribe("run-0") as sub:
+            with uow() as u:
+                u.runs.enqueue("run-0")
+            await asyncio.to_thread(worker.run_once)
+            events = []
+            while (event := await sub.get(timeout=0.2)) is not None:
+                events.append(event)
+            return events
+
+    events = asyncio.run(scenario())
+    assert [(e.type, e.data.get("status") or e.data["done"]) for e in events] == [
+        ("status", "queued"),
+        ("status", "running"),
+        ("progress", 1),
+        ("progress", 2),
+        ("progress", 3),
+        ("status", "done"),
+    ]
+
+
+class Slow(BasePlugin):
+    name = "slow"
+    version = "1"
+    steps = []
+
+    def run(self, payload):
+        for i in range(20):
+            time.sleep(0.1)
+            self.steps.append(i)
+            self.report_progress("work", i + 1, 20)
+        return {"ok": True}
+
+
+def test_timed_out_run_fails_without_waiting_for_the_plugin(uow):
+    registry = PluginRegistry()
+    registry.register(Slow)
+    executor = PluginExecutor(registry=registry, logger=logging.getLogger("tests"))
+    config = WorkerSettings(heartbeat_seconds=0.05, run_timeout_seconds=0.2)
+    worker = RunWorker(executor, uow, config, "w1")
+    with uow() as u:
+        u.session.get(Run, "run-0").plugin_name = "slow"
+        u.runs.enqueue("run-0")
+
+    started = time.monotonic()
+    assert worker.run_once() == "run-0"
+    assert time.monotonic() - started < 1.0
+
+    run = _run(uow, "run-0")
+    assert run.status == "failed" and "PluginTimeoutError" in run.error
+    beat = run.heartbeat_at
+    # The plugin stops at its next progress report and no heartbeat follows
+    time.sleep(0.3)
+    assert len(Slow.steps) < 5
+    assert _run(uow, "run-0").heartbeat_at == beat
@@ -0,0 +1,90 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+from core.data_manager.raster_store import ChunkedRasterStore
+from core.evaluation.basic_metrics import (
+    AccuracyMetric,
+    DiceMetric,
+    IoUMetric,
+    PrecisionMetric,
+    compute_many,
+)
+from core.evaluation.streaming import (
+    MetricAccumulator,
+    accumulate_tiles,
+    evaluate_tiled,
+    iter_windows,
+)
+from core.models.contracts import ModelOutput, SpatialMetadata
+
+SPATIAL = SpatialMetadata(crs="EPSG:4326", bbox=(0, 0, 1, 1), resolution=1.0)
+
+
+def _metrics(**kwargs):
+    return [
+        AccuracyMetric(**kwargs),
+        IoUMetric(**kwargs),
+        DiceMetric(**kwargs),
+        PrecisionMetric(**kwargs),
+    ]
+
+
+def _binary_scene():
+    rng = np.random.default_rng(0)
+    return rng.random((1, 97, 131)).astype(np.float32), rng.random((97, 131)) > 0.4
+
+
+def test_tiled_evaluation_is_bit_identical_to_one_shot(tmp_path: Path):
+    pred, true = _binary_scene()
+    expected = compute_many(
+        _metrics(), ModelOutput(prediction=pred, spatial=SPATIAL), true
+    )
+
+    np.save(tmp_path / "pred.npy", pred)
+    memmap = np.load(tmp_path / "pred.npy", mmap_mode="r")
+    assert evaluate_tiled(_metrics(), memmap, true, tile_shape=(32, 40)) == expected
+
+    store = ChunkedRasterStore.create(
+        tmp_path / "pred", pred.shape, pred.dtype, chunk_shape=(25, 30)
+    )
+    store.write_window(pred)
+    assert evaluate_tiled(_metrics(), store, true) == expected
+
+
+def test_accumulators_merge_across_workers():
+    rng = np.random.default_rng(1)
+    scores = rng.random((4, 64, 48)).astype(np.float32)
+    true = rng.integers(0, 4, size=(64, 48))
+    metrics = _metrics(num_classes=4)
+    windows = list(iter_windows(64, 48, (16, 16)))
+
+    parts = [
+        accumulate_tiles(MetricAccumulator(metrics), scores, true, windows[i::3])
+        for i in range(3)
+    ]
+    merged = parts[0].merge(parts[1]).merge(parts[2])
+
+    assert merged.pixels == true.size
+    assert merged.finalize() == compute_many(
+        metrics, ModelOutput(prediction=scores, spatial=SPATIAL), true
+    )
+
+
+def test_incompatible_accumulators_are_rejected():
+    with pytest.raises(ValueError):
+        MetricAccumulator([IoUMetric()]).merge(
+            MetricAccumulator([IoUMetric(num_classes=3)])
+        )
+    pred, true = _binary_scene()
+    with pytest.raises(ValueError):
+        evaluate_tiled(_metrics(), pred, true[:50])
+
+
+def test_metrics_sharing_a_name_are_rejected():
+    same_name = [IoUMetric(), IoUMetric(ignore_index=255)]
+    with pytest.raises(ValueError, match="iou"):
+        MetricAccumulator(same_name)
+    pred, true = _binary_scene()
+    with pytest.raises(ValueError, match="iou"):
+        compute_many(same_name, ModelOutput(prediction=pred, spatial=SPATIAL), true)
@@ -0,0 +1,86 @@
+import struct
+import zlib
+from pathlib import Path
+
+import numpy as np
+import pytest
+from core.common.exceptions import TileError
+from core.data_manager.overviews import build_overviews
+from core.data_manager.raster_store import (
+    ROLE_CATEGORICAL,
+    ROLE_CONTINUOUS,
+    ChunkedRasterStore,
+)
+from core.rendering.png import encode_png
+from core.rendering.tiles import TileRenderer, default_colormap, render_tile
+
+# 0.01 degree pixels covering lon 10..12, lat 40..41
+SPATIAL = {"crs": "EPSG:4326", "bbox": [10.0, 40.0, 12.0, 41.0], "resolution": 0.01}
+
+
+def _mask_store(root: Path) -> ChunkedRasterStore:
+    mask = np.zeros((1, 100, 200), dtype=np.uint8)
+    mask[0, :, 100:] = 2
+    store = ChunkedRasterStore.create(
+        root, mask.shape, mask.dtype, chunk_shape=(32, 32), spatial=SPATIAL
+    )
+    store.write_window(mask)
+    return store
+
+
+def _decode_png(png: bytes) -> np.ndarray:
+    assert png[:8] == b"\x89PNG\r\n\x1a\n"
+    width, height = struct.unpack(">II", png[16:24])
+    idat_len = struct.unpack(">I", png[33:37])[0]
+    raw = zlib.decompress(png[41 : 41 + idat_len])
+    rows = np.frombuffer(raw, dtype=np.uint8).reshape(height, -1)
+    assert (rows[:, 0] == 0).all()
+    return rows[:, 1:].reshape(height, width, -1)
+
+
+def test_encode_png_roundtrip():
+    image = np.random.default_rng(0).integers(0, 255, (5, 7, 4), dtype=np.uint8)
+    np.testing.assert_array_equal(_decode_png(encode_png(image)), image)
+
+
+def test_render_tile_colors_classes_and_clears_outside(tmp_path: Path):
+    store = _mask_store(tmp_path / "mask")
+
+    # z=8 tile 135/95 covers lon ~9.84..11.25, lat ~40.98..41.51
+    rgba = render_tile(store, 8, 135, 95)
+    assert rgba.shape == (256, 256, 4)
+    assert (rgba[:20, :, 3] == 0).all()  # north of the raster
+    assert (rgba[-5:, :20, 3] == 0).all()  # west of the raster
+    assert (rgba[-5:, -20:, 3] > 0).all()  # class 2 at lon > 11
+    assert render_tile(store, 8, 0, 0) is None
+
+    with pytest.raises(TileError):
+        render_tile(store, 3, 8, 0)
+
+
+def test_renderer_uses_overviews_and_caches_by_etag(tmp_path: Path):
+    store = _mask_store(tmp_path / "mask")
+    build_overviews(store, factors=[2, 4])
+    renderer = TileRenderer(tmp_path / "tiles", max_disk_bytes=1024**2)
+
+    png, tag = renderer.get_tile(store.root, 5, 16, 11)
+    assert renderer.get_tile(store.root, 5, 16, 11) == (png, tag)
+    assert len(list((tmp_path / "tiles").iterdir())) == 1
+    # a fresh renderer is served from the disk tier
+    again = TileRenderer(tmp_path / "tiles", max_disk_bytes=1024**2)
+    assert again.get_tile(store.root, 5, 16, 11) == (png, tag)
+
+    store.write_window(np.ones((1, 100, 200), dtype=np.uint8))
+    store.set_overviews([])
+    _, new_tag = renderer.get_tile(store.root, 5, 16, 11)
+    assert new_tag != tag
+
+
+def test_default_colormap_follows_role_before_dtype(tmp_path: Path):
+    def store(name, dtype, role=None):
+        return ChunkedRasterStore.create(tmp_path / name, (1, 4, 4), dtype, role=role)
+
+    assert default_colormap(store("refl", np.uint16, ROLE_CONTINUOUS)) == "viridis"
+    assert default_colormap(store("cls", np.float32, ROLE_CATEGORICAL)) == "classes"
+    assert default_colormap(store("mask", np.uint8)) == "classes"
+    assert default_colormap(store("ndvi", np.float32)) == "viridis"